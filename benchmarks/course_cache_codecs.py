@@ -0,0 +1,108 @@
+"""Compare course cache save/load time and size across compression codecs.
+
+Run from the repository root:
+
+    python benchmarks/course_cache_codecs.py --sections 40 --files 500
+"""
+
+import argparse
+import hashlib
+import tempfile
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from syncmymoodle import course_cache, storage
+from syncmymoodle.constants import CACHE_COMPRESSION_LEVELS
+
+
+def generated_payload(sections: int, files: int) -> dict[str, Any]:
+    """Build a course payload shaped like a large Opencast/Sciebo course."""
+
+    def node(name: str, node_id: Any, node_type: str, **fields: Any) -> dict:
+        return {
+            "name": name,
+            "id": node_id,
+            "type": node_type,
+            "download_kind": fields.pop("download_kind", "direct"),
+            "download_status": "handled",
+            "children": fields.pop("children", []),
+            **fields,
+        }
+
+    course_sections = []
+    for section in range(sections):
+        children = []
+        for index in range(files):
+            token = hashlib.sha256(f"{section}/{index}".encode()).hexdigest()
+            children.append(
+                node(
+                    f"Lecture {section:02d}-{index:04d} recording.mp4",
+                    f"https://engage.streaming.rwth-aachen.de/play/{token[:36]}",
+                    "Opencast Video",
+                    download_kind="opencast",
+                    url=f"https://streaming.example/{token}.mp4",
+                    timemodified=1_700_000_000 + index,
+                    content_hash=token,
+                    remote_size=1_000_000 + index,
+                )
+            )
+        course_sections.append(
+            node(f"Week {section}", 1000 + section, "Section", children=children)
+        )
+    return {
+        "format": course_cache.COURSE_CACHE_FORMAT,
+        "identity": {"site": "https://moodle.example/", "user_id": 1, "course_id": 1},
+        "course": node("Benchmark Course", 1, "Course", children=course_sections),
+    }
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, default=40)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = generated_payload(args.sections, args.files)
+    codecs = [("zlib", level) for level in (1, 3, 6, 9)]
+    try:
+        storage.cache_codec_for_id(storage.CACHE_CODEC_IDS["zstd"])
+    except ValueError:
+        print("zstd is not available in this Python; only zlib is measured")
+    else:
+        high = CACHE_COMPRESSION_LEVELS["zstd"][2]
+        codecs += [("zstd", level) for level in (1, 3, 9, high)]
+    print(f"{args.sections} sections x {args.files} files, best of {args.repeat}")
+    print(f"{'codec':<8}{'level':>6}{'size KiB':>12}{'save ms':>10}{'load ms':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "cache"
+        for name, level in codecs:
+            codec = storage.CacheCodec(name, level)
+            save = best_of(
+                args.repeat,
+                partial(course_cache.write_course_cache_payload, path, payload, codec),
+            )
+            load = best_of(
+                args.repeat, partial(course_cache.read_course_cache_payload, path)
+            )
+            size = path.stat().st_size / 1024
+            print(
+                f"{name:<8}{level:>6}{size:>12.0f}{save * 1000:>10.1f}"
+                f"{load * 1000:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
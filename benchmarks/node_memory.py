@@ -0,0 +1,70 @@
+"""Measure the memory used by a large synthetic account tree.
+
+Run from the repository root:
+
+    python benchmarks/node_memory.py --courses 20 --series 10 --episodes 500
+"""
+
+import argparse
+import hashlib
+import time
+import tracemalloc
+
+from syncmymoodle.node import DownloadKind, Node
+
+
+def build_tree(courses: int, series: int, episodes: int) -> Node:
+    """Build Opencast series and Sciebo shares shaped like a large account."""
+    root = Node("", -1, "Root", None)
+    semester = root.add_child("26ss", None, "Semester")
+    for course_id in range(courses):
+        course = semester.add_child(f"Course {course_id}", course_id, "Course")
+        for series_id in range(series):
+            section = course.add_child(f"Week {series_id}", series_id, "Section")
+            recordings = section.add_child("Recordings", None, "Opencast Series")
+            share = section.add_child("Materials", None, "Sciebo Folder")
+            for index in range(episodes):
+                token = hashlib.sha256(f"{course_id}/{series_id}/{index}".encode())
+                digest = token.hexdigest()
+                recordings.add_download_child(
+                    f"Lecture {index:04d}.mp4",
+                    digest[:36],
+                    "Opencast Video",
+                    url=f"https://streaming.example/{digest}.mp4",
+                    timemodified=1_700_000_000 + index,
+                    download_kind=DownloadKind.OPENCAST,
+                )
+                share.add_download_child(
+                    f"Sheet {index:04d}.pdf",
+                    f"/{series_id}/Sheet {index:04d}.pdf",
+                    "Sciebo File",
+                    url=f"https://sciebo.example/s/{digest[:12]}/download",
+                    etag=digest[:32],
+                    remote_size=index * 1024,
+                )
+    return root
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=20)
+    parser.add_argument("--series", type=int, default=10)
+    parser.add_argument("--episodes", type=int, default=500)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    root = build_tree(args.courses, args.series, args.episodes)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = 1 + 1 + args.courses * (1 + args.series * (3 + 2 * args.episodes))
+    assert root.children
+    print(f"{nodes} nodes built in {elapsed:.2f} s")
+    print(f"retained {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB")
+    print(f"{current / nodes:.0f} bytes per node")
+
+
+if __name__ == "__main__":
+    main()
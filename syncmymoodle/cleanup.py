@@ -9,8 +9,15 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
 
-from syncmymoodle.constants import COURSE_CACHE_DIRECTORY, COURSE_CACHE_FILENAME
+from syncmymoodle.constants import (
+    CACHE_DATABASE_FILENAME,
+    COURSE_CACHE_DIRECTORY,
+    COURSE_CACHE_FILENAME,
+    DIGEST_INDEX_FILENAME,
+    LINKED_RESOURCE_INDEX_FILENAME,
+)
 from syncmymoodle.pathing import CONFLICT_GLOB, InternalPathRoot, parse_conflict_path
+from syncmymoodle.storage import map_hashing
 
 
 @dataclass(frozen=True)
@@ -33,7 +40,7 @@ def file_hash(path: Path) -> str:
 
 def iter_conflicts(root: Path | InternalPathRoot) -> list[ConflictFile]:
     internal_root = InternalPathRoot.resolve(root)
-    conflicts: list[ConflictFile] = []
+    found: list[tuple[Path, Path]] = []
     for discovered_path in internal_root.root.rglob(CONFLICT_GLOB):
         path = internal_root.require(discovered_path)
         if not path.is_file():
@@ -41,15 +48,12 @@ def iter_conflicts(root: Path | InternalPathRoot) -> list[ConflictFile]:
         conflict_path = parse_conflict_path(path)
         if conflict_path is None:
             continue
-        canonical = internal_root.require(conflict_path.canonical)
-        conflicts.append(
-            ConflictFile(
-                path=path,
-                canonical=canonical,
-                content_hash=file_hash(path),
-            )
-        )
-    return conflicts
+        found.append((path, internal_root.require(conflict_path.canonical)))
+    hashes = map_hashing(file_hash, [path for path, _ in found])
+    return [
+        ConflictFile(path=path, canonical=canonical, content_hash=content_hash)
+        for (path, canonical), content_hash in zip(found, hashes, strict=True)
+    ]
 
 
 def duplicate_keep_key(path: Path) -> tuple[int, float, str]:
@@ -69,8 +73,10 @@ def conflict_cleanup_plan(conflicts: Iterable[ConflictFile]) -> ConflictCleanupP
     for conflict in conflicts:
         by_canonical[conflict.canonical].append(conflict)
 
+    existing = [canonical for canonical in by_canonical if canonical.is_file()]
+    current_hashes = dict(zip(existing, map_hashing(file_hash, existing), strict=True))
     for canonical, group in by_canonical.items():
-        current_hash = file_hash(canonical) if canonical.is_file() else None
+        current_hash = current_hashes.get(canonical)
         remaining: list[ConflictFile] = []
 
         for conflict in group:
@@ -96,8 +102,16 @@ def conflict_cleanup_plan(conflicts: Iterable[ConflictFile]) -> ConflictCleanupP
 
 def iter_course_caches(root: Path | InternalPathRoot) -> list[Path]:
     internal_root = InternalPathRoot.resolve(root)
-    internal_root.path(COURSE_CACHE_DIRECTORY)
-    caches = []
+    caches = [
+        path
+        for name in (
+            DIGEST_INDEX_FILENAME,
+            LINKED_RESOURCE_INDEX_FILENAME,
+            CACHE_DATABASE_FILENAME,
+            f"{CACHE_DATABASE_FILENAME}-journal",
+        )
+        if (path := internal_root.path(COURSE_CACHE_DIRECTORY, name)).is_file()
+    ]
     for discovered_path in internal_root.root.rglob(COURSE_CACHE_FILENAME):
         path = internal_root.require(discovered_path)
         if path.is_file():
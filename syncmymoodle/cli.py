@@ -25,6 +25,7 @@ from syncmymoodle import (
     cleanup,
     course_cache,
     downloader,
+    links,
     output,
     pathing,
     rwth,
@@ -2106,7 +2107,7 @@ def configure_browser_session_resolver(ctx: SyncContext) -> None:
         cookie_file = Path(ctx.config.cookie_file)
         status = rwth.cached_session_status(cookie_file)
         if status.kind is rwth.SessionStatusKind.VALID:
-            cached = rwth.load_cached_session(cookie_file)
+            cached = rwth.load_cached_session(cookie_file, ctx.config.http_pool_size)
             if cached is not None:
                 cached_session, cached_session_key = cached
                 try:
@@ -2124,7 +2125,11 @@ def configure_browser_session_resolver(ctx: SyncContext) -> None:
                         "Ignoring cached Moodle browser session for another account"
                     )
         try:
-            session, session_key = moodle_api.create_browser_session(account.tokens)
+            session, session_key = moodle_api.create_browser_session(
+                account.tokens,
+                latency=ctx.http_latency,
+                pool_size=ctx.config.http_pool_size,
+            )
         except moodle_api.BrowserBootstrapError as error:
             raise BrowserSessionUnavailable(str(error)) from error
         ctx.browser_session = session
@@ -2306,6 +2311,8 @@ def run(ctx: SyncContext, *, show_filtered: bool = False) -> None:
     ctx.session = moodle_api.create_token_session(
         tokens,
         user_private_access_key,
+        latency=ctx.http_latency,
+        pool_size=ctx.config.http_pool_size,
     )
     configure_browser_session_resolver(ctx)
     run_lock = (
@@ -2315,14 +2322,20 @@ def run(ctx: SyncContext, *, show_filtered: bool = False) -> None:
     )
     try:
         with run_lock, ctx.output.sync_progress:
+            ctx.digest_index = storage.load_digest_index(ctx.internal_path_root)
+            links.load_linked_resource_index(ctx)
             sync.sync(ctx)
             downloader.download_all_files(ctx, logger)
             if not ctx.config.dry_run:
                 ctx.output.sync_progress.finalizing("saving course metadata")
                 course_cache.cache_root_node(ctx, logger)
+                storage.save_digest_index(ctx.digest_index, ctx.cache_codec)
+                links.save_linked_resource_index(ctx)
     except storage.SyncRunLockedError as error:
         logger.critical("%s", error)
         raise SystemExit(1) from error
+    finally:
+        ctx.close_cache_database()
     report_filtered_items(ctx, show_filtered)
     report_removed_content(ctx)
     ctx.output.summary(
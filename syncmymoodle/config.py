@@ -27,7 +27,16 @@ from pathlib import Path
 from typing import Any, Callable, Literal, TypeAlias, cast
 
 from syncmymoodle import pathing
-from syncmymoodle.constants import COURSE_PREFIX_HANDLING_OPTIONS, QUIZ_MODES
+from syncmymoodle.constants import (
+    CACHE_COMPRESSION_LEVELS,
+    CACHE_COMPRESSION_OPTIONS,
+    CACHE_STORE_OPTIONS,
+    COURSE_PREFIX_HANDLING_OPTIONS,
+    HTTP_RETRY_ATTEMPTS,
+    HTTP_TIMEOUT_CEILING,
+    HTTP_TIMEOUT_FLOOR,
+    QUIZ_MODES,
+)
 from syncmymoodle.secret_providers import (
     EXTERNAL_SECRET_PROVIDER_OPTIONS,
     SECRET_PROVIDER_OPTIONS,
@@ -151,6 +160,47 @@ def file_size_error(value: Any) -> str | None:
     return None
 
 
+def parse_positive_int(value: Any) -> int:
+    """Parse a positive count given as an integer or decimal string."""
+    if isinstance(value, bool) or isinstance(value, float):
+        raise ValueError(f"not a positive integer: {value!r}")
+    if isinstance(value, int):
+        count = value
+    else:
+        text = str(value).strip()
+        if not text.isdecimal():
+            raise ValueError(f"not a positive integer: {value!r}")
+        count = int(text)
+    if count < 1:
+        raise ValueError(f"not a positive integer: {value!r}")
+    return count
+
+
+def positive_int_error(value: Any) -> str | None:
+    if value in (None, "", 0) and not isinstance(value, bool):
+        return None
+    try:
+        parse_positive_int(value)
+    except ValueError:
+        return f"must be a positive integer, got {value!r}"
+    return None
+
+
+def parse_non_negative_int(value: Any) -> int:
+    """Parse a count that may be zero, given as an integer or decimal string."""
+    if value in (0, "0") and not isinstance(value, bool):
+        return 0
+    return parse_positive_int(value)
+
+
+def non_negative_int_error(value: Any) -> str | None:
+    try:
+        parse_non_negative_int(value)
+    except ValueError:
+        return f"must be zero or a positive integer, got {value!r}"
+    return None
+
+
 def default_cookie_file() -> str:
     return os.fspath(pathing.user_config_dir() / "session")
 
@@ -469,6 +519,21 @@ class Config:
             aliases=("semester",),
         ),
     )
+    # Number of courses whose inventories are fetched concurrently. Each
+    # worker builds one course subtree; the tree is merged before path
+    # clashes are resolved.
+    course_workers: int = option(
+        1,
+        group="courses",
+        key="workers",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "course-workers",
+            "scan up to this many courses concurrently (default: 1)",
+        ),
+    )
     course_prefix_handling: str = option(
         "suffix",
         group="courses",
@@ -520,6 +585,126 @@ class Config:
             "only report what would be downloaded, without writing any files",
         ),
     )
+    # Number of concurrent download workers. Leaves sharing a target path or
+    # a reusable verified artifact still run in order on one worker.
+    download_workers: int = option(
+        1,
+        group="downloads",
+        key="workers",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "download-workers",
+            "download up to this many items concurrently (default: 1)",
+        ),
+    )
+    # Cap on concurrent workers talking to one origin (scheme, host and
+    # port), so parallel downloads spread across Moodle, Opencast, Sciebo
+    # and VEIRA instead of overloading a single backend.
+    download_workers_per_origin: int = option(
+        4,
+        group="downloads",
+        key="workers_per_origin",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "download-workers-per-origin",
+            "limit concurrent downloads from one server (default: 4)",
+        ),
+    )
+
+    # Retries of idempotent requests (GET, HEAD, PROPFIND) after transient
+    # failures, with jittered exponential backoff and Retry-After support.
+    # All retries of a run share one budget; 0 disables retrying.
+    http_retries: int = option(
+        HTTP_RETRY_ATTEMPTS,
+        group="network",
+        key="retries",
+        normalize=parse_non_negative_int,
+        validate=non_negative_int_error,
+        cli=cli_arg(
+            "network-retries",
+            "retry transient request failures up to this many times "
+            f"(default: {HTTP_RETRY_ATTEMPTS}, 0 disables retries)",
+        ),
+    )
+
+    # Bounds for request timeouts derived from each server's observed
+    # response times, in seconds. Setting both to the same value gives every
+    # request that fixed timeout.
+    http_timeout_floor: int = option(
+        HTTP_TIMEOUT_FLOOR,
+        group="network",
+        key="timeout_floor",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "network-timeout-floor",
+            "never time out a request sooner than this many seconds "
+            f"(default: {HTTP_TIMEOUT_FLOOR})",
+        ),
+    )
+    http_timeout_ceiling: int = option(
+        HTTP_TIMEOUT_CEILING,
+        group="network",
+        key="timeout_ceiling",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "network-timeout-ceiling",
+            "never wait longer than this many seconds for a server "
+            f"(default: {HTTP_TIMEOUT_CEILING})",
+        ),
+    )
+
+    # Compression for course caches and the local digest index. The codec is
+    # recorded in each file, so caches written with another codec stay
+    # readable; an empty level uses the codec's default.
+    cache_compression: str = option(
+        "zlib",
+        group="caches",
+        key="compression",
+        falsey_uses_default=True,
+        choices=CACHE_COMPRESSION_OPTIONS,
+        validate=string_error,
+        cli=cli_arg(
+            "cache-compression",
+            "compress course caches with 'zlib' (default) or 'zstd' "
+            "(Python 3.14 or newer)",
+        ),
+    )
+    cache_compression_level: int | None = option(
+        group="caches",
+        key="compression_level",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "cache-compression-level",
+            "compression level for course caches; lower is faster "
+            "(zlib: 1-9, zstd: 1-22)",
+        ),
+    )
+
+    # Where course caches live: one file per course, or rows of a single
+    # SQLite database shared by every account and course of the sync directory.
+    cache_store: str = option(
+        "files",
+        group="caches",
+        key="store",
+        falsey_uses_default=True,
+        choices=CACHE_STORE_OPTIONS,
+        validate=string_error,
+        cli=cli_arg(
+            "cache-store",
+            "store course caches as one file per course ('files', default) "
+            "or in one 'sqlite' database",
+        ),
+    )
 
     # Exclude/allow rules
     allowed_domains: PatternConfig = option(
@@ -662,6 +847,20 @@ class Config:
             "include videos from the emedia Medizin VEIRA service",
         ),
     )
+    # Number of a course's generic links checked concurrently before its
+    # modules are walked. The walk still adds nodes in inventory order.
+    link_workers: int = option(
+        1,
+        group="links",
+        key="workers",
+        normalize=parse_positive_int,
+        falsey_uses_default=True,
+        validate=positive_int_error,
+        cli=cli_arg(
+            "link-workers",
+            "check up to this many linked resources concurrently (default: 1)",
+        ),
+    )
 
     # Moodle activity types. Keys omitted from a [modules] table keep these
     # defaults; legacy used_modules trees instead disable omitted entries
@@ -703,6 +902,19 @@ class Config:
             kwargs[opt.field_name] = opt.normalize(value)
         return cls(**kwargs)
 
+    @property
+    def http_pool_size(self) -> int:
+        """Return how many keep-alive connections to keep per origin.
+
+        Downloads reach one origin from at most ``downloads.workers_per_origin``
+        workers, and every concurrently scanned course resolves up to
+        ``links.workers`` links at once.
+        """
+        return max(
+            min(self.download_workers, self.download_workers_per_origin),
+            self.course_workers * self.link_workers,
+        )
+
     @property
     def auth_source(self) -> AuthSource:
         """Return the configured RWTH sign-in method."""
@@ -899,6 +1111,8 @@ def config_validation_errors(
         if opt.canonical_key in canonical:
             errors.extend(option_value_errors(opt, canonical[opt.canonical_key]))
     errors.extend(size_limit_errors(canonical))
+    errors.extend(timeout_limit_errors(canonical))
+    errors.extend(cache_compression_errors(canonical))
     errors.extend(auth_source_errors(canonical))
     errors.extend(managed_path_errors(canonical, config_path))
     return errors
@@ -921,6 +1135,43 @@ def size_limit_errors(canonical: ConfigDict) -> list[str]:
     return ["filters.min_file_size must not exceed filters.max_file_size"]
 
 
+def timeout_limit_errors(canonical: ConfigDict) -> list[str]:
+    limits: dict[str, int] = {}
+    for key in ("network.timeout_floor", "network.timeout_ceiling"):
+        value = canonical.get(key)
+        if value in (None, "", 0) and not isinstance(value, bool):
+            continue
+        try:
+            limits[key] = parse_positive_int(value)
+        except ValueError:
+            continue
+    floor = limits.get("network.timeout_floor", HTTP_TIMEOUT_FLOOR)
+    ceiling = limits.get("network.timeout_ceiling", HTTP_TIMEOUT_CEILING)
+    if floor <= ceiling:
+        return []
+    return ["network.timeout_floor must not exceed network.timeout_ceiling"]
+
+
+def cache_compression_errors(canonical: ConfigDict) -> list[str]:
+    codec = canonical.get("caches.compression") or "zlib"
+    level = canonical.get("caches.compression_level")
+    if codec not in CACHE_COMPRESSION_LEVELS or (
+        level in (None, "", 0) and not isinstance(level, bool)
+    ):
+        return []
+    try:
+        parsed = parse_positive_int(level)
+    except ValueError:
+        return []
+    low, _, high = CACHE_COMPRESSION_LEVELS[codec]
+    if low <= parsed <= high:
+        return []
+    return [
+        f"caches.compression_level must be between {low} and {high} "
+        f"for {codec}, got {level!r}"
+    ]
+
+
 def managed_path_errors(
     canonical: ConfigDict,
     config_path: Path | None = None,
@@ -7,12 +7,41 @@ INVALID_CHARS = '~"#%*:<>?/\\{|}'
 # Chunk size for streamed HTTP reads.
 DEFAULT_BLOCK_SIZE = 1024
 
+# File downloads read into one reused buffer. Reads start at the minimum size
+# and double, up to the maximum, while the connection keeps filling them.
+DOWNLOAD_CHUNK_MIN_SIZE = 256 * 1024
+DOWNLOAD_CHUNK_MAX_SIZE = 4 * 1024 * 1024
+# Transfer progress is advanced in steps of at least this many bytes.
+DOWNLOAD_PROGRESS_STEP = 1024 * 1024
+
 # Maximum HTML body inspected for links. Linked pages are untrusted and may be
 # streamed without a Content-Length, so the limit is enforced while reading.
 LINKED_PAGE_MAX_BYTES = 2 * 1024 * 1024
 
 # Bound every direct HTTP request so an unavailable service cannot hang a run.
 HTTP_TIMEOUT_SECONDS = 15
+# Keep-alive connections kept per origin by sessions created outside a sync
+# run, and origins whose pools are kept. Sync runs size their pools from the
+# configured worker counts instead.
+HTTP_POOL_SIZE = 16
+HTTP_POOL_ORIGINS = 64
+# Default retries of one idempotent request after transient failures, the
+# retries a whole run may spend, and the backoff bounds in seconds. A longer
+# Retry-After than the maximum delay is treated as an outage instead.
+HTTP_RETRY_ATTEMPTS = 3
+HTTP_RETRY_BUDGET = 50
+HTTP_RETRY_BASE_DELAY = 0.5
+HTTP_RETRY_MAX_DELAY = 30.0
+# Adaptive read timeouts: bounds in seconds, the per-origin window of observed
+# response times, the samples needed before adapting, and how far above the
+# 95th percentile a read timeout is placed. Repeated read timeouts stretch an
+# origin's read timeout by at most the last factor.
+HTTP_TIMEOUT_FLOOR = 3
+HTTP_TIMEOUT_CEILING = 120
+HTTP_LATENCY_WINDOW = 64
+HTTP_LATENCY_MIN_SAMPLES = 8
+HTTP_READ_TIMEOUT_FACTOR = 4
+HTTP_MAX_TIMEOUT_STRETCH = 64
 
 # Old extractor releases regularly stop working as supported sites change.
 # Keep this aligned with the minimum declared in pyproject.toml.
@@ -21,6 +50,20 @@ YT_DLP_TESTED_VERSION = "2026.7.4"
 # Hidden internal metadata directory and per-course cache filename.
 COURSE_CACHE_DIRECTORY = ".syncmymoodle-cache"
 COURSE_CACHE_FILENAME = ".syncmymoodle_cache"
+# Digests of local files keyed by stat identity, stored in COURSE_CACHE_DIRECTORY.
+DIGEST_INDEX_FILENAME = "digests"
+# Account-wide linked-resource validators, also in COURSE_CACHE_DIRECTORY, and
+# how long an entry no course has used is kept.
+LINKED_RESOURCE_INDEX_FILENAME = "links"
+LINKED_RESOURCE_INDEX_MAX_AGE = 30 * 24 * 60 * 60
+# Compression codecs for private cache files with their (lowest, default,
+# highest) levels. zstd needs the standard-library compression.zstd module.
+CACHE_COMPRESSION_LEVELS = {"zlib": (1, 6, 9), "zstd": (1, 3, 22)}
+CACHE_COMPRESSION_OPTIONS = tuple(CACHE_COMPRESSION_LEVELS)
+# Course caches are stored as one file per course or, with the sqlite store,
+# as rows of one database in COURSE_CACHE_DIRECTORY.
+CACHE_STORE_OPTIONS = ("files", "sqlite")
+CACHE_DATABASE_FILENAME = "caches.sqlite3"
 
 YOUTUBE_WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
 HASH_ALGOS_BY_LENGTH = {32: "md5", 40: "sha1", 64: "sha256"}
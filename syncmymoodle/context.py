@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -7,8 +8,14 @@ from typing import TYPE_CHECKING, Any
 
 import requests
 
+from syncmymoodle import storage
 from syncmymoodle.config import Config
-from syncmymoodle.http_utils import ServiceOutageTracker
+from syncmymoodle.http_utils import (
+    LatencyTracker,
+    OriginLimiter,
+    RetryBudget,
+    ServiceOutageTracker,
+)
 from syncmymoodle.moodle_tokens import MoodleTokens
 from syncmymoodle.node import Node, RemoteMarkerKind
 from syncmymoodle.outcomes import RemovedContent, RunStatistics
@@ -103,6 +110,15 @@ class LinkedResourceCacheEntry:
     remote_size: int | None = None
 
 
+@dataclass(frozen=True)
+class IndexedLinkedResource:
+    """An account-wide linked-resource entry and the URL it was fetched from."""
+
+    url: str
+    entry: LinkedResourceCacheEntry
+    used_at: float
+
+
 @dataclass(frozen=True)
 class VerifiedDownloadArtifact:
     """One remote artifact verified and installed during this sync run."""
@@ -123,6 +139,8 @@ class SyncContext:
     )
     auth: AuthState = field(init=False)
     internal_path_root: InternalPathRoot = field(init=False, repr=False, compare=False)
+    digest_index: storage.DigestIndex = field(init=False, repr=False, compare=False)
+    cache_codec: storage.CacheCodec = field(init=False, repr=False, compare=False)
     session: requests.Session | None = None
     session_key: str | None = field(default=None, repr=False)
     moodle_account: MoodleAccount | None = field(default=None, repr=False)
@@ -145,6 +163,10 @@ class SyncContext:
     # None means unprobed; False means the HTML/request-token bootstrap is required.
     sciebo_direct_webdav_supported: bool | None = None
     service_outages: ServiceOutageTracker = field(default_factory=ServiceOutageTracker)
+    http_retries: RetryBudget = field(default_factory=RetryBudget, repr=False)
+    http_latency: LatencyTracker = field(default_factory=LatencyTracker, repr=False)
+    # Caps concurrent download requests per origin across download workers.
+    download_origins: OriginLimiter = field(init=False, repr=False, compare=False)
     opencast_course_auth_cache: set[tuple[str, str]] = field(default_factory=set)
     opencast_episode_cache: dict[tuple[str | None, str], OpencastEpisode] = field(
         default_factory=dict
@@ -170,6 +192,10 @@ class SyncContext:
     lti_instance_cache: ModuleInstanceCache = field(default_factory=dict)
     h5p_activity_cache: ModuleInstanceCache = field(default_factory=dict)
     quiz_instance_cache: ModuleInstanceCache = field(default_factory=dict)
+    assignment_inventory_cache: dict[int, dict[str, Any]] = field(default_factory=dict)
+    folder_inventory_cache: dict[int, list[dict[str, Any]]] = field(
+        default_factory=dict
+    )
     linked_resources_by_course: dict[str, dict[str, LinkedResourceCacheEntry]] = field(
         default_factory=dict
     )
@@ -177,6 +203,15 @@ class SyncContext:
         default_factory=dict
     )
     seen_linked_resources: set[tuple[str, str]] = field(default_factory=set)
+    # Linked-resource validators shared by all courses of the account, keyed
+    # by canonical URL and request scope, and persisted between runs.
+    linked_resource_index: dict[str, IndexedLinkedResource] = field(
+        default_factory=dict, repr=False
+    )
+    # Link resolutions checked ahead of a course walk, by course and URL.
+    prefetched_linked_resources: dict[str, dict[str, LinkedResourceResolution]] = field(
+        default_factory=dict, repr=False
+    )
     incomplete_course_ids: set[int] = field(default_factory=set)
     reported_course_failure_sources: set[tuple[int, str]] = field(
         default_factory=set,
@@ -186,12 +221,80 @@ class SyncContext:
         default=None,
         repr=False,
     )
+    # Guards run statistics, failure bookkeeping and the legacy cache scan
+    # shared by concurrent course scans.
+    course_state_lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        repr=False,
+        compare=False,
+    )
+    # Serialize interactive browser sign-in and per-course Opencast LTI
+    # launches when download workers run concurrently.
+    browser_session_lock: threading.RLock = field(
+        default_factory=threading.RLock,
+        repr=False,
+        compare=False,
+    )
+    # Reentrant so a download worker can hold it across the course LTI launch
+    # that refreshing one episode may trigger.
+    opencast_authorization_lock: threading.RLock = field(
+        default_factory=threading.RLock,
+        repr=False,
+        compare=False,
+    )
+    # Guards the course cache states and the Sciebo and Opencast lookup caches
+    # that concurrent course scans and download workers read and fill.
+    shared_cache_lock: threading.RLock = field(
+        default_factory=threading.RLock,
+        repr=False,
+        compare=False,
+    )
+    # Opened on first use when course caches use the sqlite store.
+    cache_database: storage.CacheDatabase | None = field(
+        default=None,
+        repr=False,
+        compare=False,
+    )
+    cache_database_opened: bool = field(default=False, repr=False)
+    cache_database_lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        repr=False,
+        compare=False,
+    )
 
     def __post_init__(self) -> None:
         self.auth = AuthState.from_config(self.config)
         self.internal_path_root = InternalPathRoot.resolve(
             Path(self.config.sync_directory)
         )
+        self.digest_index = storage.DigestIndex(self.internal_path_root)
+        self.cache_codec = storage.cache_codec(
+            self.config.cache_compression, self.config.cache_compression_level
+        )
+        self.http_retries = RetryBudget(attempts=self.config.http_retries)
+        self.http_latency = LatencyTracker(
+            floor=self.config.http_timeout_floor,
+            ceiling=self.config.http_timeout_ceiling,
+        )
+        self.download_origins = OriginLimiter(self.config.download_workers_per_origin)
+
+    def course_cache_database(self) -> storage.CacheDatabase | None:
+        """Return the shared cache database when the sqlite store is selected."""
+        if self.config.cache_store != "sqlite":
+            return None
+        with self.cache_database_lock:
+            if not self.cache_database_opened:
+                self.cache_database_opened = True
+                self.cache_database = storage.open_cache_database(
+                    self.internal_path_root, read_only=self.config.dry_run
+                )
+            return self.cache_database
+
+    def close_cache_database(self) -> None:
+        with self.cache_database_lock:
+            if self.cache_database is not None:
+                self.cache_database.close()
+                self.cache_database = None
 
     @property
     def moodle_update_watermark(self) -> int | None:
@@ -207,7 +310,8 @@ class SyncContext:
         item: str,
         reason: str,
     ) -> None:
-        self.filtered_items.add(FilteredItem(config_key, category, item, reason))
+        with self.course_state_lock:
+            self.filtered_items.add(FilteredItem(config_key, category, item, reason))
 
     def mark_course_incomplete(self, course_id: Any) -> None:
         """Prevent a partial course inventory from replacing its previous cache."""
@@ -216,7 +320,8 @@ class SyncContext:
             and not isinstance(course_id, bool)
             and course_id > 0
         ):
-            self.incomplete_course_ids.add(course_id)
+            with self.course_state_lock:
+                self.incomplete_course_ids.add(course_id)
 
     def mark_course_inventory_filtered(self, course_id: Any) -> None:
         """Suppress removals for a policy- or availability-truncated tree."""
@@ -225,11 +330,17 @@ class SyncContext:
             and not isinstance(course_id, bool)
             and course_id > 0
         ):
-            self.inventory_filtered_course_ids.add(course_id)
+            with self.course_state_lock:
+                self.inventory_filtered_course_ids.add(course_id)
+
+    def record_failure(self) -> None:
+        """Count one failure in the run statistics."""
+        with self.course_state_lock:
+            self.stats.failed += 1
 
     def record_course_failure(self, course_id: Any) -> None:
         """Record a failed course source and retain its last complete cache."""
-        self.stats.failed += 1
+        self.record_failure()
         self.mark_course_incomplete(course_id)
 
     def record_course_failure_once(self, course_id: Any, source: str) -> None:
@@ -240,9 +351,10 @@ class SyncContext:
             and course_id > 0
         ):
             failure_key = (course_id, source)
-            if failure_key in self.reported_course_failure_sources:
-                return
-            self.reported_course_failure_sources.add(failure_key)
+            with self.course_state_lock:
+                if failure_key in self.reported_course_failure_sources:
+                    return
+                self.reported_course_failure_sources.add(failure_key)
         self.record_course_failure(course_id)
 
     def require_session(self) -> requests.Session:
@@ -258,7 +370,12 @@ class SyncContext:
 
     def require_browser_session(self) -> requests.Session:
         if self.browser_session is None and self.browser_session_resolver is not None:
-            self.browser_session_resolver()
+            with self.browser_session_lock:
+                if (
+                    self.browser_session is None
+                    and self.browser_session_resolver is not None
+                ):
+                    self.browser_session_resolver()
         if self.browser_session is None:
             raise BrowserSessionUnavailable("Moodle browser session is unavailable")
         return self.browser_session
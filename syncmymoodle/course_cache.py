@@ -1,14 +1,25 @@
+import gzip
 import hashlib
+import json
 import logging
+import struct
+import threading
 import urllib.parse
-from collections.abc import Iterator
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Any
 
 from syncmymoodle import links, opencast
-from syncmymoodle.constants import COURSE_CACHE_DIRECTORY, COURSE_CACHE_FILENAME
+from syncmymoodle.constants import (
+    CACHE_DATABASE_FILENAME,
+    COURSE_CACHE_DIRECTORY,
+    COURSE_CACHE_FILENAME,
+)
 from syncmymoodle.context import SyncContext
+from syncmymoodle.http_utils import canonical_remote_url
 from syncmymoodle.moodle_tokens import normalized_site
 from syncmymoodle.node import (
     NAME_CLASH_ID_UNSET,
@@ -24,16 +35,54 @@ from syncmymoodle.pathing import (
     sanitized_node_path_parts,
     with_windows_extended_length_prefix,
 )
-from syncmymoodle.storage import read_private_gzip_json, write_private_gzip_json
+from syncmymoodle.storage import (
+    DEFAULT_CACHE_CODEC,
+    CacheCodec,
+    CacheDatabase,
+    CourseCacheKey,
+    cache_codec_for_id,
+    read_private_bytes,
+    read_private_gzip_json,
+    write_private_bytes,
+    write_private_chunks,
+)
 
 logger = logging.getLogger(__name__)
 LEGACY_COURSE_CACHE_FORMAT = "syncmymoodle.course-cache.v1"
-COURSE_CACHE_FORMAT = "syncmymoodle.course-cache.v2"
+JSON_COURSE_CACHE_FORMAT = "syncmymoodle.course-cache.v2"
+COURSE_CACHE_FORMAT = "syncmymoodle.course-cache.v3"
+# v3 caches start with this marker and a one-byte compression codec ID,
+# followed by one independently compressed block per top-level course child
+# (normally a section), so lookups only inflate the sections they touch. The
+# compressed JSON header with the section index comes last, followed by its
+# length, so the file can be written in one pass after the blocks.
+COURSE_CACHE_MAGIC = b"SMMCC\x00\x03\n"
+_HEADER_LENGTH = struct.Struct(">I")
+COURSE_CACHE_CHUNK_SIZE = 64 * 1024
+# Node records are positional lists in this field order, followed by the list
+# of child records, instead of one JSON object per node.
+NODE_RECORD_FIELDS = (
+    "name",
+    "id",
+    "type",
+    "download_kind",
+    "url",
+    "timemodified",
+    "etag",
+    "etag_kind",
+    "content_hash",
+    "artifact_hashes",
+    "remote_size",
+    "name_clash_id",
+    "download_status",
+)
 MODULE_CACHE_KEY = "module_data"
 CACHED_TEXT_CACHE_KEY = "cached_text"
 OPENCAST_EPISODES_CACHE_KEY = "opencast_episodes"
 LINKED_RESOURCES_CACHE_KEY = "linked_resources"
 INVENTORY_SCOPE_CACHE_KEY = "inventory_scope"
+COMPRESSION_CACHE_KEY = "compression"
+FINGERPRINT_CACHE_KEY = "fingerprint"
 H5P_CONTENT_KIND = "h5p"
 PAGE_CONTENT_KIND = "page"
 CACHED_TEXT_KINDS = (H5P_CONTENT_KIND, PAGE_CONTENT_KIND)
@@ -81,9 +130,169 @@ class QuizCacheEntry:
     refresh_after: int | None
 
 
+_MATCH_ATTRIBUTES = ("url", "name_clash_id", "id")
+
+
+class _CachedChildIndex:
+    """Hash lookups over one cached node's children.
+
+    Lookups return the same candidate as ``match_old_cache_child``; unhashable
+    identities fall back to scanning the siblings that share the child's name.
+    """
+
+    def __init__(self, children: list[Node]) -> None:
+        self.youtube: dict[str, Node] = {}
+        self.named: dict[tuple[str, str], list[Node]] = {}
+        self.identities: dict[tuple[str, str, str, Any], Node] = {}
+        for child in children:
+            video_id = links.youtube_video_id_from_node(child)
+            if video_id is not None:
+                self.youtube.setdefault(video_id, child)
+            self.named.setdefault((child.name, child.type), []).append(child)
+            for attr in _MATCH_ATTRIBUTES:
+                value = getattr(child, attr)
+                if value is None:
+                    continue
+                try:
+                    self.identities.setdefault(
+                        (attr, child.name, child.type, value), child
+                    )
+                except TypeError:
+                    continue
+
+    def match(self, child: Node, youtube: bool = True) -> Node | None:
+        if youtube:
+            video_id = links.youtube_video_id_from_node(child)
+            if video_id is not None and video_id in self.youtube:
+                return self.youtube[video_id]
+        candidates = self.named.get((child.name, child.type))
+        if not candidates:
+            return None
+        for attr in _MATCH_ATTRIBUTES:
+            value = getattr(child, attr)
+            if value is None:
+                continue
+            try:
+                candidate = self.identities.get((attr, child.name, child.type, value))
+            except TypeError:
+                candidate = next(
+                    (node for node in candidates if getattr(node, attr) == value),
+                    None,
+                )
+            if candidate is not None:
+                return candidate
+        return candidates[0]
+
+
+class CachedCourseTree:
+    """Previous course tree whose top-level subtrees are decoded on first use."""
+
+    def __init__(
+        self,
+        root: Node,
+        blocks: dict[Node, bytes] | None = None,
+        codec: CacheCodec = DEFAULT_CACHE_CODEC,
+        source: Path | None = None,
+        log: logging.Logger = logger,
+        section_keys: dict[Node, tuple[str, str]] | None = None,
+        written_codec: CacheCodec | None = None,
+    ) -> None:
+        self.root = root
+        self.malformed = False
+        self._blocks = blocks or {}
+        self._decoded: set[Node] = set()
+        self._codec = codec
+        self._source = source
+        self._log = log
+        self._section_keys = section_keys or {}
+        self._written_codec = written_codec
+        self._lock = threading.Lock()
+        self._indexes: dict[Node, _CachedChildIndex] = {}
+
+    def load(self, node: Node) -> bool:
+        """Decode the children of one top-level node if they are still pending."""
+        with self._lock:
+            if self.malformed:
+                return False
+            block = self._blocks.get(node)
+            if block is None or node in self._decoded:
+                return True
+            try:
+                records = _block_records(self._codec, block)
+                node.children = [_node_from_record(record, node) for record in records]
+            except (TypeError, ValueError):
+                self.malformed = True
+                self._blocks.clear()
+                self._log.warning("Ignoring malformed course cache: %s", self._source)
+                return False
+            self._decoded.add(node)
+            return True
+
+    def identity_key(self, node: Node) -> str | None:
+        """The recorded ``section_identity_key`` of a top-level node, if known."""
+        keys = self._section_keys.get(node)
+        return keys[1] if keys is not None else None
+
+    def reusable_block(
+        self,
+        node: Node,
+        digest: str,
+        codec: CacheCodec,
+    ) -> bytes | None:
+        """The compressed block of a top-level node whose records are unchanged."""
+        keys = self._section_keys.get(node)
+        with self._lock:
+            if self.malformed or codec != self._written_codec or keys is None:
+                return None
+            return self._blocks.get(node) if keys[0] == digest else None
+
+    def materialize(self) -> Node | None:
+        """Decode every pending subtree and return the complete course tree."""
+        for child in list(self.root.children):
+            if not self.load(child):
+                return None
+        return self.root
+
+    def match_child(
+        self,
+        parent: Node | None,
+        child: Node,
+        youtube: bool = True,
+    ) -> Node | None:
+        """Match ``child`` below a cached node through its indexed children.
+
+        With ``youtube`` enabled this follows ``match_old_cache_child``,
+        otherwise ``match_equivalent_child``.
+        """
+        if parent is None:
+            return None
+        with self._lock:
+            index = self._indexes.get(parent)
+            if index is None:
+                index = self._indexes[parent] = _CachedChildIndex(parent.children)
+        return index.match(child, youtube)
+
+    def find(
+        self,
+        relative_nodes: Sequence[Node],
+        youtube: bool = True,
+    ) -> Node | None:
+        """Follow ``relative_nodes`` below the course, decoding only that path."""
+        if not relative_nodes:
+            return self.materialize()
+        cached: Node | None = self.root
+        for depth, relative_node in enumerate(relative_nodes):
+            cached = self.match_child(cached, relative_node, youtube)
+            if cached is None:
+                return None
+            if depth == 0 and not self.load(cached):
+                return None
+        return cached
+
+
 @dataclass
 class CourseCacheState:
-    course_root: Node | None = None
+    cached_tree: CachedCourseTree | None = None
     cached_inventory_scope: str | None = None
     current_inventory_scope: str | None = None
     cached_text: dict[str, dict[int, CachedTextEntry]] = field(
@@ -92,6 +301,22 @@ class CourseCacheState:
     assignments: dict[int, AssignmentCacheEntry] = field(default_factory=dict)
     quizzes: dict[int, QuizCacheEntry] = field(default_factory=dict)
     complete_module_inventory: bool = False
+    fingerprint: str | None = None
+
+    @property
+    def course_root(self) -> Node | None:
+        """The complete previous course tree, or ``None`` without a usable cache."""
+        return self.cached_tree.materialize() if self.cached_tree else None
+
+    def cached_node(
+        self,
+        relative_nodes: Sequence[Node],
+        youtube: bool = False,
+    ) -> Node | None:
+        """Find the cached node for a path of current nodes below the course."""
+        if self.cached_tree is None:
+            return None
+        return self.cached_tree.find(relative_nodes, youtube)
 
 
 def _node_path(ctx: SyncContext, node: Node) -> Path:
@@ -108,7 +333,7 @@ def _node_artifact_paths(
         return [node_path]
     return [
         node_path.with_name(f"{node_path.name}.{suffix}")
-        for suffix in metadata_node.artifact_hashes
+        for suffix in metadata_node.stored_artifact_hashes
     ]
 
 
@@ -148,6 +373,11 @@ def course_cache_path(ctx: SyncContext, course_node: Node) -> Path:
     return with_windows_extended_length_prefix(cache_path)
 
 
+def _cache_key(ctx: SyncContext, course_node: Node) -> CourseCacheKey:
+    identity = _cache_identity(ctx, course_node)
+    return identity["site"], identity["user_id"], identity["course_id"]
+
+
 def _cache_identity(ctx: SyncContext, course_node: Node) -> dict[str, Any]:
     account = ctx.require_moodle_account()
     course_id = _module_id(course_node.id)
@@ -160,17 +390,343 @@ def _cache_identity(ctx: SyncContext, course_node: Node) -> dict[str, Any]:
     }
 
 
+def _compact_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def _node_record(data: dict[str, Any], children: bool = True) -> list[Any]:
+    return [
+        *(data.get(key) for key in NODE_RECORD_FIELDS),
+        [_node_record(child) for child in data["children"]] if children else [],
+    ]
+
+
+def _record_fields(record: Any) -> tuple[dict[str, Any], list[Any]]:
+    if not isinstance(record, list) or len(record) != len(NODE_RECORD_FIELDS) + 1:
+        raise ValueError("course cache node record is malformed")
+    children = record[-1]
+    if not isinstance(children, list):
+        raise ValueError("course cache node has invalid children")
+    data = dict(zip(NODE_RECORD_FIELDS, record[:-1], strict=True))
+    data["children"] = []
+    return data, children
+
+
+def _node_from_record(record: Any, parent: Node | None = None) -> Node:
+    data, children = _record_fields(record)
+    node = node_from_cache_data(data, parent)
+    node.children = [_node_from_record(child, node) for child in children]
+    return node
+
+
+def _record_data(record: Any) -> dict[str, Any]:
+    data, children = _record_fields(record)
+    data["children"] = [_record_data(child) for child in children]
+    return data
+
+
+def _buffered_pieces(pieces: Iterable[bytes]) -> Iterator[bytes]:
+    buffer = bytearray()
+    for piece in pieces:
+        buffer += piece
+        if len(buffer) >= COURSE_CACHE_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+@dataclass
+class _EncodedSection:
+    record: list[Any]
+    children: Callable[[], Iterable[bytes]]
+    identity_key: str | None
+    reuse: Callable[[str], bytes | None] | None
+    digest: str = ""
+
+
+class CourseCacheEncoder:
+    """Incrementally encode one course in the v3 layout.
+
+    Sections are added with a callable producing the JSON pieces of their
+    children, so no uncompressed payload is ever held. ``finish`` hashes the
+    pieces without compressing anything, which lets an unchanged course be
+    recognized cheaply. ``chunks`` then streams each section through the
+    compressor while it is written, or copies the previous compressed block of
+    a section whose records are unchanged. Only the compressed blocks are kept;
+    they back the lazily decoded tree afterwards.
+    """
+
+    def __init__(self, codec: CacheCodec = DEFAULT_CACHE_CODEC) -> None:
+        self.codec = codec
+        self.sections: list[list[Any]] = []
+        self.blocks: list[bytes] = []
+        self.header: dict[str, Any] = {}
+        self._pending: list[_EncodedSection] = []
+
+    def add_section(
+        self,
+        record: list[Any],
+        children: Callable[[], Iterable[bytes]],
+        identity_key: str | None = None,
+        reuse: Callable[[str], bytes | None] | None = None,
+    ) -> None:
+        """Add a top-level child record and a producer of its children's JSON.
+
+        ``reuse`` returns the previously written block for a section digest,
+        or ``None`` when the section has to be compressed again.
+        """
+        self._pending.append(_EncodedSection(record, children, identity_key, reuse))
+
+    def finish(self, header: dict[str, Any]) -> str:
+        """Complete the header and return the fingerprint of the whole payload."""
+        header = {
+            **header,
+            "format": COURSE_CACHE_FORMAT,
+            COMPRESSION_CACHE_KEY: [self.codec.name, self.codec.level],
+        }
+        fingerprint = hashlib.sha256()
+        for section in self._pending:
+            digest = hashlib.sha256(_compact_json(section.record))
+            for piece in section.children():
+                digest.update(piece)
+            section.digest = digest.hexdigest()
+            fingerprint.update(section.digest.encode("ascii"))
+        fingerprint.update(_compact_json(header))
+        course_digest = fingerprint.hexdigest()
+        self.header = {
+            **header,
+            "sections": self.sections,
+            FINGERPRINT_CACHE_KEY: course_digest,
+        }
+        return course_digest
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield the encoded file after ``finish``, compressing as it goes."""
+        self.sections.clear()
+        self.blocks.clear()
+        yield COURSE_CACHE_MAGIC + bytes([self.codec.codec_id])
+        for section in self._pending:
+            block = section.reuse(section.digest) if section.reuse else None
+            if block is not None:
+                yield block
+            else:
+                compressor = self.codec.compressor()
+                compressed = []
+                for piece in _buffered_pieces(section.children()):
+                    output = compressor.compress(piece)
+                    if output:
+                        compressed.append(output)
+                        yield output
+                output = compressor.flush()
+                compressed.append(output)
+                yield output
+                block = b"".join(compressed)
+            self.sections.append(
+                [section.record, len(block), section.digest, section.identity_key]
+            )
+            self.blocks.append(block)
+        encoded_header = self.codec.compress(_compact_json(self.header))
+        yield encoded_header
+        yield _HEADER_LENGTH.pack(len(encoded_header))
+
+
+def encode_course_cache(
+    payload: dict[str, Any],
+    codec: CacheCodec = DEFAULT_CACHE_CODEC,
+) -> bytes:
+    """Encode a nested course cache payload in the v3 binary layout."""
+    course = payload["course"]
+    encoder = CourseCacheEncoder(codec)
+    for child in course["children"]:
+        records = _compact_json([_node_record(record) for record in child["children"]])
+        encoder.add_section(
+            _node_record(child, children=False),
+            partial(iter, (records,)),
+            section_identity_key(node_from_cache_data(child)),
+        )
+    header = {
+        key: value
+        for key, value in payload.items()
+        if key not in {"format", "course", COMPRESSION_CACHE_KEY, FINGERPRINT_CACHE_KEY}
+    }
+    header["course"] = _node_record(course, children=False)
+    encoder.finish(header)
+    return b"".join(encoder.chunks())
+
+
+@dataclass(frozen=True)
+class _SectionBlocks:
+    codec: CacheCodec
+    blocks: list[bytes]
+
+
+def _block_records(codec: CacheCodec, block: bytes) -> list[Any]:
+    records = json.loads(codec.decompress(block).decode("utf-8"))
+    if not isinstance(records, list):
+        raise ValueError("course cache block is not a list")
+    return records
+
+
+def _course_cache_codec(data: bytes) -> CacheCodec:
+    if len(data) <= len(COURSE_CACHE_MAGIC):
+        raise ValueError("course cache is truncated")
+    return cache_codec_for_id(data[len(COURSE_CACHE_MAGIC)])
+
+
+def _decode_course_cache(
+    data: bytes,
+    codec: CacheCodec,
+) -> tuple[dict[str, Any], list[bytes]]:
+    (header_length,) = _HEADER_LENGTH.unpack_from(data, len(data) - _HEADER_LENGTH.size)
+    header_end = len(data) - _HEADER_LENGTH.size
+    header_start = header_end - header_length
+    offset = len(COURSE_CACHE_MAGIC) + 1
+    if header_start < offset:
+        raise ValueError("course cache header length is malformed")
+    header = json.loads(codec.decompress(data[header_start:header_end]).decode("utf-8"))
+    if not isinstance(header, dict) or not isinstance(header.get("sections"), list):
+        raise ValueError("course cache header is malformed")
+    blocks = []
+    for section in header["sections"]:
+        # Entries are [record, block length] or, since section reuse,
+        # [record, block length, records digest, identity key].
+        if (
+            not isinstance(section, list)
+            or len(section) not in {2, 4}
+            or not isinstance(section[1], int)
+            or section[1] < 0
+        ):
+            raise ValueError("course cache section index is malformed")
+        blocks.append(data[offset : offset + section[1]])
+        offset += section[1]
+    if offset != header_start:
+        raise ValueError("course cache size does not match its section index")
+    return header, blocks
+
+
+def write_course_cache_payload(
+    path: Path,
+    payload: dict[str, Any],
+    codec: CacheCodec = DEFAULT_CACHE_CODEC,
+) -> None:
+    """Atomically write a nested course cache payload with private permissions."""
+    write_private_bytes(path, encode_course_cache(payload, codec), "course cache")
+
+
+def read_course_cache_payload(path: Path) -> dict[str, Any] | None:
+    """Read a course cache file back into its nested payload form."""
+    data = read_private_bytes(path, "course cache")
+    return decode_course_cache_payload(data) if data is not None else None
+
+
+def decode_course_cache_payload(data: bytes) -> dict[str, Any] | None:
+    """Decode an encoded v3 course cache into its nested payload form."""
+    if not data.startswith(COURSE_CACHE_MAGIC):
+        return None
+    try:
+        codec = _course_cache_codec(data)
+        header, blocks = _decode_course_cache(data, codec)
+        header.pop(FINGERPRINT_CACHE_KEY, None)
+        header.pop(COMPRESSION_CACHE_KEY, None)
+        course = _record_data(header.pop("course"))
+        sections = header.pop("sections")
+        for entry, block in zip(sections, blocks, strict=True):
+            section = _record_data(entry[0])
+            section["children"] = [
+                _record_data(child) for child in _block_records(codec, block)
+            ]
+            course["children"].append(section)
+    except (struct.error, TypeError, ValueError):
+        return None
+    header["course"] = course
+    return header
+
+
 def _read_course_cache_payload(
     cache_path: Path,
     log: logging.Logger,
-) -> dict[str, Any] | None:
-    payload = read_private_gzip_json(cache_path, "course cache")
-    if not isinstance(payload, dict):
+) -> tuple[dict[str, Any], _SectionBlocks | None] | None:
+    data = read_private_bytes(cache_path, "course cache")
+    if data is None:
         return None
-    if payload.get("format") != COURSE_CACHE_FORMAT:
-        log.warning("Ignoring unsupported course cache format: %s", cache_path)
-        return None
-    return payload
+    return _decode_course_cache_payload(data, cache_path, log)
+
+
+def _decode_course_cache_payload(
+    data: bytes,
+    cache_path: Path,
+    log: logging.Logger,
+) -> tuple[dict[str, Any], _SectionBlocks | None] | None:
+    if data.startswith(COURSE_CACHE_MAGIC):
+        try:
+            codec = _course_cache_codec(data)
+        except ValueError:
+            log.warning("Ignoring unsupported course cache format: %s", cache_path)
+            return None
+        try:
+            header, blocks = _decode_course_cache(data, codec)
+        except (struct.error, ValueError):
+            log.warning("Ignoring malformed course cache: %s", cache_path)
+            return None
+        if header.get("format") == COURSE_CACHE_FORMAT:
+            return header, _SectionBlocks(codec, blocks)
+    else:
+        # v2 caches were a single gzip JSON document; they stay readable and
+        # are rewritten in the current layout by the next writing sync.
+        try:
+            payload = json.loads(gzip.decompress(data).decode("utf-8"))
+        except (OSError, EOFError, zlib.error, ValueError):
+            payload = None
+        if isinstance(payload, dict) and (
+            payload.get("format") == JSON_COURSE_CACHE_FORMAT
+        ):
+            return payload, None
+    log.warning("Ignoring unsupported course cache format: %s", cache_path)
+    return None
+
+
+def _cached_course_tree(
+    payload: dict[str, Any],
+    sections: _SectionBlocks | None,
+    cache_path: Path,
+    log: logging.Logger,
+) -> CachedCourseTree | None:
+    if sections is None:
+        course_data = payload.get("course")
+        if not isinstance(course_data, dict):
+            return None
+        return CachedCourseTree(node_from_cache_data(course_data))
+    root = _node_from_record(payload.get("course"))
+    if root.children:
+        raise ValueError("course cache root record has inline children")
+    section_keys: dict[Node, tuple[str, str]] = {}
+    for entry in payload["sections"]:
+        section = _node_from_record(entry[0], root)
+        if section.children:
+            raise ValueError("course cache section record has inline children")
+        root.children.append(section)
+        if len(entry) == 4 and all(isinstance(key, str) for key in entry[2:]):
+            section_keys[section] = (entry[2], entry[3])
+    # Blocks are reused only when they were compressed at the same level.
+    compression = payload.get(COMPRESSION_CACHE_KEY)
+    written_codec = (
+        CacheCodec(sections.codec.name, compression[1])
+        if isinstance(compression, list)
+        and len(compression) == 2
+        and compression[0] == sections.codec.name
+        and isinstance(compression[1], int)
+        else None
+    )
+    return CachedCourseTree(
+        root,
+        dict(zip(root.children, sections.blocks, strict=True)),
+        sections.codec,
+        cache_path,
+        log,
+        section_keys,
+        written_codec,
+    )
 
 
 def _legacy_course_cache_paths(
@@ -185,26 +741,29 @@ def _legacy_course_cache_paths(
     if direct_path.is_file():
         yield direct_path
     stable_directory = internal_root.path(COURSE_CACHE_DIRECTORY)
-    if ctx.legacy_course_cache_paths is None:
-        paths_by_course: dict[int, list[Path]] = {}
-        for discovered_path in sync_directory.rglob(COURSE_CACHE_FILENAME):
-            path = internal_root.require(discovered_path)
-            if not path.is_file() or path.is_relative_to(stable_directory):
-                continue
-            payload = read_private_gzip_json(path, "legacy course cache")
-            if (
-                not isinstance(payload, dict)
-                or set(payload) != {"format", "course"}
-                or payload.get("format") != LEGACY_COURSE_CACHE_FORMAT
-                or not isinstance(payload.get("course"), dict)
-            ):
-                continue
-            course_id = _module_id(payload["course"].get("id"))
-            if course_id is not None:
-                paths_by_course.setdefault(course_id, []).append(path)
-        ctx.legacy_course_cache_paths = paths_by_course
+    # Concurrent course workers share one scan of the sync directory.
+    with ctx.course_state_lock:
+        if ctx.legacy_course_cache_paths is None:
+            paths_by_course: dict[int, list[Path]] = {}
+            for discovered_path in sync_directory.rglob(COURSE_CACHE_FILENAME):
+                path = internal_root.require(discovered_path)
+                if not path.is_file() or path.is_relative_to(stable_directory):
+                    continue
+                payload = read_private_gzip_json(path, "legacy course cache")
+                if (
+                    not isinstance(payload, dict)
+                    or set(payload) != {"format", "course"}
+                    or payload.get("format") != LEGACY_COURSE_CACHE_FORMAT
+                    or not isinstance(payload.get("course"), dict)
+                ):
+                    continue
+                course_id = _module_id(payload["course"].get("id"))
+                if course_id is not None:
+                    paths_by_course.setdefault(course_id, []).append(path)
+            ctx.legacy_course_cache_paths = paths_by_course
+        legacy_paths = ctx.legacy_course_cache_paths
     course_id = _module_id(course_node.id)
-    for cached_path in ctx.legacy_course_cache_paths.get(course_id or -1, []):
+    for cached_path in legacy_paths.get(course_id or -1, []):
         path = internal_root.require(cached_path)
         if path != direct_path and path.is_file():
             yield path
@@ -311,8 +870,10 @@ def _migrate_legacy_course_cache(
             return migrated
         try:
             safe_cache_path = internal_root.create_parent(cache_path)
-            write_private_gzip_json(
-                with_windows_extended_length_prefix(safe_cache_path), migrated
+            write_course_cache_payload(
+                with_windows_extended_length_prefix(safe_cache_path),
+                migrated,
+                ctx.cache_codec,
             )
         except OSError as error:
             log.warning(
@@ -458,29 +1019,43 @@ def _course_cache_state(
     log: logging.Logger,
     internal_root: InternalPathRoot | None = None,
 ) -> CourseCacheState:
-    if course_node in ctx.course_cache_states:
-        return ctx.course_cache_states[course_node]
+    with ctx.shared_cache_lock:
+        known = ctx.course_cache_states.get(course_node)
+    if known is not None:
+        return known
 
     internal_root = internal_root or _internal_path_root(ctx)
     raw_cache_path = _course_cache_path(ctx, course_node, internal_root)
     cache_path = with_windows_extended_length_prefix(raw_cache_path)
-    cache_exists = cache_path.exists()
-    payload = _read_course_cache_payload(cache_path, log) if cache_exists else None
+    database = ctx.course_cache_database()
+    data = database.load(_cache_key(ctx, course_node)) if database is not None else None
+    # Without a database row, a per-course file from the files store is read
+    # instead; it moves into the database with the next writing sync.
+    stored = database is not None and data is not None
+    if stored:
+        assert database is not None and data is not None
+        cache_path = database.path
+        cache_exists = True
+        loaded = _decode_course_cache_payload(data, cache_path, log)
+    else:
+        cache_exists = cache_path.exists()
+        loaded = _read_course_cache_payload(cache_path, log) if cache_exists else None
     if not cache_exists:
-        payload = _migrate_legacy_course_cache(
+        migrated = _migrate_legacy_course_cache(
             ctx, course_node, raw_cache_path, internal_root, log
         )
+        loaded = (migrated, None) if migrated is not None else None
+    payload, sections = loaded if loaded is not None else (None, None)
     if payload is not None and payload.get("identity") != _cache_identity(
         ctx, course_node
     ):
         log.warning("Ignoring course cache with mismatched identity: %s", cache_path)
         payload = None
 
-    course_root = None
-    course_data = payload.get("course") if payload else None
-    if isinstance(course_data, dict):
+    cached_tree = None
+    if payload is not None:
         try:
-            course_root = node_from_cache_data(course_data)
+            cached_tree = _cached_course_tree(payload, sections, cache_path, log)
         except (TypeError, ValueError):
             log.warning("Ignoring malformed course cache: %s", cache_path)
 
@@ -496,8 +1071,17 @@ def _course_cache_state(
         and raw_cache.get("owner_user_id") == current_user_id
     )
     course_id = _module_id(course_node.id)
+    fingerprint = payload.get(FINGERPRINT_CACHE_KEY) if payload else None
     state = CourseCacheState(
-        course_root=course_root,
+        cached_tree=cached_tree,
+        fingerprint=(
+            fingerprint
+            if sections is not None
+            and cached_tree is not None
+            and isinstance(fingerprint, str)
+            and (database is None or stored)
+            else None
+        ),
         cached_inventory_scope=_inventory_scope(
             payload.get(INVENTORY_SCOPE_CACHE_KEY) if payload else None
         ),
@@ -527,8 +1111,10 @@ def _course_cache_state(
             course_id,
             raw_cache.get(LINKED_RESOURCES_CACHE_KEY),
         )
-    ctx.course_cache_states[course_node] = state
-    return state
+    # A concurrent caller may have loaded the same course meanwhile; keep the
+    # state that was published first so every reader shares one instance.
+    with ctx.shared_cache_lock:
+        return ctx.course_cache_states.setdefault(course_node, state)
 
 
 def get_cached_text(
@@ -748,16 +1334,16 @@ def match_old_cache_child(old_node: Node | None, child: Node) -> Node | None:
     return match_equivalent_child(old_node, child)
 
 
-def node_to_cache_data(
+def _cache_node_fields(
     ctx: SyncContext,
     node: Node,
-    old_node: Node | None = None,
+    old_node: Node | None,
 ) -> dict[str, Any]:
     timemodified = node.timemodified
     etag = node.etag
     etag_kind = node.etag_kind
     content_hash = node.content_hash
-    artifact_hashes = dict(node.artifact_hashes)
+    artifact_hashes = dict(node.stored_artifact_hashes)
     remote_size = node.remote_size
     is_handled = node.is_handled
     is_verified = node.is_verified
@@ -782,7 +1368,7 @@ def node_to_cache_data(
         etag = old_node.etag
         etag_kind = old_node.etag_kind
         content_hash = old_node.content_hash
-        artifact_hashes = dict(old_node.artifact_hashes)
+        artifact_hashes = dict(old_node.stored_artifact_hashes)
         remote_size = remote_size if remote_size is not None else old_node.remote_size
         is_handled = True
         is_verified = True
@@ -812,13 +1398,27 @@ def node_to_cache_data(
             if is_handled
             else DownloadStatus.PENDING
         ),
-        "children": [
-            node_to_cache_data(ctx, child, match_old_cache_child(old_node, child))
-            for child in node.children
-        ],
     }
 
 
+def _cache_record_pieces(
+    ctx: SyncContext,
+    nodes: list[Node],
+    old_parent: Node | None,
+    match: Callable[[Node | None, Node], Node | None],
+) -> Iterator[bytes]:
+    """Yield the JSON list of cache records for ``nodes`` piece by piece."""
+    yield b"["
+    for index, node in enumerate(nodes):
+        old_node = match(old_parent, node)
+        fields = _node_record(_cache_node_fields(ctx, node, old_node), children=False)
+        # Leave the record open so the children list streams in as its last item.
+        yield (b"," if index else b"") + _compact_json(fields)[:-3]
+        yield from _cache_record_pieces(ctx, node.children, old_node, match)
+        yield b"]"
+    yield b"]"
+
+
 def node_from_cache_data(data: dict[str, Any], parent: Node | None = None) -> Node:
     name = data.get("name", "")
     node_type = data.get("type", "Unknown")
@@ -867,18 +1467,63 @@ def get_course_cache_root(
     return _course_cache_state(ctx, course_node, log).course_root
 
 
-def comparable_course_cache_root(
+def comparable_course_cache_sections(
     ctx: SyncContext,
     course_node: Node,
     inventory_scope: str,
     log: logging.Logger = logger,
-) -> Node | None:
-    """Return the prior tree only when its discovery policy matches this run."""
+) -> list[Node] | None:
+    """Return prior top-level subtrees that may hold content removed since.
+
+    Returns ``None`` unless the prior tree's discovery policy matches this run.
+    A prior section with the identity key of a current section still has all
+    of its remote content, so it is left out and stays undecoded.
+    """
     state = _course_cache_state(ctx, course_node, log)
     state.current_inventory_scope = inventory_scope
-    return (
-        state.course_root if state.cached_inventory_scope == inventory_scope else None
-    )
+    tree = state.cached_tree
+    if tree is None or state.cached_inventory_scope != inventory_scope:
+        return None
+    current_keys = {section_identity_key(section) for section in course_node.children}
+    sections = []
+    for section in tree.root.children:
+        if tree.identity_key(section) in current_keys:
+            continue
+        if not tree.load(section):
+            return None
+        sections.append(section)
+    return sections
+
+
+def remote_content_identity(node: Node) -> tuple[str, str] | None:
+    """Return a stable comparison key and a safe user-visible identity."""
+    if not node.url:
+        return None
+    youtube_id = links.youtube_video_id_from_node(node)
+    if youtube_id is not None:
+        identity = f"youtube:{youtube_id}"
+        return identity, identity
+    identity_url, display_url = canonical_remote_url(node.url)
+    if node.download_kind is DownloadKind.OPENCAST:
+        identity = f"opencast:{node.id}:{identity_url.partition('?')[0]}"
+        return identity, identity
+    if node.download_kind in {DownloadKind.EMEDIA, DownloadKind.QUIZ} and node.id:
+        identity = f"{node.download_kind}:{node.id}"
+        return identity, identity
+    return f"{node.download_kind}:{identity_url}", display_url
+
+
+def section_identity_key(section: Node) -> str:
+    """Hash the remote content identities found in one top-level subtree."""
+    keys = set()
+    pending = [section]
+    while pending:
+        node = pending.pop()
+        pending.extend(node.children)
+        identity = remote_content_identity(node)
+        if identity is not None:
+            keys.add(identity[0])
+    return hashlib.sha256("\n".join(sorted(keys)).encode("utf-8")).hexdigest()
 
 
 def get_old_node_for(
@@ -892,8 +1537,8 @@ def get_old_node_for(
     except ValueError:
         return None
 
-    cached_course_root = get_course_cache_root(ctx, course_node, log)
-    if cached_course_root is None:
+    state = _course_cache_state(ctx, course_node, log)
+    if state.cached_tree is None:
         return None
 
     rel_nodes: list[Node] = []
@@ -903,15 +1548,46 @@ def get_old_node_for(
         if cur.parent is None:
             return None
         cur = cur.parent
-    if not rel_nodes:
-        return cached_course_root
+    return state.cached_node(rel_nodes, youtube=True)
 
-    old_node: Node | None = cached_course_root
-    for rel_node in rel_nodes:
-        old_node = match_old_cache_child(old_node, rel_node)
-        if old_node is None:
-            return None
-    return old_node
+
+def _encode_course(
+    ctx: SyncContext,
+    state: CourseCacheState,
+    course_node: Node,
+) -> tuple[CourseCacheEncoder, str]:
+    tree = state.cached_tree
+    old_root = tree.root if tree is not None else None
+    match = tree.match_child if tree is not None else match_old_cache_child
+    encoder = CourseCacheEncoder(ctx.cache_codec)
+    for section in course_node.children:
+        old_section = match(old_root, section)
+        reuse = None
+        if tree is not None and old_section is not None:
+            # Only matched sections are decoded; their records may carry
+            # markers of files that were not downloaded again this run.
+            if not tree.load(old_section):
+                old_section = None
+            else:
+                reuse = partial(tree.reusable_block, old_section, codec=ctx.cache_codec)
+        encoder.add_section(
+            _node_record(_cache_node_fields(ctx, section, old_section), children=False),
+            partial(_cache_record_pieces, ctx, section.children, old_section, match),
+            section_identity_key(section),
+            reuse,
+        )
+    header: dict[str, Any] = {
+        "identity": _cache_identity(ctx, course_node),
+        "course": _node_record(
+            _cache_node_fields(ctx, course_node, old_root), children=False
+        ),
+    }
+    if state.current_inventory_scope is not None:
+        header[INVENTORY_SCOPE_CACHE_KEY] = state.current_inventory_scope
+    module_cache = _course_module_cache_data(ctx, state, course_node)
+    if module_cache:
+        header[MODULE_CACHE_KEY] = module_cache
+    return encoder, encoder.finish(header)
 
 
 def cache_root_node(
@@ -923,28 +1599,99 @@ def cache_root_node(
         return
 
     internal_root = _internal_path_root(ctx)
-    for semester_node in ctx.root_node.children:
+    database = ctx.course_cache_database()
+    pending: list[tuple[Node, CourseCacheState, CourseCacheEncoder, str]] = []
+    for course_node in _course_nodes(ctx.root_node):
+        state = _course_cache_state(ctx, course_node, log, internal_root)
+        if course_node.id in ctx.incomplete_course_ids:
+            continue
+        tree = state.cached_tree
+        # The stored fingerprint covers the whole uncompressed payload and is
+        # computed without compressing, so an unchanged course keeps its file
+        # and its already loaded previous tree at the cost of one hashing pass.
+        encoder, fingerprint = _encode_course(ctx, state, course_node)
+        if fingerprint == state.fingerprint and tree is not None and not tree.malformed:
+            state.cached_inventory_scope = state.current_inventory_scope
+            continue
+        if database is not None:
+            pending.append((course_node, state, encoder, fingerprint))
+            continue
+        raw_cache_path = _course_cache_path(ctx, course_node, internal_root)
+        internal_root.create_parent(raw_cache_path)
+        cache_path = with_windows_extended_length_prefix(raw_cache_path)
+        write_private_chunks(cache_path, encoder.chunks(), "course cache")
+        _remember_written_cache(state, encoder, fingerprint, cache_path, log)
+
+    if database is not None:
+        _save_to_cache_database(ctx, database, pending, internal_root, log)
+    elif ctx.config.cache_store == "files":
+        _discard_cache_database(internal_root, log)
+
+
+def _course_nodes(root_node: Node) -> Iterator[Node]:
+    for semester_node in root_node.children:
         if semester_node.type != NodeKind.SEMESTER:
             continue
         for course_node in semester_node.children:
-            if course_node.type != NodeKind.COURSE:
-                continue
-            state = _course_cache_state(ctx, course_node, log, internal_root)
-            if course_node.id in ctx.incomplete_course_ids:
-                continue
-            raw_cache_path = _course_cache_path(ctx, course_node, internal_root)
-            internal_root.create_parent(raw_cache_path)
-            cache_path = with_windows_extended_length_prefix(raw_cache_path)
-            payload: dict[str, Any] = {
-                "format": COURSE_CACHE_FORMAT,
-                "identity": _cache_identity(ctx, course_node),
-                "course": node_to_cache_data(ctx, course_node, state.course_root),
-            }
-            if state.current_inventory_scope is not None:
-                payload[INVENTORY_SCOPE_CACHE_KEY] = state.current_inventory_scope
-            module_cache = _course_module_cache_data(ctx, state, course_node)
-            if module_cache:
-                payload[MODULE_CACHE_KEY] = module_cache
-            write_private_gzip_json(cache_path, payload)
-            state.course_root = node_from_cache_data(payload["course"])
-            state.cached_inventory_scope = state.current_inventory_scope
+            if course_node.type == NodeKind.COURSE:
+                yield course_node
+
+
+def _remember_written_cache(
+    state: CourseCacheState,
+    encoder: CourseCacheEncoder,
+    fingerprint: str,
+    cache_path: Path,
+    log: logging.Logger,
+) -> None:
+    state.cached_tree = _cached_course_tree(
+        encoder.header,
+        _SectionBlocks(encoder.codec, encoder.blocks),
+        cache_path,
+        log,
+    )
+    state.cached_inventory_scope = state.current_inventory_scope
+    state.fingerprint = fingerprint
+
+
+def _save_to_cache_database(
+    ctx: SyncContext,
+    database: CacheDatabase,
+    pending: list[tuple[Node, CourseCacheState, CourseCacheEncoder, str]],
+    internal_root: InternalPathRoot,
+    log: logging.Logger,
+) -> None:
+    """Store every changed course in one transaction of the cache database."""
+    if not pending or not database.save(
+        (_cache_key(ctx, course_node), b"".join(encoder.chunks()))
+        for course_node, _, encoder, _ in pending
+    ):
+        return
+    for course_node, state, encoder, fingerprint in pending:
+        _remember_written_cache(state, encoder, fingerprint, database.path, log)
+        # A per-course file left by the files store is now outdated.
+        cache_path = with_windows_extended_length_prefix(
+            _course_cache_path(ctx, course_node, internal_root)
+        )
+        try:
+            cache_path.unlink(missing_ok=True)
+        except OSError as error:
+            log.warning("Could not remove outdated course cache: %s", error)
+
+
+def _discard_cache_database(
+    internal_root: InternalPathRoot,
+    log: logging.Logger,
+) -> None:
+    """Remove a database left by the sqlite store once files are used again.
+
+    Its rows stopped being updated, so they must not be read if the sqlite
+    store is selected again later.
+    """
+    database_path = internal_root.path(COURSE_CACHE_DIRECTORY, CACHE_DATABASE_FILENAME)
+    if not database_path.is_file():
+        return
+    try:
+        database_path.unlink()
+    except OSError as error:
+        log.warning("Could not remove outdated cache database: %s", error)
@@ -2,10 +2,15 @@ import hashlib
 import logging
 import math
 import os
+import queue
 import re
 import shutil
+import threading
 import urllib.parse
-from contextlib import closing
+from collections import Counter, deque
+from collections.abc import Hashable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, closing, contextmanager
 from dataclasses import dataclass
 from enum import Enum
 from fnmatch import fnmatchcase
@@ -13,11 +18,14 @@ from pathlib import Path
 from typing import Any, TypeGuard
 
 import requests
+import urllib3
 import yt_dlp
 
 from syncmymoodle import course_cache, filters, links, opencast, pathing, quiz, storage
 from syncmymoodle.constants import (
-    DEFAULT_BLOCK_SIZE,
+    DOWNLOAD_CHUNK_MAX_SIZE,
+    DOWNLOAD_CHUNK_MIN_SIZE,
+    DOWNLOAD_PROGRESS_STEP,
     HASH_ALGOS_BY_LENGTH,
     HTTP_TIMEOUT_SECONDS,
     YT_DLP_TESTED_VERSION,
@@ -265,27 +273,44 @@ def chunk_looks_like_html(chunk: bytes) -> bool:
     )
 
 
+@contextmanager
 def request_node_url(
     ctx: SyncContext,
     node: Node,
     **kwargs: Any,
-) -> Any:
+) -> Iterator[Any]:
+    """Request a node's file within the per-origin download cap.
+
+    The cap applies to each origin the request actually reaches, including
+    redirect targets, and is held until the response is closed.
+    """
     assert node.url is not None
     course_node = _course_node(node)
     course_id = course_node.id if course_node is not None else None
-    return request_following_safe_redirects(
-        ctx.require_session(),
-        "GET",
-        node.url,
-        lambda url: filters.require_url_allowed(
-            ctx,
-            url,
-            f"redirected {node.type} file",
-            course_id=course_id,
-            inventory=False,
-        ),
-        **kwargs,
-    )
+    with ctx.download_origins.slot() as slot:
+
+        def url_allowed(url: str) -> bool:
+            allowed = filters.require_url_allowed(
+                ctx,
+                url,
+                f"redirected {node.type} file",
+                course_id=course_id,
+                inventory=False,
+            )
+            if allowed:
+                slot.move_to(url)
+            return allowed
+
+        response = request_following_safe_redirects(
+            ctx.require_session(),
+            "GET",
+            node.url,
+            url_allowed,
+            retry=ctx.http_retries,
+            **kwargs,
+        )
+        with closing(response):
+            yield response
 
 
 def _report_download_request_failure(
@@ -382,14 +407,12 @@ def conditional_get_confirms_unchanged(
         headers = {**headers, **node.download_headers}
 
     try:
-        with closing(
-            request_node_url(
-                ctx,
-                node,
-                headers=headers,
-                stream=True,
-                timeout=HTTP_TIMEOUT_SECONDS,
-            )
+        with request_node_url(
+            ctx,
+            node,
+            headers=headers,
+            stream=True,
+            timeout=HTTP_TIMEOUT_SECONDS,
         ) as response:
             response_etag = response.headers.get("ETag")
             if response.status_code == 304:
@@ -577,7 +600,7 @@ def decide_download(
         getattr(old_node, "timemodified", None) if old_node is not None else None
     )
 
-    baseline = baseline or storage.snapshot_file(downloadpath)
+    baseline = baseline or storage.snapshot_file(downloadpath, ctx.digest_index)
     verdict = assess_local_copy(
         node,
         downloadpath,
@@ -597,32 +620,29 @@ def decide_download(
     return DownloadDecision.DOWNLOAD
 
 
-def should_skip_before_decision(
+def _pre_decision_filter(
     ctx: SyncContext, node: Node, downloadpath: Path
-) -> DownloadOutcome | None:
+) -> tuple[str, str, str, str] | None:
+    """Return the ``record_filtered`` entry of a filter excluding ``node``."""
     course_node = _course_node(node)
     course_id = course_node.id if course_node is not None else None
-    if filters.should_skip_url(
-        ctx,
-        node.url,
-        f"{node.type} file",
-        course_id=course_id,
-        inventory=False,
-    ):
-        return SKIPPED_DOWNLOAD
+    url_filter = filters.url_filter_match(
+        ctx, node.url, f"{node.type} file", course_id=course_id
+    )
+    if url_filter is not None:
+        return url_filter
     extension = Path(node.name).suffix.removeprefix(".").casefold()
     excluded_extensions = {
         configured.removeprefix(".").casefold()
         for configured in ctx.config.exclude_filetypes
     }
     if extension and extension in excluded_extensions:
-        ctx.record_filtered(
+        return (
             "filters.exclude_filetypes",
             "file",
             str(downloadpath),
             f"extension {extension!r} is excluded",
         )
-        return SKIPPED_DOWNLOAD
     pattern = next(
         (
             pattern
@@ -632,12 +652,21 @@ def should_skip_before_decision(
         None,
     )
     if pattern is not None:
-        ctx.record_filtered(
+        return (
             "filters.exclude_files",
             "file",
             str(downloadpath),
             f"matches {pattern!r}",
         )
+    return None
+
+
+def should_skip_before_decision(
+    ctx: SyncContext, node: Node, downloadpath: Path
+) -> DownloadOutcome | None:
+    filtered = _pre_decision_filter(ctx, node, downloadpath)
+    if filtered is not None:
+        ctx.record_filtered(*filtered)
         return SKIPPED_DOWNLOAD
     if downloadpath in ctx.downloaded_paths:
         return UNCHANGED_DOWNLOAD
@@ -752,14 +781,14 @@ def stable_download_decision(
 ) -> tuple[DownloadDecision, storage.FileSnapshot]:
     """Classify a target against a content baseline that stayed unchanged."""
     for _ in range(3):
-        baseline = storage.snapshot_file(downloadpath)
+        baseline = storage.snapshot_file(downloadpath, ctx.digest_index)
         decision = decide_download(ctx, node, downloadpath, log, baseline=baseline)
         if baseline.metadata_still_matches(downloadpath):
             return decision, baseline
 
     # A continuously changing target cannot be classified reliably. Treat it
     # as a conflict so the configured policy fails closed.
-    baseline = storage.snapshot_file(downloadpath)
+    baseline = storage.snapshot_file(downloadpath, ctx.digest_index)
     decision = (
         DownloadDecision.CONFLICT if baseline.exists else DownloadDecision.DOWNLOAD
     )
@@ -942,6 +971,37 @@ def response_has_identity_encoding(response: Any) -> bool:
     return content_encoding in {"", "identity"}
 
 
+def response_body_chunks(response: Any) -> Iterator[bytes | memoryview]:
+    """Yield the response body in adaptively sized chunks.
+
+    Identity-encoded bodies are read with ``readinto`` into one reused buffer,
+    so a yielded view is only valid until the next chunk is requested. Other
+    bodies need urllib3's decoding and fall back to ``iter_content``.
+    """
+    readinto = getattr(getattr(response, "raw", None), "readinto", None)
+    if not callable(readinto) or not response_has_identity_encoding(response):
+        yield from response.iter_content(DOWNLOAD_CHUNK_MIN_SIZE)
+        return
+
+    buffer = memoryview(bytearray(DOWNLOAD_CHUNK_MAX_SIZE))
+    size = DOWNLOAD_CHUNK_MIN_SIZE
+    while True:
+        # Raise the same exceptions as iter_content for truncated bodies.
+        try:
+            count = readinto(buffer[:size])
+        except urllib3.exceptions.ProtocolError as error:
+            raise requests.exceptions.ChunkedEncodingError(error) from error
+        except urllib3.exceptions.ReadTimeoutError as error:
+            raise requests.exceptions.ConnectionError(error) from error
+        except urllib3.exceptions.SSLError as error:
+            raise requests.exceptions.SSLError(error) from error
+        if not count:
+            return
+        yield buffer[:count]
+        if count == size:
+            size = min(size * 2, DOWNLOAD_CHUNK_MAX_SIZE)
+
+
 def response_body_is_usable(
     node: Node,
     first_chunk: bytes,
@@ -974,6 +1034,7 @@ def write_response_body(
     first_chunk: bytes,
     *,
     total_size: int | None,
+    digests: storage.StreamingDigests,
 ) -> int:
     with ctx.output.transfer(
         total_size,
@@ -991,13 +1052,21 @@ def write_response_body(
                 pass
 
         mode = "ab" if transfer.resume_size else "wb"
+        if transfer.resume_size:
+            digests.update_from_file(transfer.tmp_path)
         with transfer.tmp_path.open(mode) as file:
-            if first_chunk:
-                progress.advance(len(first_chunk))
-                file.write(first_chunk)
+            file.write(first_chunk)
+            digests.update(first_chunk)
+            pending = len(first_chunk)
             for data in content:
-                progress.advance(len(data))
                 file.write(data)
+                digests.update(data)
+                pending += len(data)
+                if pending >= DOWNLOAD_PROGRESS_STEP:
+                    progress.advance(pending)
+                    pending = 0
+            if pending:
+                progress.advance(pending)
     return progress.transferred_bytes
 
 
@@ -1041,10 +1110,14 @@ def validate_staged_download(
     response: Any,
     transfer: TransferPlan,
     downloadpath: Path,
+    snapshot: storage.FileSnapshot,
     log: logging.Logger,
 ) -> str | None:
-    """Return the staged SHA-256 after validating all advertised integrity data."""
-    snapshot = storage.snapshot_file(transfer.tmp_path)
+    """Return the staged SHA-256 after validating all advertised integrity data.
+
+    ``snapshot`` describes the staged file with the digests computed while it
+    was written, so the file is not read a second time.
+    """
     try:
         actual_size = transfer.tmp_path.stat().st_size
     except OSError:
@@ -1144,6 +1217,7 @@ def record_verified_download(
     content_hash: str,
 ) -> None:
     record_download_metadata(node, downloadpath, etag_header, content_hash)
+    storage.record_file_digest(ctx.digest_index, downloadpath, content_hash)
     ctx.downloaded_paths.add(downloadpath)
     key = transfer_reuse_key(node)
     if key is None:
@@ -1330,11 +1404,16 @@ def process_download_response(
         return report_planned_download(ctx, downloadpath, node.type)
 
     assert transfer is not None
-    content = response.iter_content(DEFAULT_BLOCK_SIZE)
-    first_chunk = next((chunk for chunk in content if chunk), b"")
+    content = response_body_chunks(response)
+    # Copy the first chunk: the reused read buffer is refilled by the next one.
+    first_chunk = bytes(next((chunk for chunk in content if chunk), b""))
     if not response_body_is_usable(node, first_chunk, downloadpath, log):
         return FAILED_DOWNLOAD
 
+    expected_hash = advertised_content_hash(node)
+    digests = storage.StreamingDigests(
+        [expected_hash[0]] if expected_hash is not None else []
+    )
     existed = downloadpath.exists()
     with ctx.output.tracked_action("Downloading", downloadpath, node.type) as action:
         transferred_bytes = write_response_body(
@@ -1345,19 +1424,19 @@ def process_download_response(
             content,
             first_chunk,
             total_size=node.remote_size if response_size is None else response_size,
+            digests=digests,
         )
         staged_hash = validate_staged_download(
             node,
             response,
             transfer,
             downloadpath,
+            digests.snapshot(transfer.tmp_path),
             log,
         )
         if staged_hash is None:
             return FAILED_DOWNLOAD
-        local_hash = (
-            storage.file_sha256(downloadpath) if downloadpath.exists() else None
-        )
+        local_hash = storage.snapshot_file(downloadpath, ctx.digest_index).digest
         if staged_hash == local_hash:
             transfer.discard_partial()
             record_verified_download(
@@ -1430,17 +1509,19 @@ def authorize_opencast_download(
     if not episode_id:
         log.warning("Cannot authorize Opencast download without an episode id")
         return False, course_node.id
-    if not opencast.course_is_authorized(ctx, course_node.id):
-        ctx.output.action("Authorizing", course_node.name, "Opencast")
-    return (
-        opencast.authorize_course_for_episode(
-            ctx,
+    # Concurrent workers share one LTI launch per course instead of racing.
+    with ctx.opencast_authorization_lock:
+        if not opencast.course_is_authorized(ctx, course_node.id):
+            ctx.output.action("Authorizing", course_node.name, "Opencast")
+        return (
+            opencast.authorize_course_for_episode(
+                ctx,
+                course_node.id,
+                episode_id,
+                log,
+            ),
             course_node.id,
-            episode_id,
-            log,
-        ),
-        course_node.id,
-    )
+        )
 
 
 def download_file(
@@ -1481,25 +1562,27 @@ def download_file(
         if transfer is not None
         else {}
     )
-    try:
-        response = request_node_url(
-            ctx,
-            node,
-            headers=headers,
-            stream=True,
-            timeout=HTTP_TIMEOUT_SECONDS,
-        )
-    except requests.RequestException as error:
-        _report_download_request_failure(
-            ctx,
-            download_origin,
-            node.url,
-            error,
-            log,
-        )
-        return FAILED_DOWNLOAD
+    with ExitStack() as request:
+        try:
+            response = request.enter_context(
+                request_node_url(
+                    ctx,
+                    node,
+                    headers=headers,
+                    stream=True,
+                    timeout=HTTP_TIMEOUT_SECONDS,
+                )
+            )
+        except requests.RequestException as error:
+            _report_download_request_failure(
+                ctx,
+                download_origin,
+                node.url,
+                error,
+                log,
+            )
+            return FAILED_DOWNLOAD
 
-    with closing(response):
         failure_kind = _classify_download_response(
             ctx, node, response, download_origin, log
         )
@@ -1563,6 +1646,223 @@ def download_leaf(
         return FAILED_DOWNLOAD
 
 
+def record_leaf_outcome(
+    ctx: SyncContext,
+    node: Node,
+    outcome: DownloadOutcome,
+) -> None:
+    with ctx.course_state_lock:
+        ctx.stats.record_download(outcome)
+    if outcome.is_handled:
+        if outcome.cache_verified:
+            node.mark_handled()
+        else:
+            node.mark_skipped()
+
+
+def leaf_label(node: Node) -> str:
+    path = "/".join(part for part in node.get_path() if part)
+    return f"{node.type}: {path or node.name}"
+
+
+def download_lane_keys(ctx: SyncContext, node: Node) -> list[Hashable]:
+    """Identify local state that ``node`` must not share with another worker."""
+    if node.download_kind is DownloadKind.QUIZ:
+        # Quiz snapshots share the browser session and the PDF renderer.
+        return ["quiz"]
+    sync_directory = Path(ctx.config.sync_directory)
+    if node.download_kind is DownloadKind.YOUTUBE:
+        if node.parent is None:
+            return []
+        return [("path", pathing.get_sanitized_node_path(node.parent, sync_directory))]
+    keys: list[Hashable] = [
+        ("path", pathing.get_sanitized_node_path(node, sync_directory))
+    ]
+    reuse_key = transfer_reuse_key(node)
+    if reuse_key is not None:
+        keys.append(("artifact", reuse_key))
+    return keys
+
+
+def download_lanes(ctx: SyncContext, pending: list[Node]) -> list[list[Node]]:
+    """Group leaves that share a target or reusable artifact, in walk order.
+
+    Each lane runs sequentially on one worker, so per-run deduplication via
+    ``ctx.downloaded_paths`` and ``ctx.verified_download_artifacts`` behaves
+    exactly as in a sequential walk.
+    """
+    parents = list(range(len(pending)))
+
+    def find(index: int) -> int:
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    first_index_by_key: dict[Hashable, int] = {}
+    for index, node in enumerate(pending):
+        for key in download_lane_keys(ctx, node):
+            other = first_index_by_key.setdefault(key, index)
+            parents[find(index)] = find(other)
+
+    lanes: dict[int, list[Node]] = {}
+    for index, node in enumerate(pending):
+        lanes.setdefault(find(index), []).append(node)
+    return list(lanes.values())
+
+
+class DownloadScheduler:
+    """Hand out download lanes round-robin across origins within per-origin caps.
+
+    Lanes are keyed by the normalized HTTP origin of their first leaf. A worker
+    takes the next lane from the first origin with a free slot, so one busy
+    backend cannot occupy every worker while other backends sit idle. This
+    only orders the work: lanes may mix origins and redirects may move a
+    request elsewhere, so ``request_node_url`` enforces the cap per request.
+    """
+
+    def __init__(self, lanes: list[list[Node]], origin_limit: int) -> None:
+        self._queues: dict[str | None, deque[list[Node]]] = {}
+        for lane in lanes:
+            origin = normalized_http_origin(lane[0].url) if lane[0].url else None
+            self._queues.setdefault(origin, deque()).append(lane)
+        self._origins: deque[str | None] = deque(self._queues)
+        self._active: Counter[str | None] = Counter()
+        self._origin_limit = origin_limit
+        self._condition = threading.Condition()
+        self._stopped = False
+
+    def _has_free_slot(self, origin: str | None) -> bool:
+        return origin is None or self._active[origin] < self._origin_limit
+
+    def acquire(self) -> tuple[str | None, list[Node]] | None:
+        """Block until a lane may start; return None once no lanes remain."""
+        with self._condition:
+            while not self._stopped and self._origins:
+                for _ in range(len(self._origins)):
+                    origin = self._origins[0]
+                    self._origins.rotate(-1)
+                    if not self._has_free_slot(origin):
+                        continue
+                    lanes = self._queues[origin]
+                    lane = lanes.popleft()
+                    if not lanes:
+                        del self._queues[origin]
+                        self._origins.remove(origin)
+                    self._active[origin] += 1
+                    return origin, lane
+                self._condition.wait()
+            return None
+
+    def release(self, origin: str | None) -> None:
+        with self._condition:
+            self._active[origin] -= 1
+            self._condition.notify_all()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+
+def download_pending_concurrently(
+    ctx: SyncContext,
+    pending: list[Node],
+    workers: int,
+    log: logging.Logger,
+) -> None:
+    """Download leaves on a bounded worker pool.
+
+    Workers only transfer and report outcomes; statistics, cache markers and
+    item progress are recorded on the calling thread in completion order.
+    """
+    lanes = download_lanes(ctx, pending)
+    scheduler = DownloadScheduler(lanes, ctx.config.download_workers_per_origin)
+    results: queue.SimpleQueue[tuple[Node, DownloadOutcome] | None] = (
+        queue.SimpleQueue()
+    )
+    stop = threading.Event()
+
+    def run_worker() -> None:
+        try:
+            while (acquired := scheduler.acquire()) is not None:
+                origin, lane = acquired
+                try:
+                    for node in lane:
+                        if stop.is_set():
+                            return
+                        results.put((node, download_leaf(ctx, node, log)))
+                finally:
+                    scheduler.release(origin)
+        finally:
+            results.put(None)
+
+    worker_count = min(workers, len(lanes))
+    executor = ThreadPoolExecutor(
+        max_workers=worker_count,
+        thread_name_prefix="syncmymoodle-download",
+    )
+    futures = [executor.submit(run_worker) for _ in range(worker_count)]
+    progress = ctx.output.sync_progress
+    running = len(futures)
+    completed = 0
+    try:
+        while running:
+            result = results.get()
+            if result is None:
+                running -= 1
+                continue
+            node, outcome = result
+            completed += 1
+            record_leaf_outcome(ctx, node, outcome)
+            progress.complete_concurrent_item(completed, leaf_label(node))
+    except BaseException:
+        stop.set()
+        scheduler.stop()
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+    for future in futures:
+        future.result()
+
+
+def warm_local_digests(ctx: SyncContext, pending: list[Node]) -> None:
+    """Hash existing download targets in parallel before deciding downloads.
+
+    Only targets that will reach the digest comparison are hashed: filtered,
+    already downloaded and size-limited nodes are left out, and dry runs
+    compare lazily instead.
+    """
+    if not ctx.config.update_files or ctx.config.dry_run:
+        return
+    sync_directory = Path(ctx.config.sync_directory)
+    targets: dict[Path, set[str]] = {}
+    for node in pending:
+        if node.download_kind in {DownloadKind.YOUTUBE, DownloadKind.QUIZ}:
+            continue
+        downloadpath = pathing.get_sanitized_node_path(node, sync_directory)
+        if (
+            downloadpath in ctx.downloaded_paths
+            or _pre_decision_filter(ctx, node, downloadpath) is not None
+            or (
+                node.remote_size is not None
+                and size_limit_violation(ctx, node.remote_size) is not None
+            )
+        ):
+            continue
+        algorithms = targets.setdefault(downloadpath, {"sha256"})
+        if node.etag_kind is RemoteMarkerKind.CONTENT_HASH and (
+            parsed := parse_content_hash(node.etag)
+        ):
+            algorithms.add(parsed[0])
+    if targets:
+        storage.warm_digests(
+            ctx.digest_index,
+            targets,
+            ctx.output.sync_progress.check_local_files,
+        )
+
+
 def download_node_tree(
     ctx: SyncContext,
     cur_node: Node,
@@ -1580,17 +1880,21 @@ def download_node_tree(
 
     collect(cur_node)
     progress = ctx.output.sync_progress
-    progress.begin_items(len(pending), dry_run=ctx.config.dry_run)
+    workers = ctx.config.download_workers
+    concurrent = workers > 1 and len(pending) > 1
+    progress.begin_items(
+        len(pending),
+        dry_run=ctx.config.dry_run,
+        concurrent=concurrent,
+    )
+    warm_local_digests(ctx, pending)
+    if concurrent:
+        download_pending_concurrently(ctx, pending, workers, log)
+        return
     for index, node in enumerate(pending, start=1):
-        path = "/".join(part for part in node.get_path() if part)
-        progress.start_item(index, f"{node.type}: {path or node.name}")
+        progress.start_item(index, leaf_label(node))
         outcome = download_leaf(ctx, node, log)
-        ctx.stats.record_download(outcome)
-        if outcome.is_handled:
-            if outcome.cache_verified:
-                node.mark_handled()
-            else:
-                node.mark_skipped()
+        record_leaf_outcome(ctx, node, outcome)
         progress.finish_item(index)
 
 
@@ -23,13 +23,17 @@ from syncmymoodle.constants import (
     EMEDIA_API_URL,
     EMEDIA_LINK_RE,
     EMEDIA_URL,
+    HTTP_POOL_SIZE,
     HTTP_TIMEOUT_SECONDS,
 )
 from syncmymoodle.context import SyncContext
 from syncmymoodle.http_utils import (
     HttpFailureKind,
+    LatencyAdapter,
+    LatencyTracker,
     classify_http_failure,
     classify_request_failure,
+    create_session,
     read_capped_body,
     record_service_failure,
     redact_url_secrets,
@@ -62,10 +66,14 @@ class EmediaResolution:
     failure: str | None = None
 
 
-class _CelliaTLSAdapter(requests.adapters.HTTPAdapter):
+class _CelliaTLSAdapter(LatencyAdapter):
     """Supply the public intermediate certificate omitted by Cellia's server."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        latency: LatencyTracker | None = None,
+        pool_size: int = HTTP_POOL_SIZE,
+    ) -> None:
         certificate = resources.files("syncmymoodle").joinpath(
             *Path(INTERMEDIATE_CERTIFICATE).parts
         )
@@ -75,7 +83,7 @@ class _CelliaTLSAdapter(requests.adapters.HTTPAdapter):
         self.ssl_context.load_verify_locations(
             cadata=certificate.read_text(encoding="ascii")
         )
-        super().__init__()
+        super().__init__(latency, pool_maxsize=pool_size)
 
     def init_poolmanager(
         self,
@@ -154,8 +162,12 @@ def _parse_video(payload: Any, video_id: int) -> EmediaResolution:
 
 def _api_session(ctx: SyncContext) -> requests.Session:
     if ctx.emedia_api_session is None:
-        ctx.emedia_api_session = requests.Session()
-        ctx.emedia_api_session.mount(EMEDIA_API_URL, _CelliaTLSAdapter())
+        pool_size = ctx.config.http_pool_size
+        ctx.emedia_api_session = create_session(
+            pool_size=pool_size,
+            adapters={EMEDIA_API_URL: _CelliaTLSAdapter(ctx.http_latency, pool_size)},
+            latency=ctx.http_latency,
+        )
     return ctx.emedia_api_session
 
 
@@ -309,6 +321,7 @@ def _revision_marker(
             ),
             headers=REQUEST_HEADERS,
             stream=True,
+            retry=ctx.http_retries,
             timeout=HTTP_TIMEOUT_SECONDS,
         )
         with closing(response):
@@ -92,16 +92,16 @@ def domain_matches(netloc: str, allowed_domain: str) -> bool:
     return host == domain or host.endswith(f".{domain}")
 
 
-def should_skip_url(
+def url_filter_match(
     ctx: SyncContext,
     url: str | None,
     context: str = "link",
     *,
     course_id: Any = None,
-    inventory: bool = True,
-) -> bool:
+) -> tuple[str, str, str, str] | None:
+    """Return the ``record_filtered`` entry of a filter excluding ``url``."""
     if not url:
-        return False
+        return None
 
     config = ctx.config
     url = str(url).replace("&amp;", "&")
@@ -109,15 +109,12 @@ def should_skip_url(
         [url], pattern_list(config.exclude_links, course_id=course_id)
     )
     if pattern is not None:
-        ctx.record_filtered(
+        return (
             "filters.exclude_links",
             "link",
             f"{context}: {redact_url_secrets(url)}",
             f"matches {redact_url_secrets(pattern)!r}",
         )
-        if inventory:
-            ctx.mark_course_inventory_filtered(course_id)
-        return True
 
     allowed_domains = pattern_list(config.allowed_domains, course_id=course_id)
     if allowed_domains:
@@ -126,17 +123,31 @@ def should_skip_url(
             if not any(
                 domain_matches(parsed_url.netloc, domain) for domain in allowed_domains
             ):
-                ctx.record_filtered(
+                return (
                     "filters.allowed_domains",
                     "link",
                     f"{context}: {redact_url_secrets(url)}",
                     f"host {parsed_url.hostname or parsed_url.netloc!r} is not allowed",
                 )
-                if inventory:
-                    ctx.mark_course_inventory_filtered(course_id)
-                return True
 
-    return False
+    return None
+
+
+def should_skip_url(
+    ctx: SyncContext,
+    url: str | None,
+    context: str = "link",
+    *,
+    course_id: Any = None,
+    inventory: bool = True,
+) -> bool:
+    filtered = url_filter_match(ctx, url, context, course_id=course_id)
+    if filtered is None:
+        return False
+    ctx.record_filtered(*filtered)
+    if inventory:
+        ctx.mark_course_inventory_filtered(course_id)
+    return True
 
 
 def require_url_allowed(
@@ -1,10 +1,17 @@
 """Small helpers for interpreting HTTP responses and fetched pages."""
 
+import email.utils
 import hashlib
 import logging
+import math
+import random
 import re
+import threading
+import time
 import urllib.parse
-from collections.abc import Callable, Mapping
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
 from io import BytesIO
@@ -12,8 +19,26 @@ from typing import Any, Protocol, cast
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from syncmymoodle.constants import (
+    DEFAULT_BLOCK_SIZE,
+    HTTP_LATENCY_MIN_SAMPLES,
+    HTTP_LATENCY_WINDOW,
+    HTTP_MAX_TIMEOUT_STRETCH,
+    HTTP_POOL_ORIGINS,
+    HTTP_POOL_SIZE,
+    HTTP_READ_TIMEOUT_FACTOR,
+    HTTP_RETRY_ATTEMPTS,
+    HTTP_RETRY_BASE_DELAY,
+    HTTP_RETRY_BUDGET,
+    HTTP_RETRY_MAX_DELAY,
+    HTTP_TIMEOUT_CEILING,
+    HTTP_TIMEOUT_FLOOR,
+    MOODLE_URL,
+)
 
-from syncmymoodle.constants import DEFAULT_BLOCK_SIZE, MOODLE_URL
+logger = logging.getLogger(__name__)
 
 # Media types that indicate an HTML page rather than a downloadable file
 # (e.g. a login or error page served in place of the expected content).
@@ -79,6 +104,9 @@ _REMOTE_IDENTITY_VOLATILE_QUERY_PARAMETER_NAMES = (
 _QUERY_PARAMETER_RE = re.compile(r"([?&])([^=&#\s'\"]+)=([^&#\s'\"]*)")
 _URL_USERINFO_RE = re.compile(r"(\bhttps?://)[^/?#\s'\"@]+@", re.IGNORECASE)
 SERVICE_OUTAGE_THRESHOLD = 3
+RETRYABLE_METHODS = frozenset({"GET", "HEAD", "PROPFIND"})
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+_RETRY_AFTER_STATUS_CODES = frozenset({429, 503})
 
 
 class RedactedRequestError(requests.RequestException):
@@ -102,25 +130,83 @@ class ServiceOutageTracker:
 
     _failure_counts: dict[str, int] = field(default_factory=dict)
     _unavailable_services: set[str] = field(default_factory=set)
+    # Concurrent download workers share one tracker per sync run.
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
 
     def should_skip(self, service: str) -> bool:
         return service in self._unavailable_services
 
     def record_available(self, service: str) -> None:
         """Clear outage evidence after a definitive non-transient result."""
-        if not self.should_skip(service):
-            self._failure_counts.pop(service, None)
+        with self._lock:
+            if not self.should_skip(service):
+                self._failure_counts.pop(service, None)
 
     def record_failure(self, service: str) -> bool:
         """Record a failure and return whether it newly opened the circuit."""
-        if self.should_skip(service):
-            return False
-        count = self._failure_counts.get(service, 0) + 1
-        self._failure_counts[service] = count
-        if count < SERVICE_OUTAGE_THRESHOLD:
-            return False
-        self._unavailable_services.add(service)
-        return True
+        with self._lock:
+            if self.should_skip(service):
+                return False
+            count = self._failure_counts.get(service, 0) + 1
+            self._failure_counts[service] = count
+            if count < SERVICE_OUTAGE_THRESHOLD:
+                return False
+            self._unavailable_services.add(service)
+            return True
+
+
+@dataclass
+class RetryBudget:
+    """Retries of idempotent requests, shared by every request of a sync run.
+
+    Each request may be retried ``attempts`` times with full-jitter
+    exponential backoff, or after the server's ``Retry-After`` on 429 and 503
+    responses. Once the run has spent ``remaining`` retries, failures go
+    straight to the caller's outage handling again.
+    """
+
+    attempts: int = HTTP_RETRY_ATTEMPTS
+    remaining: int = HTTP_RETRY_BUDGET
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    jitter: Callable[[], float] = field(default=random.random, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def delay(self, method: str, attempt: int, response: Any = None) -> float | None:
+        """Return how long to wait before retrying, or None to give up."""
+        if method not in RETRYABLE_METHODS or attempt >= self.attempts:
+            return None
+        delay = min(HTTP_RETRY_MAX_DELAY, HTTP_RETRY_BASE_DELAY * (1 << attempt))
+        delay *= self.jitter()
+        if response is not None and response.status_code in _RETRY_AFTER_STATUS_CODES:
+            retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > HTTP_RETRY_MAX_DELAY:
+                    return None
+                delay = retry_after
+        with self._lock:
+            if self.remaining <= 0:
+                return None
+            self.remaining -= 1
+        return delay
+
+
+def _retry_after_seconds(value: Any) -> float | None:
+    if not value:
+        return None
+    text = str(value).strip()
+    if text.isdecimal():
+        return float(text)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
 
 
 def record_service_failure(
@@ -324,14 +410,237 @@ def normalized_http_origin(url: Any) -> str | None:
     return f"{scheme}://{hostname}{port_suffix}"
 
 
+@dataclass
+class LatencyTracker:
+    """Response times observed per origin, and the timeouts derived from them.
+
+    Each origin keeps its last ``HTTP_LATENCY_WINDOW`` times until response
+    headers arrived. Once enough are known, the read timeout is placed above
+    their 95th percentile, within ``floor`` and ``ceiling``, so a hanging
+    server is abandoned after a few of its usual response times. Each read
+    timeout doubles the origin's next read timeouts until a response arrives
+    again, so a retry gives a slow but healthy server more time.
+
+    A sample spans connecting, sending and waiting for the headers, and a
+    pooled connection does not connect at all, so it says nothing reliable
+    about connect times. The connect timeout therefore stays at the requested
+    one, within the same bounds.
+    """
+
+    floor: float = HTTP_TIMEOUT_FLOOR
+    ceiling: float = HTTP_TIMEOUT_CEILING
+    _samples: dict[str, deque[float]] = field(default_factory=dict, repr=False)
+    _stretch: dict[str, int] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def timeout(
+        self,
+        url: str,
+        requested: float,
+        *,
+        shorten: bool = True,
+    ) -> tuple[float, float]:
+        """Return the ``(connect, read)`` timeout for a request to ``url``.
+
+        ``requested`` applies until the origin has enough samples. Without
+        ``shorten``, adapted timeouts may only grow beyond ``requested``, for
+        requests that cannot safely be retried after giving up early.
+        """
+        origin = normalized_http_origin(url)
+        with self._lock:
+            samples = sorted(self._samples.get(origin or "", ()))
+            stretch = self._stretch.get(origin or "", 1)
+        if len(samples) < HTTP_LATENCY_MIN_SAMPLES:
+            read = float(requested)
+        else:
+            read = HTTP_READ_TIMEOUT_FACTOR * _percentile(samples, 0.95)
+        read *= stretch
+        if not shorten:
+            read = max(read, requested)
+        return self._bounded(float(requested)), self._bounded(read)
+
+    def record(self, url: str, seconds: float) -> None:
+        origin = normalized_http_origin(url)
+        if origin is None:
+            return
+        with self._lock:
+            samples = self._samples.get(origin)
+            if samples is None:
+                samples = self._samples[origin] = deque(maxlen=HTTP_LATENCY_WINDOW)
+            samples.append(seconds)
+            self._stretch.pop(origin, None)
+
+    def record_read_timeout(self, url: str) -> None:
+        origin = normalized_http_origin(url)
+        if origin is None:
+            return
+        with self._lock:
+            stretch = self._stretch.get(origin, 1)
+            self._stretch[origin] = min(stretch * 2, HTTP_MAX_TIMEOUT_STRETCH)
+
+    def _bounded(self, seconds: float) -> float:
+        return min(self.ceiling, max(self.floor, seconds))
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class OriginLimiter:
+    """Cap concurrent requests per normalized HTTP origin.
+
+    A request holds an :class:`OriginSlot` from its first hop until its
+    response is closed. The slot follows redirects to the origin that actually
+    serves the response, releasing the previous origin before waiting for the
+    next, so a waiting request never blocks another origin.
+    """
+
+    limit: int
+    _semaphores: dict[str, threading.Semaphore] = field(
+        default_factory=dict, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @contextmanager
+    def slot(self) -> Iterator["OriginSlot"]:
+        slot = OriginSlot(self)
+        try:
+            yield slot
+        finally:
+            slot.release()
+
+    def _semaphore(self, origin: str) -> threading.Semaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(origin)
+            if semaphore is None:
+                semaphore = self._semaphores[origin] = threading.Semaphore(self.limit)
+            return semaphore
+
+
+class OriginSlot:
+    """One request's claim on its current origin within an :class:`OriginLimiter`."""
+
+    def __init__(self, limiter: OriginLimiter) -> None:
+        self._limiter = limiter
+        self.origin: str | None = None
+        self._held: threading.Semaphore | None = None
+
+    def move_to(self, url: str) -> None:
+        """Hold a slot for the origin of ``url``, waiting while it is full."""
+        origin = normalized_http_origin(url)
+        if origin == self.origin:
+            return
+        self.release()
+        if origin is None:
+            return
+        semaphore = self._limiter._semaphore(origin)
+        semaphore.acquire()
+        self.origin, self._held = origin, semaphore
+
+    def release(self) -> None:
+        if self._held is not None:
+            self._held.release()
+        self.origin, self._held = None, None
+
+
+class LatencyAdapter(HTTPAdapter):
+    """Pooling adapter that times responses and adapts request timeouts.
+
+    A numeric ``timeout`` given by the caller is replaced with the tracker's
+    per-origin ``(connect, read)`` timeouts. Only idempotent requests may get
+    shorter timeouts than requested. Streamed requests keep at least the
+    requested read timeout, since it also bounds every pause while their body
+    is read, long after the timed response headers arrived.
+    """
+
+    def __init__(self, latency: LatencyTracker | None = None, **kwargs: Any) -> None:
+        self.latency = LatencyTracker() if latency is None else latency
+        super().__init__(**kwargs)
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Any = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        url = request.url or ""
+        if isinstance(timeout, (int, float)) and not isinstance(timeout, bool):
+            connect, read = self.latency.timeout(
+                url,
+                timeout,
+                shorten=(request.method or "").upper() in RETRYABLE_METHODS,
+            )
+            timeout = (connect, max(read, timeout) if stream else read)
+        started = time.monotonic()
+        try:
+            response = super().send(
+                request,
+                stream=stream,
+                timeout=timeout,
+                verify=verify,
+                cert=cert,
+                proxies=proxies,
+            )
+        except requests.ReadTimeout:
+            self.latency.record_read_timeout(url)
+            raise
+        self.latency.record(url, time.monotonic() - started)
+        return response
+
+
+def create_session(
+    pool_size: int = HTTP_POOL_SIZE,
+    adapters: Mapping[str, HTTPAdapter] | None = None,
+    latency: LatencyTracker | None = None,
+) -> requests.Session:
+    """Create a session whose connection pools suit concurrent workers.
+
+    Every origin gets its own keep-alive pool of up to ``pool_size``
+    connections, and pools of up to ``HTTP_POOL_ORIGINS`` origins are kept, so
+    Moodle, Sciebo and Opencast connections are not evicted by the many hosts
+    probed during link discovery and workers reuse established TLS
+    connections. Request timeouts adapt to each origin's response times as
+    recorded in ``latency``. ``adapters`` mounts backend-specific adapters by
+    URL prefix.
+    """
+    session = requests.Session()
+    latency = LatencyTracker() if latency is None else latency
+    for prefix in ("https://", "http://"):
+        session.mount(
+            prefix,
+            LatencyAdapter(
+                latency,
+                pool_connections=HTTP_POOL_ORIGINS,
+                pool_maxsize=pool_size,
+            ),
+        )
+    for prefix, adapter in (adapters or {}).items():
+        session.mount(prefix, adapter)
+    return session
+
+
 def request_following_safe_redirects(
     session: Any,
     method: str,
     url: str,
     url_allowed: Callable[[str], bool],
+    *,
+    retry: RetryBudget | None = None,
     **kwargs: Any,
 ) -> Any:
-    """Make a request while validating each redirect before following it."""
+    """Make a request while validating each redirect before following it.
+
+    With ``retry``, each hop of an idempotent request is retried after
+    connection errors, timeouts and transient status codes.
+    """
     current_url = url
     current_method = method.upper()
     request_kwargs = dict(kwargs)
@@ -342,15 +651,9 @@ def request_following_safe_redirects(
             raise RequestPolicyError(
                 f"refusing request to disallowed URL {redact_url_secrets(current_url)}"
             )
-        try:
-            response = session.request(
-                current_method,
-                current_url,
-                allow_redirects=False,
-                **request_kwargs,
-            )
-        except requests.RequestException as error:
-            raise RedactedRequestError(safe_request_error(error)) from None
+        response = _send_with_retries(
+            session, current_method, current_url, request_kwargs, retry
+        )
 
         location = response.headers.get("Location")
         if response.status_code not in _REDIRECT_STATUS_CODES or not location:
@@ -394,6 +697,49 @@ def request_following_safe_redirects(
     raise RequestPolicyError("request exceeded 10 redirects")
 
 
+def _send_with_retries(
+    session: Any,
+    method: str,
+    url: str,
+    request_kwargs: dict[str, Any],
+    retry: RetryBudget | None,
+) -> Any:
+    attempt = 0
+    while True:
+        try:
+            response = session.request(
+                method, url, allow_redirects=False, **request_kwargs
+            )
+        except requests.RequestException as error:
+            # SSLError is a ConnectionError, but a failed certificate check or
+            # handshake fails the same way on every attempt.
+            retryable = isinstance(
+                error, (requests.ConnectionError, requests.Timeout)
+            ) and not isinstance(error, requests.exceptions.SSLError)
+            delay = retry.delay(method, attempt) if retry and retryable else None
+            if delay is None:
+                raise RedactedRequestError(safe_request_error(error)) from None
+            reason = safe_request_error(error)
+        else:
+            if retry is None or response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            delay = retry.delay(method, attempt, response)
+            if delay is None:
+                return response
+            response.close()
+            reason = f"HTTP {response.status_code}"
+        assert retry is not None
+        logger.debug(
+            "Retrying %s %s in %.1f s after %s",
+            method,
+            redact_url_secrets(url),
+            delay,
+            reason,
+        )
+        retry.sleep(delay)
+        attempt += 1
+
+
 def _response_body_bytes(response: Any) -> bytes:
     content = getattr(response, "content", None)
     if content is not None:
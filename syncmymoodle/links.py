@@ -2,31 +2,41 @@ import logging
 import math
 import time
 import urllib.parse
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from pathlib import Path
 from typing import Any, cast
 
 import requests
 from yt_dlp.extractor.youtube import YoutubeIE  # type: ignore[import-untyped]
 
 from syncmymoodle import emedia as emedia_api
-from syncmymoodle import filters, moodle_files
+from syncmymoodle import filters, moodle_files, pathing, storage
 from syncmymoodle import opencast as opencast_api
 from syncmymoodle import sciebo as sciebo_api
 from syncmymoodle.constants import (
+    COURSE_CACHE_DIRECTORY,
     EMEDIA_LINK_RE,
     HTTP_TIMEOUT_SECONDS,
     LINKED_PAGE_MAX_BYTES,
+    LINKED_RESOURCE_INDEX_FILENAME,
+    LINKED_RESOURCE_INDEX_MAX_AGE,
     OPENCAST_LINK_RE,
     SCIEBO_LINK_RE,
     YOUTUBE_LINK_RE,
     YOUTUBE_WATCH_URL,
 )
-from syncmymoodle.context import LinkedResourceCacheEntry, SyncContext
+from syncmymoodle.context import (
+    IndexedLinkedResource,
+    LinkedResourceCacheEntry,
+    SyncContext,
+)
 from syncmymoodle.http_utils import (
     HTML_CONTENT_TYPES,
     HttpFailureKind,
+    canonical_remote_url,
     classify_http_failure,
     classify_request_failure,
     content_length,
@@ -37,13 +47,16 @@ from syncmymoodle.http_utils import (
     read_capped_body,
     record_service_failure,
     redact_url_secrets,
+    remote_request_scope_fingerprint,
     request_following_safe_redirects,
     safe_request_error,
 )
+from syncmymoodle.moodle_tokens import normalized_site
 from syncmymoodle.node import DownloadKind, Node, RemoteMarkerKind
 
 logger = logging.getLogger(__name__)
 LINKED_RESOURCES_CACHE_FORMAT = "syncmymoodle.linked-resources.v1"
+LINKED_RESOURCE_INDEX_FORMAT = "syncmymoodle.linked-resource-index.v1"
 
 
 @dataclass(frozen=True)
@@ -250,6 +263,10 @@ def cached_resources_data(
         ctx.linked_resources_by_course[course_key] = entries
     if not entries:
         return None
+    return _resources_data(entries)
+
+
+def _resources_data(entries: dict[str, LinkedResourceCacheEntry]) -> dict[str, Any]:
     return {
         "format": LINKED_RESOURCES_CACHE_FORMAT,
         "resources": {
@@ -279,6 +296,115 @@ def cached_resources_data(
     }
 
 
+def _index_key(url: str) -> str:
+    identity_url, _ = canonical_remote_url(url)
+    return f"{identity_url} {remote_request_scope_fingerprint(url, None)}"
+
+
+def _index_identity(ctx: SyncContext) -> dict[str, Any]:
+    account = ctx.require_moodle_account()
+    return {"site": normalized_site(account.tokens.site), "user_id": account.user_id}
+
+
+def _linked_resource_index_path(ctx: SyncContext) -> Path:
+    return ctx.internal_path_root.path(
+        COURSE_CACHE_DIRECTORY, LINKED_RESOURCE_INDEX_FILENAME
+    )
+
+
+def load_linked_resource_index(ctx: SyncContext) -> None:
+    """Restore the account's linked-resource validators from the last runs."""
+    try:
+        index_path = _linked_resource_index_path(ctx)
+    except pathing.UnsafeInternalPathError:
+        return
+    payload = storage.read_private_gzip_json(
+        pathing.with_windows_extended_length_prefix(index_path),
+        "linked resource index",
+    )
+    if (
+        not isinstance(payload, dict)
+        or payload.get("format") != LINKED_RESOURCE_INDEX_FORMAT
+        or payload.get("identity") != _index_identity(ctx)
+        or not isinstance(payload.get("used"), dict)
+    ):
+        return
+    used = payload["used"]
+    oldest = time.time() - LINKED_RESOURCE_INDEX_MAX_AGE
+    for url, entry in _cached_resource_entries(payload.get("resources")).items():
+        used_at = used.get(url)
+        if (
+            isinstance(used_at, (int, float))
+            and not isinstance(used_at, bool)
+            and math.isfinite(used_at)
+            and used_at >= oldest
+        ):
+            ctx.linked_resource_index.setdefault(
+                _index_key(url), IndexedLinkedResource(url, entry, float(used_at))
+            )
+
+
+def save_linked_resource_index(ctx: SyncContext) -> None:
+    """Persist the validators of links used within the retention period."""
+    oldest = time.time() - LINKED_RESOURCE_INDEX_MAX_AGE
+    indexed = sorted(
+        (item for item in ctx.linked_resource_index.values() if item.used_at >= oldest),
+        key=lambda item: item.url,
+    )
+    payload = {
+        "format": LINKED_RESOURCE_INDEX_FORMAT,
+        "identity": _index_identity(ctx),
+        "used": {item.url: item.used_at for item in indexed},
+        "resources": _resources_data({item.url: item.entry for item in indexed}),
+    }
+    try:
+        index_path = ctx.internal_path_root.create_parent(
+            _linked_resource_index_path(ctx)
+        )
+        storage.write_private_json(
+            pathing.with_windows_extended_length_prefix(index_path),
+            payload,
+            ctx.cache_codec,
+        )
+    except (OSError, pathing.UnsafeInternalPathError) as error:
+        logger.warning("Could not save the linked resource index: %s", error)
+
+
+def _indexed_validators(
+    ctx: SyncContext,
+    url: str,
+    cached: LinkedResourceCacheEntry | None,
+) -> LinkedResourceCacheEntry | None:
+    """Return the account-wide entry for ``url``, or the course's own one.
+
+    An entry fetched from another URL with the same identity, such as a
+    differently signed variant, only lends its validators: its freshness and
+    final URL belong to that other URL.
+    """
+    indexed = ctx.linked_resource_index.get(_index_key(url))
+    if indexed is None:
+        return cached
+    if indexed.url == url:
+        return indexed.entry
+    return replace(indexed.entry, fresh_until=None)
+
+
+def _update_linked_resource_index(
+    ctx: SyncContext,
+    url: str,
+    resolution: LinkedResourceResolution,
+) -> None:
+    if resolution.resource is None:
+        return
+    key = _index_key(url)
+    if resolution.cacheable:
+        ctx.linked_resource_index[key] = IndexedLinkedResource(
+            url, resolution.resource, time.time()
+        )
+    else:
+        ctx.linked_resource_index.pop(key, None)
+
+
 def _head_linked_resource(
     ctx: SyncContext,
     url: str,
@@ -294,6 +420,7 @@ def _head_linked_resource(
             url,
             url_allowed,
             headers=headers,
+            retry=ctx.http_retries,
             timeout=HTTP_TIMEOUT_SECONDS,
         )
         with closing(response):
@@ -409,6 +536,7 @@ def _get_linked_resource(
             url_allowed,
             headers=headers,
             stream=True,
+            retry=ctx.http_retries,
             timeout=HTTP_TIMEOUT_SECONDS,
         )
         with closing(response):
@@ -623,6 +751,23 @@ def _retain_cached_resource_when_unavailable(
     return resolution
 
 
+def _course_link_resolution(
+    ctx: SyncContext,
+    url: str,
+    cached: LinkedResourceCacheEntry | None,
+    course_id: Any,
+    log: logging.Logger,
+) -> LinkedResourceResolution:
+    prefetched = ctx.prefetched_linked_resources.get(str(course_id), {})
+    resolution = prefetched.pop(url, None)
+    if resolution is None:
+        resolution = _resolve_linked_resource(
+            ctx, url, _indexed_validators(ctx, url, cached), course_id, log
+        )
+    _update_linked_resource_index(ctx, url, resolution)
+    return _retain_cached_resource_when_unavailable(resolution, cached)
+
+
 def _linked_resource_for_course(
     ctx: SyncContext,
     url: str,
@@ -653,16 +798,7 @@ def _linked_resource_for_course(
         if resource is not None:
             cache[url] = resource
     else:
-        resolution = _retain_cached_resource_when_unavailable(
-            _resolve_linked_resource(
-                ctx,
-                url,
-                cached_resource,
-                course_id,
-                log,
-            ),
-            cached_resource,
-        )
+        resolution = _course_link_resolution(ctx, url, cached_resource, course_id, log)
         resource = resolution.resource
         if resolution.cacheable:
             if resource is not None:
@@ -679,6 +815,84 @@ def _linked_resource_for_course(
     return resource
 
 
+def prefetch_linked_resources(
+    ctx: SyncContext,
+    urls: Iterable[str],
+    course_id: Any,
+    log: logging.Logger = logger,
+) -> None:
+    """Check a course's generic links concurrently before its modules are walked.
+
+    Up to ``links.workers`` links are resolved at once, with the same redirect
+    filtering as during the walk. The walk then takes each result instead of
+    sending its own requests, so nodes are still added in inventory order.
+    ``urls`` have already passed the URL filters. Provider links, filtered
+    links and links already resolved this run are left to the walk.
+    """
+    workers = ctx.config.link_workers
+    if workers < 2:
+        return
+    course_key = str(course_id)
+    cache = ctx.linked_resources_by_course.get(course_key, {})
+    pending: dict[str, LinkedResourceCacheEntry | None] = {}
+    for link in urls:
+        url = moodle_files.canonicalize_moodle_file_url(link)
+        if (
+            url in pending
+            or url in ctx.linked_resource_results
+            or _known_provider_link(url)
+            or _canonical_link_filtered(ctx, link, url, course_id)
+        ):
+            continue
+        cached = cache.get(url)
+        if cached is not None and filters.should_skip_url(
+            ctx,
+            cached.final_url,
+            "cached linked resource",
+            course_id=course_id,
+        ):
+            continue
+        pending[url] = _indexed_validators(ctx, url, cached)
+    if len(pending) < 2:
+        return
+
+    def resolve(url: str) -> LinkedResourceResolution | None:
+        try:
+            return _resolve_linked_resource(ctx, url, pending[url], course_id, log)
+        except Exception:
+            # The walk resolves this link again and reports the failure
+            # against its module.
+            log.debug(
+                "Could not check linked resource %s ahead of the course walk",
+                redact_url_secrets(url),
+                exc_info=True,
+            )
+            return None
+
+    prefetched = ctx.prefetched_linked_resources.setdefault(course_key, {})
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(pending)),
+        thread_name_prefix="syncmymoodle-link",
+    ) as executor:
+        for url, resolution in zip(
+            pending, executor.map(resolve, pending), strict=True
+        ):
+            if resolution is not None:
+                prefetched[url] = resolution
+
+
+def _canonical_link_filtered(
+    ctx: SyncContext,
+    link: str,
+    url: str,
+    course_id: Any,
+) -> bool:
+    """Whether the canonical ``url`` of an already filtered ``link`` is excluded."""
+    return url != link and filters.should_skip_url(
+        ctx, url, "link", course_id=course_id
+    )
+
+
 def _scan_single_link(
     ctx: SyncContext,
     url: str,
@@ -688,8 +902,6 @@ def _scan_single_link(
     log: logging.Logger,
 ) -> bool:
     """Resolve one generic link and return whether it is a direct file."""
-    if filters.should_skip_url(ctx, url, "link", course_id=course_id):
-        return False
     resource = _linked_resource_for_course(ctx, url, course_id, log)
     if resource is None:
         return False
@@ -894,14 +1106,21 @@ def scan_for_links(
     log: logging.Logger = logger,
 ) -> None:
     if single:
-        text = moodle_files.canonicalize_moodle_file_url(text)
-        if not _known_provider_link(text) and _scan_single_link(
-            ctx,
-            text,
-            parent_node,
-            course_id,
-            module_title,
-            log,
+        # Single links come from resource contents that already passed the URL
+        # filters, so only a changed canonical form is checked again.
+        link = text
+        text = moodle_files.canonicalize_moodle_file_url(link)
+        if (
+            not _known_provider_link(text)
+            and not _canonical_link_filtered(ctx, link, text, course_id)
+            and _scan_single_link(
+                ctx,
+                text,
+                parent_node,
+                course_id,
+                module_title,
+                log,
+            )
         ):
             return
     if not ctx.config.follow_links:
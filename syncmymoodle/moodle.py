@@ -14,10 +14,12 @@ from typing import Any, cast
 import requests
 from requests.auth import AuthBase
 
-from syncmymoodle.constants import HTTP_TIMEOUT_SECONDS, MOODLE_URL
+from syncmymoodle.constants import HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS, MOODLE_URL
 from syncmymoodle.http_utils import (
     HttpFailureKind,
+    LatencyTracker,
     classify_http_failure,
+    create_session,
     moodle_url_allowed,
     moodle_user_id_from_html,
     parse_html,
@@ -36,6 +38,10 @@ MOBILE_URL_SCHEME = "syncmymoodle"
 MOBILE_SERVICE = "moodle_mobile_app"
 MOODLE_MOBILE_USER_AGENT = "MoodleMobile syncMyMoodle"
 MOODLE_UPDATE_FUNCTION = "core_course_check_updates"
+MOODLE_BATCH_FUNCTION = "tool_mobile_call_external_functions"
+# Course inventories can be large; bounded batches keep one slow or oversized
+# response from holding up every course.
+COURSE_BATCH_SIZE = 20
 
 
 class MobileLaunchError(RuntimeError):
@@ -106,8 +112,10 @@ class MoodleTokenAuth(AuthBase):
 def create_token_session(
     tokens: MoodleTokens,
     user_private_access_key: str | None = None,
+    latency: LatencyTracker | None = None,
+    pool_size: int = HTTP_POOL_SIZE,
 ) -> requests.Session:
-    session = requests.Session()
+    session = create_session(pool_size=pool_size, latency=latency)
     session.auth = MoodleTokenAuth(tokens.wstoken, user_private_access_key)
     return session
 
@@ -360,7 +368,7 @@ def inspect_mobile_token(
     session: requests.Session | None = None,
 ) -> TokenValidation:
     """Validate a mobile token and return its Moodle account metadata."""
-    session = requests.Session() if session is None else session
+    session = create_session() if session is None else session
     try:
         response = _request_moodle(
             session,
@@ -475,10 +483,12 @@ def _open_moodle_autologin(
     autologin_url: str,
     user_id: int,
     key: str,
+    latency: LatencyTracker | None = None,
+    pool_size: int = HTTP_POOL_SIZE,
 ) -> tuple[requests.Session, str]:
     if not moodle_url_allowed(autologin_url):
         raise BrowserBootstrapError("Moodle returned an unsafe auto-login URL")
-    browser_session = requests.Session()
+    browser_session = create_session(pool_size=pool_size, latency=latency)
     try:
         response = _request_moodle(
             browser_session,
@@ -502,6 +512,8 @@ def _open_moodle_autologin(
 
 def create_browser_session(
     tokens: MoodleTokens,
+    latency: LatencyTracker | None = None,
+    pool_size: int = HTTP_POOL_SIZE,
 ) -> tuple[requests.Session, str]:
     if tokens.private_token is None:
         raise BrowserBootstrapError(
@@ -513,7 +525,7 @@ def create_browser_session(
         raise BrowserBootstrapError(
             "stored Moodle tokens have no verified Moodle account identity"
         )
-    mobile_session = requests.Session()
+    mobile_session = create_session()
     mobile_session.headers["User-Agent"] = MOODLE_MOBILE_USER_AGENT
     try:
         response = _request_moodle(
@@ -552,7 +564,7 @@ def create_browser_session(
     autologin_url = payload.get("autologinurl")
     if not isinstance(key, str) or not key or not isinstance(autologin_url, str):
         raise BrowserBootstrapError("Moodle returned an incomplete auto-login response")
-    return _open_moodle_autologin(autologin_url, user_id, key)
+    return _open_moodle_autologin(autologin_url, user_id, key, latency, pool_size)
 
 
 def api_error_message(payload: Any) -> str | None:
@@ -706,6 +718,77 @@ def _get_course_module_instances(
     return _dict_list_field(payload, response_key)
 
 
+def _course_id_batches(course_ids: list[int]) -> list[list[int]]:
+    return [
+        course_ids[start : start + COURSE_BATCH_SIZE]
+        for start in range(0, len(course_ids), COURSE_BATCH_SIZE)
+    ]
+
+
+def _course_ids_data(course_ids: list[int]) -> dict[str, str]:
+    return {
+        f"courseids[{index}]": str(course_id)
+        for index, course_id in enumerate(course_ids)
+    }
+
+
+def _warned_course_ids(payload: dict[str, Any]) -> set[int] | None:
+    warnings = payload.get("warnings") or []
+    if not isinstance(warnings, list):
+        return None
+    warned: set[int] = set()
+    for warning in warnings:
+        if not isinstance(warning, dict):
+            return None
+        if warning.get("item") == "course" and (
+            course_id := _positive_id(warning.get("itemid"))
+        ):
+            warned.add(course_id)
+    return warned
+
+
+def get_module_instances_by_courses(
+    session: requests.Session,
+    wstoken: str,
+    function: str,
+    response_key: str,
+    course_ids: list[int],
+    log: logging.Logger = logger,
+) -> dict[int, list[dict[str, Any]]]:
+    """Return module instances grouped by course from bulk ``*_by_courses`` calls.
+
+    Courses Moodle warned about, and every course of a batch whose response was
+    unusable, are omitted. Callers query those with the per-course helpers so
+    failures stay attributed to the affected course.
+    """
+    instances: dict[int, list[dict[str, Any]]] = {}
+    for chunk in _course_id_batches(course_ids):
+        payload = call_webservice(
+            session,
+            wstoken,
+            function,
+            _course_ids_data(chunk),
+            log,
+            warn_on_failure=False,
+        )
+        items = _dict_list_field(payload, response_key)
+        warned = _warned_course_ids(payload) if isinstance(payload, dict) else None
+        if items is None or warned is None:
+            continue
+        grouped: dict[int, list[dict[str, Any]]] = {
+            course_id: [] for course_id in chunk if course_id not in warned
+        }
+        for item in items:
+            course_id = _positive_id(item.get("course"))
+            if course_id is None:
+                break
+            if course_id in grouped:
+                grouped[course_id].append(item)
+        else:
+            instances.update(grouped)
+    return instances
+
+
 def _dict_list_field(payload: Any, key: str) -> list[dict[str, Any]] | None:
     if not isinstance(payload, dict):
         return None
@@ -816,7 +899,7 @@ def get_all_courses(
     payload = call_webservice(
         session,
         wstoken,
-        "tool_mobile_call_external_functions",
+        MOODLE_BATCH_FUNCTION,
         _mobile_request_data(
             [
                 (
@@ -900,7 +983,7 @@ def get_direct_course_roles_by_course(
     payload = call_webservice(
         session,
         wstoken,
-        "tool_mobile_call_external_functions",
+        MOODLE_BATCH_FUNCTION,
         _mobile_request_data(
             [
                 (
@@ -975,6 +1058,46 @@ def get_course(
     return payload
 
 
+def get_courses_contents(
+    session: requests.Session,
+    wstoken: str,
+    course_ids: list[int],
+    log: logging.Logger = logger,
+) -> dict[int, list[Any]]:
+    """Return course inventories fetched in batched mobile API calls.
+
+    Only courses whose inventory arrived intact are included. Callers fetch
+    missing courses with :func:`get_course`, so a failing course or batch is
+    reported per course exactly as without batching.
+    """
+    contents: dict[int, list[Any]] = {}
+    for chunk in _course_id_batches(course_ids):
+        payload = call_webservice(
+            session,
+            wstoken,
+            MOODLE_BATCH_FUNCTION,
+            _mobile_request_data(
+                [
+                    ("core_course_get_contents", {"courseid": str(course_id)})
+                    for course_id in chunk
+                ],
+                filter_content=True,
+                rewrite_file_urls=True,
+            ),
+            log,
+            warn_on_failure=False,
+        )
+        responses = payload.get("responses") if isinstance(payload, dict) else None
+        if not isinstance(responses, list):
+            log.debug("Batched course inventory request failed; querying per course")
+            continue
+        for course_id, response in zip(chunk, responses, strict=False):
+            sections, error = _mobile_response_data(response)
+            if error is None and isinstance(sections, list):
+                contents[course_id] = sections
+    return contents
+
+
 def get_assignment(
     session: requests.Session,
     wstoken: str,
@@ -999,6 +1122,39 @@ def get_assignment(
     return courses[0] if courses else None
 
 
+def get_assignments_by_courses(
+    session: requests.Session,
+    wstoken: str,
+    course_ids: list[int],
+    log: logging.Logger = logger,
+) -> dict[int, dict[str, Any]]:
+    """Return assignment inventories for the courses in bulk requests.
+
+    Like :func:`get_module_instances_by_courses`, courses missing from the
+    result should be queried with :func:`get_assignment`.
+    """
+    assignments: dict[int, dict[str, Any]] = {}
+    for chunk in _course_id_batches(course_ids):
+        payload = call_webservice(
+            session,
+            wstoken,
+            "mod_assign_get_assignments",
+            {
+                **_course_ids_data(chunk),
+                "includenotenrolledcourses": 1,
+                "moodlewssettingfilter": True,
+                "moodlewssettingfileurl": True,
+            },
+            log,
+            warn_on_failure=False,
+        )
+        for course in _dict_list_field(payload, "courses") or []:
+            course_id = _positive_id(course.get("id"))
+            if course_id is not None and course_id in chunk:
+                assignments[course_id] = course
+    return assignments
+
+
 def get_assignment_submission_files(
     session: requests.Session,
     wstoken: str,
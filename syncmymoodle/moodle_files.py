@@ -44,14 +44,14 @@ def get_or_add_child(
     id: Any,  # noqa: A002 - keep Moodle payload name
     type: str,  # noqa: A002 - keep Moodle payload name
 ) -> Node:
-    filesystem_name = sanitize_path_part(name).casefold()
-    for child in parent_node.children:
-        if (
-            child.type == type
-            and sanitize_path_part(child.name).casefold() == filesystem_name
-        ):
-            return child
-    return parent_node.add_child(name, id, type)
+    children = parent_node.indexed_children(
+        _typed_filesystem_name_key, (type, sanitize_path_part(name).casefold())
+    )
+    return children[0] if children else parent_node.add_child(name, id, type)
+
+
+def _typed_filesystem_name_key(node: Node) -> tuple[str, str]:
+    return node.type, sanitize_path_part(node.name).casefold()
 
 
 def add_moodle_file_node(
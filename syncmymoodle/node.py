@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import sys
+from collections.abc import Callable, Hashable, Mapping
 from enum import StrEnum
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 NAME_CLASH_ID_UNSET = object()
+_NO_ARTIFACT_HASHES: Mapping[str, str] = MappingProxyType({})
 
 
 class RemoteMarkerKind(StrEnum):
@@ -73,9 +78,9 @@ def _optional_int(value: Any) -> int | None:
     return parsed if parsed >= 0 else None
 
 
-def _artifact_hashes(value: Any) -> dict[str, str]:
-    if not isinstance(value, dict):
-        return {}
+def _artifact_hashes(value: Any) -> dict[str, str] | None:
+    if not isinstance(value, dict) or not value:
+        return None
     return {
         key: digest
         for key, digest in value.items()
@@ -87,7 +92,70 @@ def _artifact_hashes(value: Any) -> dict[str, str]:
     }
 
 
+class _ChildIndex:
+    """Children of one node grouped by a key, in their original order.
+
+    The index is extended as children are appended and is rebuilt when the
+    children list is replaced or shrinks, or its last indexed child moved.
+    """
+
+    __slots__ = ("children", "key", "count", "last", "groups")
+
+    def __init__(self, children: list[Node], key: Callable[[Node], Hashable]) -> None:
+        self.children = children
+        self.key = key
+        self.count = 0
+        self.last: Node | None = None
+        self.groups: dict[Hashable, list[Node]] = {}
+
+    def is_current(self, children: list[Node]) -> bool:
+        return (
+            children is self.children
+            and self.count <= len(children)
+            and (self.count == 0 or children[self.count - 1] is self.last)
+        )
+
+    def get(self, value: Hashable) -> list[Node]:
+        children = self.children
+        if self.count < len(children):
+            for child in children[self.count :]:
+                self.groups.setdefault(self.key(child), []).append(child)
+            self.count = len(children)
+            self.last = children[-1]
+        return self.groups.get(value, [])
+
+
+def _child_name(node: Node) -> str:
+    return node.name
+
+
 class Node:
+    # Account trees can hold hundreds of thousands of nodes, so nodes have no
+    # per-instance __dict__, optional containers are only allocated when
+    # used, and the few distinct type strings are interned.
+    __slots__ = (
+        "_name",
+        "id",
+        "url",
+        "type",
+        "parent",
+        "children",
+        "download_headers",
+        "timemodified",
+        "etag",
+        "etag_kind",
+        "content_hash",
+        "_artifact_hashes",
+        "remote_size",
+        "name_clash_id",
+        "download_status",
+        "download_kind",
+        "_conflicting_download_metadata",
+        "_child_indexes",
+        "sanitized_path_memo",
+        "download_path_memo",
+    )
+
     def __init__(
         self,
         name: str,
@@ -106,10 +174,10 @@ class Node:
         download_status: DownloadStatus | str | None = None,
         download_kind: DownloadKind | str | None = None,
     ) -> None:
-        self.name = name
+        self._name = name
         self.id = id
         self.url = url
-        self.type = type
+        self.type = sys.intern(str(type))
         self.parent = parent
         self.children: list[Node] = []
         self.download_headers = dict(download_headers) if download_headers else None
@@ -120,7 +188,7 @@ class Node:
         # Unlike etag, which for Sciebo/WebDAV is an opaque revision token, this
         # is a real hash of our copy, used to detect local user modifications.
         self.content_hash = content_hash
-        self.artifact_hashes = _artifact_hashes(artifact_hashes)
+        self._artifact_hashes = _artifact_hashes(artifact_hashes)
         self.remote_size = _optional_int(remote_size)
         self.name_clash_id = (
             id if name_clash_id is NAME_CLASH_ID_UNSET else name_clash_id
@@ -129,7 +197,15 @@ class Node:
             _download_status(download_status) or DownloadStatus.PENDING
         )
         self.download_kind = _download_kind(download_kind)
-        self._conflicting_download_metadata: set[str] = set()
+        # Immutable, so nodes without conflicts share the empty frozenset.
+        self._conflicting_download_metadata: frozenset[str] = frozenset()
+        self._child_indexes: dict[Callable[[Node], Hashable], _ChildIndex] | None = None
+        # (name, parent parts, parts) kept by pathing.sanitized_node_path_parts.
+        self.sanitized_path_memo: (
+            tuple[str, tuple[str, ...] | None, tuple[str, ...]] | None
+        ) = None
+        # (parts, sync directory, path) kept by pathing.get_sanitized_node_path.
+        self.download_path_memo: tuple[tuple[str, ...], Path, Path] | None = None
 
     def __repr__(self) -> str:
         return (
@@ -137,6 +213,55 @@ class Node:
             f"download_kind={self.download_kind})"
         )
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value
+        # Child indexes are usually keyed by name, so drop the parent's.
+        if self.parent is not None:
+            self.parent._child_indexes = None
+
+    def indexed_children(
+        self,
+        key: Callable[[Node], Hashable],
+        value: Hashable,
+    ) -> list[Node]:
+        """Return the children whose ``key`` equals ``value``, in order.
+
+        The index for ``key`` is built on first use and kept up to date as
+        children are appended, so repeated lookups while a large folder or
+        series is populated stay linear overall. ``key`` should be a
+        module-level function so one index is shared by every lookup.
+        """
+        indexes = self._child_indexes
+        if indexes is None:
+            indexes = self._child_indexes = {}
+        index = indexes.get(key)
+        if index is None or not index.is_current(self.children):
+            index = indexes[key] = _ChildIndex(self.children, key)
+        return index.get(value)
+
+    @property
+    def artifact_hashes(self) -> dict[str, str]:
+        """Digests of the installed artifacts of a multi-file download."""
+        if self._artifact_hashes is None:
+            self._artifact_hashes = {}
+        return self._artifact_hashes
+
+    @artifact_hashes.setter
+    def artifact_hashes(self, value: dict[str, str]) -> None:
+        self._artifact_hashes = value
+
+    @property
+    def stored_artifact_hashes(self) -> Mapping[str, str]:
+        """Read-only artifact digests that do not allocate an empty mapping."""
+        if self._artifact_hashes is None:
+            return _NO_ARTIFACT_HASHES
+        return self._artifact_hashes
+
     @property
     def is_handled(self) -> bool:
         return self.download_status != DownloadStatus.PENDING
@@ -186,6 +311,9 @@ class Node:
         self.children.append(temp)
         return temp
 
+    def _mark_conflicting(self, attr: str) -> None:
+        self._conflicting_download_metadata |= {attr}
+
     @staticmethod
     def _reconcile_download_metadata(existing: Node, candidate: Node) -> None:
         for attr in ("download_headers", "timemodified", "remote_size"):
@@ -197,7 +325,7 @@ class Node:
                 setattr(existing, attr, new)
             elif new is not None and old != new:
                 setattr(existing, attr, None)
-                existing._conflicting_download_metadata.add(attr)
+                existing._mark_conflicting(attr)
 
         if "remote_marker" in existing._conflicting_download_metadata:
             return
@@ -214,7 +342,7 @@ class Node:
         ):
             existing.etag = None
             existing.etag_kind = None
-            existing._conflicting_download_metadata.add("remote_marker")
+            existing._mark_conflicting("remote_marker")
         elif candidate.etag is not None and existing.etag_kind is None:
             existing.etag_kind = candidate.etag_kind
 
@@ -257,8 +385,8 @@ class Node:
         existing = next(
             (
                 child
-                for child in self.children
-                if child.url == url and child.name == candidate.name
+                for child in self.indexed_children(_child_name, name)
+                if child.url == url
             ),
             None,
         )
@@ -296,14 +424,14 @@ class Node:
             etag=self.etag,
             etag_kind=self.etag_kind,
             content_hash=self.content_hash,
-            artifact_hashes=self.artifact_hashes,
+            artifact_hashes=self._artifact_hashes,
             remote_size=self.remote_size,
             name_clash_id=self.name_clash_id,
             download_status=self.download_status,
             download_kind=self.download_kind,
         )
         clone.children = [child.clone(clone) for child in self.children]
-        clone._conflicting_download_metadata = set(self._conflicting_download_metadata)
+        clone._conflicting_download_metadata = self._conflicting_download_metadata
         return clone
 
     def get_path(self) -> list[str]:
@@ -321,8 +449,8 @@ def match_equivalent_child(parent: Node | None, child: Node) -> Node | None:
         return None
     candidates = [
         candidate
-        for candidate in parent.children
-        if candidate.name == child.name and candidate.type == child.type
+        for candidate in parent.indexed_children(_child_name, child.name)
+        if candidate.type == child.type
     ]
     if not candidates:
         return None
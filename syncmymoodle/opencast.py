@@ -303,6 +303,7 @@ def fetch_lti_form_data(
             "GET",
             url,
             moodle_url_allowed,
+            retry=ctx.http_retries,
             timeout=HTTP_TIMEOUT_SECONDS,
         )
     except requests.RequestException as error:
@@ -355,7 +356,8 @@ def record_course_authorized(
 ) -> None:
     cache_key = _course_auth_key(endpoint, course_id)
     if cache_key is not None:
-        ctx.opencast_course_auth_cache.add(cache_key)
+        with ctx.shared_cache_lock:
+            ctx.opencast_course_auth_cache.add(cache_key)
 
 
 def course_is_authorized(
@@ -364,7 +366,10 @@ def course_is_authorized(
     endpoint: str = OPENCAST_URL,
 ) -> bool:
     cache_key = _course_auth_key(endpoint, course_id)
-    return cache_key is not None and cache_key in ctx.opencast_course_auth_cache
+    if cache_key is None:
+        return False
+    with ctx.shared_cache_lock:
+        return cache_key in ctx.opencast_course_auth_cache
 
 
 def authorize_course_for_episode(
@@ -377,6 +382,20 @@ def authorize_course_for_episode(
         return False
     if course_is_authorized(ctx, course_id):
         return True
+    # Concurrent workers of one course wait for a single LTI launch and then
+    # see its recorded authorization instead of launching it again.
+    with ctx.opencast_authorization_lock:
+        if course_is_authorized(ctx, course_id):
+            return True
+        return _launch_course_authorization(ctx, course_id, episode_id, log)
+
+
+def _launch_course_authorization(
+    ctx: SyncContext,
+    course_id: Any,
+    episode_id: str,
+    log: logging.Logger,
+) -> bool:
     try:
         ctx.require_browser_session()
     except BrowserSessionUnavailable as error:
@@ -415,7 +434,14 @@ def fetch_result_list(
     if ctx.service_outages.should_skip(OPENCAST_URL):
         return None
     try:
-        response = ctx.require_session().get(url, timeout=HTTP_TIMEOUT_SECONDS)
+        response = request_following_safe_redirects(
+            ctx.require_session(),
+            "GET",
+            url,
+            opencast_redirect_url_allowed,
+            retry=ctx.http_retries,
+            timeout=HTTP_TIMEOUT_SECONDS,
+        )
     except requests.RequestException as error:
         log_backend_issue(
             ctx,
@@ -609,23 +635,26 @@ def _cached_episode_entries(value: Any) -> dict[str, OpencastEpisode]:
 def restore_cached_episodes(ctx: SyncContext, course_id: Any, value: Any) -> None:
     """Restore persisted episodes into the provider's runtime cache."""
     course_key = _course_id_key(course_id)
-    for episode_id, episode in _cached_episode_entries(value).items():
-        ctx.opencast_episode_cache.setdefault((course_key, episode_id), episode)
+    entries = _cached_episode_entries(value)
+    with ctx.shared_cache_lock:
+        for episode_id, episode in entries.items():
+            ctx.opencast_episode_cache.setdefault((course_key, episode_id), episode)
 
 
 def cached_episodes_data(ctx: SyncContext, course_id: Any) -> dict[str, Any] | None:
     """Snapshot episodes discovered for one course during this run."""
     course_key = _course_id_key(course_id)
-    entries = {
-        episode_id: episode
-        for (
-            cached_course_id,
-            episode_id,
-        ), episode in ctx.opencast_episode_cache.items()
-        if cached_course_id == course_key
-        and course_key is not None
-        and (course_key, episode_id) in ctx.opencast_seen_episodes
-    }
+    with ctx.shared_cache_lock:
+        entries = {
+            episode_id: episode
+            for (
+                cached_course_id,
+                episode_id,
+            ), episode in ctx.opencast_episode_cache.items()
+            if cached_course_id == course_key
+            and course_key is not None
+            and (course_key, episode_id) in ctx.opencast_seen_episodes
+        }
     if not entries:
         return None
     return {
@@ -732,9 +761,10 @@ def _cached_episode(
     episode_id: str,
 ) -> OpencastEpisode | None:
     cache_key = _episode_cache_key(course_id, episode_id)
-    if cache_key[0] is not None:
-        ctx.opencast_seen_episodes.add((cache_key[0], episode_id))
-    return ctx.opencast_episode_cache.get(cache_key)
+    with ctx.shared_cache_lock:
+        if cache_key[0] is not None:
+            ctx.opencast_seen_episodes.add((cache_key[0], episode_id))
+        return ctx.opencast_episode_cache.get(cache_key)
 
 
 def store_episode(
@@ -748,13 +778,14 @@ def store_episode(
 ) -> None:
     """Store an episode, leaving it unvalidated when ``state`` is ``None``."""
     cache_key = _episode_cache_key(course_id, episode_id)
-    ctx.opencast_episode_cache[cache_key] = episode
-    if state is None:
-        ctx.opencast_metadata_states.pop(cache_key, None)
-    else:
-        ctx.opencast_metadata_states[cache_key] = state
-    if seen and cache_key[0] is not None:
-        ctx.opencast_seen_episodes.add((cache_key[0], episode_id))
+    with ctx.shared_cache_lock:
+        ctx.opencast_episode_cache[cache_key] = episode
+        if state is None:
+            ctx.opencast_metadata_states.pop(cache_key, None)
+        else:
+            ctx.opencast_metadata_states[cache_key] = state
+        if seen and cache_key[0] is not None:
+            ctx.opencast_seen_episodes.add((cache_key[0], episode_id))
 
 
 def invalidate_episode(
@@ -766,13 +797,14 @@ def invalidate_episode(
 ) -> None:
     """Drop cached tracks and optionally record a terminal state for this run."""
     cache_key = _episode_cache_key(course_id, episode_id)
-    ctx.opencast_episode_cache.pop(cache_key, None)
-    if state is not None:
-        ctx.opencast_metadata_states[cache_key] = state
-    else:
-        ctx.opencast_metadata_states.pop(cache_key, None)
-    if cache_key[0] is not None:
-        ctx.opencast_seen_episodes.discard((cache_key[0], episode_id))
+    with ctx.shared_cache_lock:
+        ctx.opencast_episode_cache.pop(cache_key, None)
+        if state is not None:
+            ctx.opencast_metadata_states[cache_key] = state
+        else:
+            ctx.opencast_metadata_states.pop(cache_key, None)
+        if cache_key[0] is not None:
+            ctx.opencast_seen_episodes.discard((cache_key[0], episode_id))
 
 
 def episode_metadata_is_stale(
@@ -781,11 +813,19 @@ def episode_metadata_is_stale(
     episode_id: str,
 ) -> bool:
     return (
-        ctx.opencast_metadata_states.get(_episode_cache_key(course_id, episode_id))
+        _metadata_state(ctx, _episode_cache_key(course_id, episode_id))
         is OpencastMetadataState.STALE
     )
 
 
+def _metadata_state(
+    ctx: SyncContext,
+    cache_key: tuple[str | None, str],
+) -> OpencastMetadataState | None:
+    with ctx.shared_cache_lock:
+        return ctx.opencast_metadata_states.get(cache_key)
+
+
 def tracks_from_entries(entries: list[Any]) -> tuple[OpencastTrack, ...]:
     selected: dict[
         tuple[str, str], tuple[tuple[int, int, int, str], OpencastTrack]
@@ -852,17 +892,22 @@ def _cache_episode_entries(
 ) -> bool:
     if not _entries_include_media(entries):
         cache_key = _episode_cache_key(course_id, episode_id)
-        ctx.opencast_metadata_states.pop(cache_key, None)
-        cached = ctx.opencast_episode_cache.get(cache_key)
-        if cached is not None and cached.series_id is None and series_id is not None:
-            store_episode(
-                ctx,
-                course_id,
-                episode_id,
-                OpencastEpisode(cached.tracks, series_id),
-                state=None,
-                seen=seen,
-            )
+        with ctx.shared_cache_lock:
+            ctx.opencast_metadata_states.pop(cache_key, None)
+            cached = ctx.opencast_episode_cache.get(cache_key)
+            if (
+                cached is not None
+                and cached.series_id is None
+                and series_id is not None
+            ):
+                store_episode(
+                    ctx,
+                    course_id,
+                    episode_id,
+                    OpencastEpisode(cached.tracks, series_id),
+                    state=None,
+                    seen=seen,
+                )
         return False
 
     tracks = tracks_from_entries(entries)
@@ -939,7 +984,9 @@ def _cache_series_entries(
     if not complete:
         return
     cache_key = _series_cache_key(course_id, series_id)
-    for episode_key, episode in list(ctx.opencast_episode_cache.items()):
+    with ctx.shared_cache_lock:
+        cached_episodes = list(ctx.opencast_episode_cache.items())
+    for episode_key, episode in cached_episodes:
         if (
             episode_key[0] == cache_key[0]
             and episode.series_id == series_id
@@ -961,8 +1008,9 @@ def list_series_episodes(
 ) -> tuple[tuple[str, str], ...] | None:
     """Fetch a series once per course and cache all usable episode metadata."""
     cache_key = _series_cache_key(course_id, series_id)
-    if cache_key in ctx.opencast_series_cache:
-        return ctx.opencast_series_cache[cache_key]
+    with ctx.shared_cache_lock:
+        if cache_key in ctx.opencast_series_cache:
+            return ctx.opencast_series_cache[cache_key]
 
     entries: list[tuple[str, str, Any]] = []
     seen_episode_ids: set[str] = set()
@@ -987,8 +1035,7 @@ def list_series_episodes(
             log,
         )
         if page is None:
-            ctx.opencast_series_cache[cache_key] = None
-            return None
+            return _remember_series(ctx, cache_key, None)
 
         new_entries = _new_series_entries(series_id, page, seen_episode_ids, log)
         can_prove_complete &= len(new_entries) == len(page)
@@ -1007,11 +1054,19 @@ def list_series_episodes(
         offset += OPENCAST_SERIES_PAGE_SIZE
 
     if not complete:
-        ctx.opencast_series_cache[cache_key] = None
-        return None
+        return _remember_series(ctx, cache_key, None)
     _cache_series_entries(ctx, course_id, series_id, entries, True)
     result = tuple((episode_id, title) for episode_id, title, _ in entries)
-    ctx.opencast_series_cache[cache_key] = result
+    return _remember_series(ctx, cache_key, result)
+
+
+def _remember_series(
+    ctx: SyncContext,
+    cache_key: tuple[str | None, str],
+    result: tuple[tuple[str, str], ...] | None,
+) -> tuple[tuple[str, str], ...] | None:
+    with ctx.shared_cache_lock:
+        ctx.opencast_series_cache[cache_key] = result
     return result
 
 
@@ -1023,9 +1078,10 @@ def _authorize_episode_refresh(
 ) -> bool:
     if course_id is None:
         return True
-    if not course_is_authorized(ctx, course_id):
-        ctx.output.sync_progress.module_status("authorizing Opencast course")
-    return authorize_course_for_episode(ctx, course_id, episode_id, log)
+    with ctx.opencast_authorization_lock:
+        if not course_is_authorized(ctx, course_id):
+            ctx.output.sync_progress.module_status("authorizing Opencast course")
+        return authorize_course_for_episode(ctx, course_id, episode_id, log)
 
 
 def _stale_episode(
@@ -1036,9 +1092,10 @@ def _stale_episode(
     log: logging.Logger,
 ) -> OpencastEpisode | None:
     cache_key = _episode_cache_key(course_id, episode_id)
-    if ctx.opencast_metadata_states.get(cache_key) is OpencastMetadataState.STALE:
-        return cached
-    ctx.opencast_metadata_states[cache_key] = OpencastMetadataState.STALE
+    with ctx.shared_cache_lock:
+        if ctx.opencast_metadata_states.get(cache_key) is OpencastMetadataState.STALE:
+            return cached
+        ctx.opencast_metadata_states[cache_key] = OpencastMetadataState.STALE
     if cached is not None:
         log.warning(
             "Opencast: could not refresh metadata for %s; cached metadata will "
@@ -1092,7 +1149,7 @@ def resolve_tracks_from_episode(
     """Return tracks after one authoritative refresh for their mutable scope."""
     cache_key = _episode_cache_key(course_id, episode_id)
     cached = _cached_episode(ctx, course_id, episode_id)
-    if cache_key in ctx.opencast_metadata_states:
+    if _metadata_state(ctx, cache_key) is not None:
         return cached.tracks if cached is not None else None
     if not _authorize_episode_refresh(ctx, course_id, episode_id, log):
         stale = _stale_episode(ctx, course_id, episode_id, cached, log)
@@ -1101,7 +1158,7 @@ def resolve_tracks_from_episode(
     if cached is not None and cached.series_id is not None:
         list_series_episodes(ctx, cached.series_id, log, course_id)
         cached = _cached_episode(ctx, course_id, episode_id)
-        if cache_key in ctx.opencast_metadata_states:
+        if _metadata_state(ctx, cache_key) is not None:
             return cached.tracks if cached is not None else None
 
     refreshed = _refresh_episode(ctx, course_id, episode_id, cached, log)
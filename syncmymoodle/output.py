@@ -7,6 +7,7 @@ import logging
 import os
 import re
 import sys
+import threading
 from contextlib import contextmanager
 from itertools import groupby
 from pathlib import Path
@@ -169,6 +170,12 @@ class SyncProgress:
         self._item_total = 0
         self._item_verb = "Processing"
         self._current_course_name: str | None = None
+        # Concurrent course scans only report per-course start and completion.
+        self._concurrent_courses = False
+        # Concurrent download workers each own one transfer task.
+        self._concurrent_items = False
+        self._concurrent_transfers: set[TaskID] = set()
+        self._lock = threading.RLock()
 
     def __enter__(self) -> SyncProgress:
         if self._active:
@@ -204,6 +211,9 @@ class SyncProgress:
         self._stage_task = None
         self._detail_task = None
         self._transfer_task = None
+        self._concurrent_transfers.clear()
+        self._concurrent_courses = False
+        self._concurrent_items = False
         self._current_course_name = None
         self._active = False
 
@@ -225,6 +235,11 @@ class SyncProgress:
 
     def _clear(self) -> None:
         self._discard_transfer()
+        for task_id in self._concurrent_transfers:
+            self._remove_task(task_id)
+        self._concurrent_transfers.clear()
+        self._concurrent_courses = False
+        self._concurrent_items = False
         self._remove_task(self._detail_task)
         self._remove_task(self._stage_task)
         self._detail_task = None
@@ -233,7 +248,11 @@ class SyncProgress:
             self._progress.set_activity(None)
 
     def _show_item_status(self, verb: str) -> None:
-        if self._progress is None or self._detail_task is None:
+        if (
+            self._progress is None
+            or self._detail_task is None
+            or self._concurrent_items
+        ):
             return
         self._discard_transfer()
         status_verb = safe_terminal_text(verb).split(maxsplit=1)[0]
@@ -252,13 +271,15 @@ class SyncProgress:
         activity = _action_text(verb, target, kind, dry_run=False)
         activity.no_wrap = True
         activity.overflow = "ellipsis"
-        self._progress.set_activity(activity)
-        self._show_item_status(verb)
+        with self._lock:
+            self._progress.set_activity(activity)
+            self._show_item_status(verb)
         return True
 
     def clear_action(self) -> None:
-        if self._progress is not None:
-            self._progress.set_activity(None)
+        with self._lock:
+            if self._progress is not None:
+                self._progress.set_activity(None)
 
     def _add_task(
         self,
@@ -303,8 +324,9 @@ class SyncProgress:
             "Discovering courses", total=None, kind="status"
         )
 
-    def begin_courses(self, total: int) -> None:
+    def begin_courses(self, total: int, *, concurrent: bool = False) -> None:
         self._clear()
+        self._concurrent_courses = concurrent
         self._course_total = total
         self._course_section_detail = ""
         self._module_status = ""
@@ -322,6 +344,14 @@ class SyncProgress:
         )
 
     def start_course(self, index: int, name: str) -> None:
+        if self._concurrent_courses:
+            if self._progress is None:
+                self._terminal.phase(
+                    f"[{index}/{self._course_total}] Scanning {name}..."
+                )
+            else:
+                self.show_action("Scanning", name, "Course")
+            return
         self._course_section_detail = ""
         self._module_status = ""
         self._current_course_name = name
@@ -352,7 +382,7 @@ class SyncProgress:
         modules: int,
         module_active: bool = False,
     ) -> None:
-        if self._progress is None:
+        if self._progress is None or self._concurrent_courses:
             return
         self._course_section_detail = (
             f"section {section}/{sections}" if sections else ""
@@ -380,7 +410,11 @@ class SyncProgress:
 
     def module_status(self, status: str) -> None:
         """Describe the active module's current potentially slow operation."""
-        if self._progress is None or self._detail_task is None:
+        if (
+            self._progress is None
+            or self._detail_task is None
+            or self._concurrent_courses
+        ):
             return
         self._module_status = safe_terminal_text(status)
         self._progress.update(
@@ -408,10 +442,30 @@ class SyncProgress:
             refresh=True,
         )
 
-    def begin_items(self, total: int, *, dry_run: bool = False) -> None:
+    def complete_concurrent_course(self, index: int, name: str) -> None:
+        """Count one course scanned by a concurrent worker, in completion order."""
+        self._terminal.action("Scanned", name, "Course")
+        if self._progress is None:
+            return
+        assert self._stage_task is not None
+        self._progress.update(
+            self._stage_task,
+            completed=index,
+            count=f"{index}/{self._course_total} courses",
+            refresh=True,
+        )
+
+    def begin_items(
+        self,
+        total: int,
+        *,
+        dry_run: bool = False,
+        concurrent: bool = False,
+    ) -> None:
         self._clear()
         self._item_total = total
         self._item_verb = "Planning" if dry_run else "Processing"
+        self._concurrent_items = concurrent
         if self._progress is None:
             noun = "item" if total == 1 else "items"
             self._terminal.phase(f"{self._item_verb} {total} {noun}...")
@@ -431,12 +485,46 @@ class SyncProgress:
             visible=False,
         )
 
-    def start_item(self, index: int, label: str) -> None:
+    def check_local_files(self, completed: int, total: int) -> None:
+        """Count existing download targets hashed before items are processed."""
         if self._progress is None:
-            percentage_advanced = (
-                index * 10 // self._item_total > (index - 1) * 10 // self._item_total
+            if completed == 0:
+                noun = "file" if total == 1 else "files"
+                self._terminal.phase(f"Checking {total} local {noun}...")
+            return
+        with self._lock:
+            if self._detail_task is None:
+                return
+            if completed < total:
+                self._progress.update(
+                    self._detail_task,
+                    description="Checking local files",
+                    total=total,
+                    completed=completed,
+                    kind="aggregate",
+                    count=f"{completed}/{total} files",
+                    visible=True,
+                )
+                return
+            self._progress.update(
+                self._detail_task,
+                description="",
+                total=None,
+                completed=0,
+                kind="status",
+                count="checking",
+                visible=False,
             )
-            if self._item_total <= 20 or index == 1 or percentage_advanced:
+
+    def _item_is_reported(self, index: int) -> bool:
+        percentage_advanced = (
+            index * 10 // self._item_total > (index - 1) * 10 // self._item_total
+        )
+        return self._item_total <= 20 or index == 1 or percentage_advanced
+
+    def start_item(self, index: int, label: str) -> None:
+        if self._progress is None:
+            if self._item_is_reported(index):
                 self._terminal.phase(
                     f"[{index}/{self._item_total}] {self._item_verb} {label}"
                 )
@@ -464,6 +552,15 @@ class SyncProgress:
             count=f"{index}/{self._item_total} items",
         )
 
+    def complete_concurrent_item(self, index: int, label: str) -> None:
+        """Count one item finished by a concurrent worker, in completion order."""
+        if self._progress is None:
+            if self._item_is_reported(index):
+                verb = "Planned" if self._item_verb == "Planning" else "Processed"
+                self._terminal.phase(f"[{index}/{self._item_total}] {verb} {label}")
+            return
+        self.finish_item(index)
+
     def begin_transfer(
         self,
         total: int | None,
@@ -471,6 +568,17 @@ class SyncProgress:
     ) -> TaskID | None:
         if self._progress is None:
             return None
+        if self._concurrent_items:
+            with self._lock:
+                task_id = self._add_task(
+                    "Downloading",
+                    total=total,
+                    completed=completed,
+                    kind="transfer",
+                )
+                assert task_id is not None
+                self._concurrent_transfers.add(task_id)
+            return task_id
         if self._detail_task is not None:
             self._progress.update(self._detail_task, visible=False)
         self._discard_transfer()
@@ -483,6 +591,11 @@ class SyncProgress:
         return self._transfer_task
 
     def finish_transfer(self, task_id: TaskID | None) -> None:
+        with self._lock:
+            if task_id is not None and task_id in self._concurrent_transfers:
+                self._concurrent_transfers.discard(task_id)
+                self._remove_task(task_id)
+                return
         if (
             self._progress is not None
             and task_id is not None
@@ -10,6 +10,8 @@ import stat
 import sys
 import unicodedata
 import urllib.parse
+from collections import Counter, deque
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path, PureWindowsPath
 
@@ -208,11 +210,32 @@ def sanitize_path_part(path: str) -> str:
 
 
 def sanitized_node_path_parts(node: Node) -> tuple[str, ...]:
-    return tuple(
-        sanitize_path_part(part)
-        for index, part in enumerate(node.get_path())
-        if not (index == 0 and part == "")
-    )
+    """Return the sanitized path components of ``node`` below the root.
+
+    Each node memoizes its components together with the name and parent
+    components they were built from. A lookup walks down from the root and
+    only sanitizes names of nodes that were renamed or moved since, e.g. by
+    clash resolution.
+    """
+    lineage: list[Node] = []
+    current: Node | None = node
+    while current is not None:
+        lineage.append(current)
+        current = current.parent
+    parts: tuple[str, ...] | None = None
+    for current in reversed(lineage):
+        parent_parts = parts
+        memo = current.sanitized_path_memo
+        if memo is not None and memo[0] == current.name and memo[1] is parent_parts:
+            parts = memo[2]
+            continue
+        if parent_parts is None:
+            parts = () if current.name == "" else (sanitize_path_part(current.name),)
+        else:
+            parts = (*parent_parts, sanitize_path_part(current.name))
+        current.sanitized_path_memo = (current.name, parent_parts, parts)
+    assert parts is not None
+    return parts
 
 
 def _clash_suffix(node: Node) -> str:
@@ -258,9 +281,8 @@ def _filesystem_path_key(node: Node) -> tuple[str, ...]:
     return tuple(part.casefold() for part in sanitized_node_path_parts(node))
 
 
-def _general_name_clash(left: Node, right: Node) -> bool:
-    if _filesystem_name_key(left) != _filesystem_name_key(right):
-        return False
+def _same_name_clash(left: Node, right: Node) -> bool:
+    """Whether two siblings with the same filesystem name must be renamed."""
     if left.url != right.url:
         return True
     if left.url is not None:
@@ -272,64 +294,115 @@ def _general_name_clash(left: Node, right: Node) -> bool:
     )
 
 
-def _apply_opencast_name_clashes(children: list[Node]) -> list[Node]:
-    remaining = children.copy()
-    renamed: list[Node] = []
+class _NameBucket:
+    """Unprocessed siblings sharing one filesystem name, in sibling order.
 
-    while remaining:
-        child = remaining.pop(0)
-        renamed.append(child)
-        if child.download_kind is not DownloadKind.OPENCAST:
-            continue
+    URL counts let the clash passes see in constant time that no remaining
+    sibling can clash, so a large group is scanned only when it is renamed.
+    """
 
-        siblings = [
-            sibling
-            for sibling in remaining
-            if _filesystem_name_key(sibling) == _filesystem_name_key(child)
-            and sibling.url != child.url
-        ]
-        if not siblings:
-            continue
+    __slots__ = ("nodes", "urls")
 
-        child.name = _opencast_clash_name(child)
-        for sibling in siblings:
-            sibling.name = _opencast_clash_name(sibling)
-            remaining.remove(sibling)
-            renamed.append(sibling)
+    def __init__(self) -> None:
+        self.nodes: deque[Node] = deque()
+        self.urls: Counter[str | None] = Counter()
 
-    return renamed
+    def append(self, node: Node) -> None:
+        self.nodes.append(node)
+        self.urls[node.url] += 1
 
+    def pop_first(self) -> Node:
+        node = self.nodes.popleft()
+        self.urls[node.url] -= 1
+        return node
 
-def _apply_general_name_clashes(children: list[Node]) -> list[Node]:
-    remaining = children.copy()
-    renamed: list[Node] = []
+    def only_url(self, url: str | None) -> bool:
+        return self.urls[url] == len(self.nodes)
 
-    while remaining:
-        child = remaining.pop(0)
+    def take(self, clashes: Callable[[Node], bool]) -> list[Node]:
+        taken: list[Node] = []
+        kept: deque[Node] = deque()
+        for node in self.nodes:
+            if clashes(node):
+                taken.append(node)
+                self.urls[node.url] -= 1
+            else:
+                kept.append(node)
+        self.nodes = kept
+        return taken
+
+
+def _name_clash_passes(
+    children: list[Node],
+    find_siblings: Callable[[Node, _NameBucket], list[Node]],
+    rename: Callable[[Node, list[Node]], None],
+) -> list[Node]:
+    """Visit siblings in order, renaming each one with its clashing siblings.
+
+    A clashing sibling is moved directly behind the child it clashed with and
+    is not visited on its own, as in a scan of the remaining siblings.
+    """
+    buckets: dict[str, _NameBucket] = {}
+    keys = [_filesystem_name_key(child) for child in children]
+    for child, key in zip(children, keys, strict=True):
+        buckets.setdefault(key, _NameBucket()).append(child)
+
+    renamed: list[Node] = []
+    handled: set[Node] = set()
+    for child, key in zip(children, keys, strict=True):
+        if child in handled:
+            continue
+        bucket = buckets[key]
+        bucket.pop_first()
         renamed.append(child)
-        siblings = [
-            sibling for sibling in remaining if _general_name_clash(child, sibling)
-        ]
+        siblings = find_siblings(child, bucket) if bucket.nodes else []
         if not siblings:
             continue
+        rename(child, siblings)
+        handled.update(siblings)
+        renamed.extend(siblings)
+    return renamed
 
-        clashing_nodes = [child, *siblings]
-        names = [
-            (
-                _same_url_clash_name(node)
-                if node.url is not None
-                and sum(other.url == node.url for other in clashing_nodes) > 1
-                else _stable_clash_name(node)
-            )
-            for node in clashing_nodes
-        ]
-        child.name = names[0]
-        for sibling, name in zip(siblings, names[1:], strict=True):
-            sibling.name = name
-            remaining.remove(sibling)
-            renamed.append(sibling)
 
-    return renamed
+def _opencast_siblings(child: Node, bucket: _NameBucket) -> list[Node]:
+    if child.download_kind is not DownloadKind.OPENCAST or bucket.only_url(child.url):
+        return []
+    return bucket.take(lambda sibling: sibling.url != child.url)
+
+
+def _rename_opencast_clash(child: Node, siblings: list[Node]) -> None:
+    child.name = _opencast_clash_name(child)
+    for sibling in siblings:
+        sibling.name = _opencast_clash_name(sibling)
+
+
+def _apply_opencast_name_clashes(children: list[Node]) -> list[Node]:
+    return _name_clash_passes(children, _opencast_siblings, _rename_opencast_clash)
+
+
+def _general_siblings(child: Node, bucket: _NameBucket) -> list[Node]:
+    if child.url is None and child.type != NodeKind.COURSE and bucket.only_url(None):
+        return []
+    return bucket.take(lambda sibling: _same_name_clash(child, sibling))
+
+
+def _rename_general_clash(child: Node, siblings: list[Node]) -> None:
+    clashing_nodes = [child, *siblings]
+    url_counts = Counter(node.url for node in clashing_nodes)
+    names = [
+        (
+            _same_url_clash_name(node)
+            if node.url is not None and url_counts[node.url] > 1
+            else _stable_clash_name(node)
+        )
+        for node in clashing_nodes
+    ]
+    for node, name in zip(clashing_nodes, names, strict=True):
+        node.name = name
+
+
+def _apply_general_name_clashes(children: list[Node]) -> list[Node]:
+    return _name_clash_passes(children, _general_siblings, _rename_general_clash)
 
 
 def _resolve_sibling_name_clashes(node: Node) -> None:
@@ -339,32 +412,44 @@ def _resolve_sibling_name_clashes(node: Node) -> None:
         _resolve_sibling_name_clashes(child)
 
 
-def _resolve_download_path_clashes(root: Node) -> None:
-    download_nodes: list[Node] = []
+def _download_path_keys(root: Node) -> dict[Node, tuple[str, ...]]:
+    """Map every download below ``root`` to its case-folded filesystem path."""
+    keys: dict[Node, tuple[str, ...]] = {}
     remaining = [root]
     while remaining:
         node = remaining.pop()
         remaining.extend(node.children)
         if node.url:
-            download_nodes.append(node)
+            keys[node] = _filesystem_path_key(node)
+    return keys
+
+
+def _resolve_download_path_clashes(root: Node) -> None:
+    path_keys = _download_path_keys(root)
 
     # Each pass either resolves every collision or moves a colliding file away
     # from a pre-existing generated name. At most one such name can be consumed
     # per file; the bound prevents a malformed tree from looping.
-    for _ in range(len(download_nodes) + 1):
+    for _ in range(len(path_keys) + 1):
         nodes_by_path: dict[tuple[str, ...], list[Node]] = {}
-        for node in download_nodes:
-            nodes_by_path.setdefault(_filesystem_path_key(node), []).append(node)
+        for node, key in path_keys.items():
+            nodes_by_path.setdefault(key, []).append(node)
         clashes = [
-            nodes
+            node
             for nodes in nodes_by_path.values()
             if len({node.url for node in nodes}) > 1
+            for node in nodes
         ]
         if not clashes:
             return
-        for nodes in clashes:
-            for node in nodes:
-                node.name = _stable_clash_name(node)
+        for node in clashes:
+            node.name = _stable_clash_name(node)
+        # Only renamed downloads change their path unless they have children.
+        if any(node.children for node in clashes):
+            path_keys = _download_path_keys(root)
+        else:
+            for node in clashes:
+                path_keys[node] = _filesystem_path_key(node)
     raise ValueError("Could not create unique paths for downloaded files")
 
 
@@ -392,13 +477,26 @@ def with_windows_extended_length_prefix(path: Path, *, force: bool = False) -> P
 
 
 def get_sanitized_node_path(node: Node, sync_directory: Path) -> Path:
-    sync_directory = sync_directory.expanduser()
-    target_path = sync_directory.joinpath(*sanitized_node_path_parts(node))
-    resolved_sync_directory = sync_directory.resolve(strict=False)
-    resolved_target = target_path.resolve(strict=False)
-    if not resolved_target.is_relative_to(resolved_sync_directory):
+    """Return where ``node`` is stored below ``sync_directory``.
+
+    Containment is checked lexically: sanitized components never contain a
+    separator or a relative part, so no filesystem lookup is needed. The path
+    is memoized on the node until its components or the directory change.
+    """
+    parts = sanitized_node_path_parts(node)
+    memo = node.download_path_memo
+    if memo is not None and memo[0] is parts and memo[1] == sync_directory:
+        return memo[2]
+    target_path = sync_directory.expanduser().joinpath(*parts)
+    if any(_escapes_directory(part) for part in parts):
         raise ValueError(f"Refusing to write outside sync directory: {target_path}")
-    return with_windows_extended_length_prefix(target_path)
+    path = with_windows_extended_length_prefix(target_path)
+    node.download_path_memo = (parts, sync_directory, path)
+    return path
+
+
+def _escapes_directory(part: str) -> bool:
+    return part in {"", ".", ".."} or "/" in part or "\\" in part
 
 
 def parse_conflict_path(path: Path) -> ConflictPathInfo | None:
@@ -791,7 +791,7 @@ def _known_quiz_artifacts(
         return existing
     if old_node is None:
         return set()
-    return existing & old_node.artifact_hashes.keys()
+    return existing & old_node.stored_artifact_hashes.keys()
 
 
 def _initialize_quiz_artifact_hashes(
@@ -800,7 +800,7 @@ def _initialize_quiz_artifact_hashes(
     same_revision: bool,
 ) -> None:
     if same_revision and old_node is not None:
-        node.artifact_hashes = dict(old_node.artifact_hashes)
+        node.artifact_hashes = dict(old_node.stored_artifact_hashes)
     elif not same_revision:
         node.artifact_hashes = {}
 
@@ -818,7 +818,7 @@ def _retain_old_quiz_revision(
     node.timemodified = old_node.timemodified
     node.etag = old_node.etag
     node.etag_kind = old_node.etag_kind
-    node.artifact_hashes = dict(old_node.artifact_hashes)
+    node.artifact_hashes = dict(old_node.stored_artifact_hashes)
     return DownloadOutcome(unchanged=unchanged)
 
 
@@ -1159,8 +1159,8 @@ def download_quiz(
         if wanted
     }
     baselines = {
-        "html": storage.snapshot_file(html_path),
-        "pdf": storage.snapshot_file(pdf_path),
+        "html": storage.snapshot_file(html_path, ctx.digest_index),
+        "pdf": storage.snapshot_file(pdf_path, ctx.digest_index),
     }
     artifact_baselines = {kind: baselines[kind] for kind in artifacts}
     existing = {
@@ -11,6 +11,7 @@ from typing import Any, cast
 import requests
 
 from syncmymoodle.constants import (
+    HTTP_POOL_SIZE,
     HTTP_TIMEOUT_SECONDS,
     MOODLE_URL,
     RWTH_DISRUPTIVE_STATUS_CLASSES,
@@ -22,6 +23,7 @@ from syncmymoodle.constants import (
 )
 from syncmymoodle.context import SyncContext
 from syncmymoodle.http_utils import (
+    create_session,
     get_input_value,
     moodle_url_allowed,
     parse_html,
@@ -293,7 +295,7 @@ def cached_session_status(cookie_file: Path) -> SessionStatus:
     if payload is None:
         return SessionStatus(SessionStatusKind.MISSING)
 
-    session = requests.Session()
+    session = create_session()
     session_key = load_session_from_data(session.cookies, payload)
     if session_key is None:
         return SessionStatus(
@@ -344,11 +346,14 @@ def cached_session_status(cookie_file: Path) -> SessionStatus:
     return SessionStatus(SessionStatusKind.VALID, remaining_seconds=remaining)
 
 
-def load_cached_session(cookie_file: Path) -> tuple[requests.Session, str] | None:
+def load_cached_session(
+    cookie_file: Path,
+    pool_size: int = HTTP_POOL_SIZE,
+) -> tuple[requests.Session, str] | None:
     payload = read_private_gzip_json(cookie_file, "cached browser session")
     if payload is None:
         return None
-    session = requests.Session()
+    session = create_session(pool_size=pool_size)
     session_key = load_session_from_data(session.cookies, payload)
     if session_key is None:
         return None
@@ -678,7 +683,9 @@ def login(
     reuse_cached_session: bool = True,
     persist_session: bool = True,
 ) -> None:
-    session = requests.Session()
+    session = create_session(
+        pool_size=ctx.config.http_pool_size, latency=ctx.http_latency
+    )
     ctx.session = session
     cookie_file = Path(ctx.config.cookie_file).expanduser()
     if reuse_cached_session:
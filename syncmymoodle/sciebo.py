@@ -159,8 +159,10 @@ def scan_public_shares(
             course_id=course_id,
         ):
             continue
-        if link in ctx.sciebo_link_cache:
-            cached_root = ctx.sciebo_link_cache[link]
+        with ctx.shared_cache_lock:
+            known = link in ctx.sciebo_link_cache
+            cached_root = ctx.sciebo_link_cache.get(link)
+        if known:
             if cached_root is None:
                 _record_share_failure(ctx, parent_node, course_id, link)
             elif match_equivalent_child(parent_node, cached_root) is None:
@@ -190,8 +192,9 @@ def _cached_node_for(ctx: SyncContext, node: Node) -> Node | None:
     course_node = node.ancestor(NodeKind.COURSE)
     if course_node is None:
         return None
-    state = ctx.course_cache_states.get(course_node)
-    if state is None or state.course_root is None:
+    with ctx.shared_cache_lock:
+        state = ctx.course_cache_states.get(course_node)
+    if state is None:
         return None
 
     relative_nodes: list[Node] = []
@@ -201,13 +204,7 @@ def _cached_node_for(ctx: SyncContext, node: Node) -> Node | None:
         if current.parent is None:
             return None
         current = current.parent
-
-    cached: Node | None = state.course_root
-    for relative_node in reversed(relative_nodes):
-        cached = match_equivalent_child(cached, relative_node)
-        if cached is None:
-            return None
-    return cached
+    return state.cached_node(relative_nodes[::-1])
 
 
 def _valid_cached_marker(node: Node) -> bool:
@@ -410,7 +407,8 @@ def _scan_new_share(
     log: logging.Logger,
 ) -> bool:
     sharing_token = sharing_token_from_link(link)
-    capability = ctx.sciebo_direct_webdav_supported
+    with ctx.shared_cache_lock:
+        capability = ctx.sciebo_direct_webdav_supported
     use_legacy = capability is False
     auth_headers: dict[str, str] = {}
     root_listing = None
@@ -431,12 +429,12 @@ def _scan_new_share(
     if use_legacy:
         share_auth = _share_auth_headers(ctx, link, log)
         if share_auth is None:
-            ctx.sciebo_link_cache[link] = None
+            _remember_share(ctx, link, None)
             return False
         sharing_token, auth_headers = share_auth
         root_listing = None
     elif root_listing is None:
-        ctx.sciebo_link_cache[link] = None
+        _remember_share(ctx, link, None)
         return False
 
     sciebo_root = parent_node.add_child(
@@ -454,16 +452,22 @@ def _scan_new_share(
         cached_parent=cached_root,
     ):
         ctx.service_outages.record_available(SCIEBO_URL)
-        if capability is None:
-            ctx.sciebo_direct_webdav_supported = not use_legacy
-        ctx.sciebo_link_cache[link] = sciebo_root.clone()
+        with ctx.shared_cache_lock:
+            if ctx.sciebo_direct_webdav_supported is None:
+                ctx.sciebo_direct_webdav_supported = not use_legacy
+        _remember_share(ctx, link, sciebo_root.clone())
         return True
 
     parent_node.children.remove(sciebo_root)
-    ctx.sciebo_link_cache[link] = None
+    _remember_share(ctx, link, None)
     return False
 
 
+def _remember_share(ctx: SyncContext, link: str, root: Node | None) -> None:
+    with ctx.shared_cache_lock:
+        ctx.sciebo_link_cache[link] = root
+
+
 def _fetch_webdav_listing(
     ctx: SyncContext,
     href: str,
@@ -490,6 +494,7 @@ def _fetch_webdav_listing(
             _sciebo_url_allowed,
             headers=headers,
             data=PROPFIND_BODY,
+            retry=ctx.http_retries,
             timeout=HTTP_TIMEOUT_SECONDS,
         )
     except RequestPolicyError as error:
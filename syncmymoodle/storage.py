@@ -4,39 +4,249 @@ import importlib
 import json
 import logging
 import os
+import sqlite3
 import tempfile
-from collections.abc import Iterator
+import threading
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, BinaryIO
+from typing import Any, BinaryIO, TypeVar
 
 import requests
 
 from syncmymoodle import pathing
-from syncmymoodle.constants import COURSE_CACHE_DIRECTORY
+from syncmymoodle.constants import (
+    CACHE_COMPRESSION_LEVELS,
+    CACHE_DATABASE_FILENAME,
+    CHECKSUM_LENGTHS_BY_ALGO,
+    COURSE_CACHE_DIRECTORY,
+    DIGEST_INDEX_FILENAME,
+)
 
 logger = logging.getLogger(__name__)
 
 
+FileIdentity = tuple[int, int, int, int, int]
+SNAPSHOT_ALGORITHMS = ("md5", "sha1", "sha256")
+DIGEST_INDEX_FORMAT = "syncmymoodle.digests.v1"
+# hashlib releases the GIL while hashing large buffers, so local files are
+# hashed on a shared pool sized for the available cores.
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+_hash_executor: ThreadPoolExecutor | None = None
+_hash_executor_lock = threading.Lock()
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+# Compressed JSON written with a CacheCodec starts with this marker and the
+# codec's one-byte ID; anything else is read as plain gzip.
+COMPRESSED_JSON_MAGIC = b"SMMZ\n"
+CACHE_CODEC_IDS = {"zlib": 1, "zstd": 2}
+
+
+def _zstd_module() -> Any | None:
+    try:
+        return importlib.import_module("compression.zstd")
+    except ImportError:
+        return None
+
+
+@dataclass(frozen=True)
+class CacheCodec:
+    """Compression codec and level used for private cache files."""
+
+    name: str
+    level: int
+
+    @property
+    def codec_id(self) -> int:
+        return CACHE_CODEC_IDS[self.name]
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return bytes(_require_zstd().compress(data, level=self.level))
+        return zlib.compress(data, self.level)
+
+    def compressor(self) -> Any:
+        """Return an incremental compressor with ``compress`` and ``flush``."""
+        if self.name == "zstd":
+            return _require_zstd().ZstdCompressor(level=self.level)
+        return zlib.compressobj(self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress ``data``, raising ValueError when it is corrupt."""
+        if self.name == "zstd":
+            zstd = _require_zstd()
+            try:
+                return bytes(zstd.decompress(data))
+            except zstd.ZstdError as error:
+                raise ValueError(f"corrupt zstd data: {error}") from error
+        try:
+            return zlib.decompress(data)
+        except zlib.error as error:
+            raise ValueError(f"corrupt zlib data: {error}") from error
+
+
+def _require_zstd() -> Any:
+    zstd = _zstd_module()
+    if zstd is None:
+        raise ValueError("zstd compression is not available in this Python")
+    return zstd
+
+
+DEFAULT_CACHE_CODEC = CacheCodec("zlib", CACHE_COMPRESSION_LEVELS["zlib"][1])
+
+
+def cache_codec(name: str, level: int | None = None) -> CacheCodec:
+    """Return the configured cache codec, using zlib when zstd is unavailable."""
+    if name == "zstd" and _zstd_module() is None:
+        logger.warning(
+            "zstd cache compression needs Python 3.14 or newer; using zlib instead"
+        )
+        return DEFAULT_CACHE_CODEC
+    low, default, high = CACHE_COMPRESSION_LEVELS[name]
+    return CacheCodec(name, default if level is None else min(max(level, low), high))
+
+
+def cache_codec_for_id(codec_id: int) -> CacheCodec:
+    """Return a codec able to decompress data tagged with ``codec_id``."""
+    for name, known_id in CACHE_CODEC_IDS.items():
+        if known_id == codec_id:
+            if name == "zstd":
+                _require_zstd()
+            return CacheCodec(name, CACHE_COMPRESSION_LEVELS[name][1])
+    raise ValueError(f"unknown cache compression codec: {codec_id}")
+
+
+def hash_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool used for hashing local files."""
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=HASH_WORKERS,
+                thread_name_prefix="syncmymoodle-hash",
+            )
+        return _hash_executor
+
+
+def map_hashing(function: Callable[[_T], _R], items: Iterable[_T]) -> list[_R]:
+    """Apply ``function`` to ``items`` on the hashing pool, preserving order.
+
+    Exceptions raised by ``function`` propagate to the caller as if the calls
+    had run sequentially.
+    """
+    items = list(items)
+    if len(items) < 2 or HASH_WORKERS < 2:
+        return [function(item) for item in items]
+    return list(hash_executor().map(function, items))
+
+
+@dataclass
+class DigestIndex:
+    """Digests of files below a sync root, keyed by path and stat identity.
+
+    A stored digest is reused only while the file keeps the identity it had
+    when it was hashed, so unchanged files need not be read again.
+    """
+
+    internal_root: pathing.InternalPathRoot
+    entries: dict[str, tuple[FileIdentity, dict[str, str]]] = field(
+        default_factory=dict
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def _key(self, path: Path) -> str | None:
+        try:
+            relative = pathing.absolute_path(path).relative_to(self.internal_root.root)
+        except ValueError:
+            return None
+        return relative.as_posix()
+
+    def get(self, path: Path, identity: FileIdentity, algorithm: str) -> str | None:
+        key = self._key(path)
+        with self._lock:
+            entry = self.entries.get(key) if key is not None else None
+        if entry is None or entry[0] != identity:
+            return None
+        return entry[1].get(algorithm)
+
+    def items(self) -> list[tuple[str, tuple[FileIdentity, dict[str, str]]]]:
+        with self._lock:
+            return [
+                (key, (identity, dict(digests)))
+                for key, (identity, digests) in self.entries.items()
+            ]
+
+    def record(
+        self,
+        path: Path,
+        identity: FileIdentity,
+        algorithm: str,
+        digest: str,
+    ) -> None:
+        key = self._key(path)
+        if key is None:
+            return
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != identity:
+                entry = (identity, {})
+                self.entries[key] = entry
+            entry[1][algorithm] = digest
+
+
 @dataclass(frozen=True)
 class FileSnapshot:
-    """Content identity observed for a target before staging an update."""
+    """Content identity observed for a target before staging an update.
+
+    Digests are computed on first use and only for the requested algorithm.
+    They always describe the content the file had at the snapshot's stat
+    identity; a file that changed since the snapshot yields no digest.
+    """
 
     exists: bool
-    digest: str | None = None
-    md5: str | None = None
-    sha1: str | None = None
-    identity: tuple[int, int, int, int, int] | None = None
+    identity: FileIdentity | None = None
+    path: Path | None = field(default=None, repr=False, compare=False)
+    digests: dict[str, str | None] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    index: DigestIndex | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def digest(self) -> str | None:
+        """Return the SHA-256 digest, or ``None`` if the content is unreadable."""
+        return self.digest_for("sha256")
 
     def digest_for(self, algorithm: str) -> str | None:
-        """Return a digest captured during the snapshot's single file read."""
-        return {
-            "md5": self.md5,
-            "sha1": self.sha1,
-            "sha256": self.digest,
-        }.get(algorithm)
+        """Return the snapshotted content's digest for ``algorithm``."""
+        if algorithm not in SNAPSHOT_ALGORITHMS:
+            return None
+        if algorithm not in self.digests:
+            self.digests[algorithm] = self._read_digest(algorithm)
+        return self.digests[algorithm]
+
+    def _read_digest(self, algorithm: str) -> str | None:
+        if not self.exists or self.identity is None or self.path is None:
+            return None
+        if self.index is not None:
+            indexed = self.index.get(self.path, self.identity, algorithm)
+            if indexed is not None:
+                return indexed
+        try:
+            with self.path.open("rb") as handle:
+                digest = hashlib.file_digest(handle, algorithm).hexdigest()
+        except OSError:
+            return None
+        if not self.metadata_matches(self.path):
+            return None
+        if self.index is not None:
+            self.index.record(self.path, self.identity, algorithm, digest)
+        return digest
 
     def still_matches(self, path: Path) -> bool:
         """Verify that both metadata and content still match the snapshot."""
@@ -46,19 +256,28 @@ class FileSnapshot:
             return True
         return file_sha256(path) == self.digest and self.metadata_still_matches(path)
 
+    def metadata_matches(self, path: Path) -> bool:
+        """Check that ``path`` still has the snapshot's stat identity."""
+        try:
+            return _file_identity(path.stat()) == self.identity
+        except OSError:
+            return False
+
     def metadata_still_matches(self, path: Path) -> bool:
-        """Check for changes without reading file content again."""
+        """Check for changes without reading file content.
+
+        Only the stat identity is compared. A SHA-256 digest is consulted only
+        if it was already computed, to reject content that proved unreadable.
+        """
         try:
             current = path.stat()
         except FileNotFoundError:
             return not self.exists
         except OSError:
             return False
-        return bool(
-            self.exists
-            and self.digest is not None
-            and self.identity == _file_identity(current)
-        )
+        if not self.exists or self.identity != _file_identity(current):
+            return False
+        return self.digests.get("sha256", "") is not None
 
 
 class InstallResult(Enum):
@@ -80,7 +299,7 @@ def file_sha256(path: Path) -> str | None:
         return None
 
 
-def _file_identity(result: os.stat_result) -> tuple[int, int, int, int, int]:
+def _file_identity(result: os.stat_result) -> FileIdentity:
     return (
         result.st_dev,
         result.st_ino,
@@ -90,41 +309,310 @@ def _file_identity(result: os.stat_result) -> tuple[int, int, int, int, int]:
     )
 
 
-def snapshot_file(path: Path) -> FileSnapshot:
-    """Capture stable stat data and common digests in one file read."""
+def snapshot_file(path: Path, index: DigestIndex | None = None) -> FileSnapshot:
+    """Capture stable stat data; digests are read when first requested.
+
+    With an ``index``, digests of files whose identity is unchanged since they
+    were last hashed are taken from it instead of reading the file.
+    """
     try:
         before = path.stat()
     except FileNotFoundError:
         return FileSnapshot(False)
     except OSError:
         return FileSnapshot(True)
-
-    digests = (
-        hashlib.md5(usedforsecurity=False),
-        hashlib.sha1(usedforsecurity=False),
-        hashlib.sha256(),
-    )
+    return FileSnapshot(True, identity=_file_identity(before), path=path, index=index)
+
+
+def warm_digests(
+    index: DigestIndex,
+    targets: Mapping[Path, Iterable[str]],
+    progress: Callable[[int, int], None] | None = None,
+) -> None:
+    """Hash existing files in parallel so later snapshots find them in ``index``.
+
+    ``targets`` maps each path to the digest algorithms callers will compare.
+    ``progress`` is called with the checked and total target counts, from the
+    hashing threads.
+    """
+    total = len(targets)
+    checked = 0
+    lock = threading.Lock()
+    if progress is not None:
+        progress(0, total)
+
+    def hash_target(item: tuple[Path, Iterable[str]]) -> None:
+        nonlocal checked
+        path, algorithms = item
+        snapshot = snapshot_file(path, index)
+        if snapshot.exists:
+            for algorithm in algorithms:
+                snapshot.digest_for(algorithm)
+        if progress is not None:
+            with lock:
+                checked += 1
+                progress(checked, total)
+
+    map_hashing(hash_target, targets.items())
+
+
+def record_file_digest(index: DigestIndex, path: Path, digest: str) -> None:
+    """Remember the SHA-256 of a file that was just verified and installed."""
     try:
-        with path.open("rb") as handle:
-            while chunk := handle.read(1024 * 1024):
-                for digest in digests:
-                    digest.update(chunk)
+        identity = _file_identity(path.stat())
     except OSError:
-        return FileSnapshot(True, identity=_file_identity(before))
+        return
+    index.record(path, identity, "sha256", digest)
+
+
+def _digest_index_path(internal_root: pathing.InternalPathRoot) -> Path:
+    return internal_root.path(COURSE_CACHE_DIRECTORY, DIGEST_INDEX_FILENAME)
+
+
+def _indexed_digests(value: Any) -> tuple[FileIdentity, dict[str, str]] | None:
+    if not isinstance(value, dict):
+        return None
+    identity = value.get("identity")
+    digests = value.get("digests")
+    if (
+        not isinstance(identity, list)
+        or len(identity) != 5
+        or not all(
+            isinstance(item, int) and not isinstance(item, bool) for item in identity
+        )
+        or not isinstance(digests, dict)
+    ):
+        return None
+    valid = {
+        algorithm: digest
+        for algorithm, digest in digests.items()
+        if algorithm in SNAPSHOT_ALGORITHMS
+        and isinstance(digest, str)
+        and len(digest) == CHECKSUM_LENGTHS_BY_ALGO[algorithm]
+    }
+    if not valid:
+        return None
+    dev, inode, size, mtime_ns, ctime_ns = identity
+    return (dev, inode, size, mtime_ns, ctime_ns), valid
+
+
+def load_digest_index(internal_root: pathing.InternalPathRoot) -> DigestIndex:
+    """Read the digest index persisted by the previous run, if any."""
+    index = DigestIndex(internal_root)
     try:
-        after = path.stat()
-    except OSError:
-        return FileSnapshot(True)
-    identity = _file_identity(before)
-    if identity != _file_identity(after):
-        return FileSnapshot(True)
-    return FileSnapshot(
-        True,
-        digest=digests[2].hexdigest(),
-        md5=digests[0].hexdigest(),
-        sha1=digests[1].hexdigest(),
-        identity=identity,
+        index_path = _digest_index_path(internal_root)
+    except pathing.UnsafeInternalPathError:
+        return index
+    payload = read_private_gzip_json(
+        pathing.with_windows_extended_length_prefix(index_path), "digest index"
     )
+    if not isinstance(payload, dict) or payload.get("format") != DIGEST_INDEX_FORMAT:
+        return index
+    files = payload.get("files")
+    if not isinstance(files, dict):
+        return index
+    for key, value in files.items():
+        entry = _indexed_digests(value)
+        if isinstance(key, str) and entry is not None:
+            index.entries[key] = entry
+    return index
+
+
+def save_digest_index(
+    index: DigestIndex,
+    codec: CacheCodec = DEFAULT_CACHE_CODEC,
+) -> None:
+    """Persist digests of files that still have the identity they were hashed at."""
+    files: dict[str, dict[str, Any]] = {}
+    root = index.internal_root.root
+    for key, (identity, digests) in index.items():
+        try:
+            current = _file_identity((root / key).stat())
+        except OSError:
+            continue
+        if current == identity:
+            files[key] = {"identity": list(identity), "digests": digests}
+    try:
+        index_path = index.internal_root.create_parent(
+            _digest_index_path(index.internal_root)
+        )
+        write_private_json(
+            pathing.with_windows_extended_length_prefix(index_path),
+            {"format": DIGEST_INDEX_FORMAT, "files": files},
+            codec,
+        )
+    except (OSError, pathing.UnsafeInternalPathError) as error:
+        logger.warning("Could not save the local file digest index: %s", error)
+
+
+# (normalized site, Moodle user id, Moodle course id)
+CourseCacheKey = tuple[str, int, int]
+CACHE_DATABASE_SCHEMA_VERSION = 1
+_CACHE_DATABASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS course_caches (
+    site TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    course_id INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (site, user_id, course_id)
+) WITHOUT ROWID
+"""
+
+
+class CacheDatabase:
+    """Encoded course caches of every account in one SQLite database.
+
+    Rows are keyed by site, Moodle user and course, so loading and saving a
+    course cache are primary-key queries. Course scan threads share the
+    connection, which is serialized by a lock.
+    """
+
+    def __init__(self, path: Path, connection: sqlite3.Connection) -> None:
+        self.path = path
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def load(self, key: CourseCacheKey) -> bytes | None:
+        try:
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT data FROM course_caches "
+                    "WHERE site = ? AND user_id = ? AND course_id = ?",
+                    key,
+                ).fetchone()
+        except sqlite3.Error as error:
+            logger.warning("Could not read the cache database %s: %s", self.path, error)
+            return None
+        return bytes(row[0]) if row is not None else None
+
+    def save(self, entries: Iterable[tuple[CourseCacheKey, bytes]]) -> bool:
+        """Store or replace the given course caches in one transaction."""
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO course_caches "
+                    "(site, user_id, course_id, data) VALUES (?, ?, ?, ?)",
+                    ((*key, data) for key, data in entries),
+                )
+        except sqlite3.Error as error:
+            logger.warning("Could not save course caches to %s: %s", self.path, error)
+            return False
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _cache_database_path(
+    internal_root: pathing.InternalPathRoot,
+    read_only: bool,
+) -> Path | None:
+    try:
+        path = internal_root.path(COURSE_CACHE_DIRECTORY, CACHE_DATABASE_FILENAME)
+        if read_only:
+            return path if path.is_file() else None
+        return internal_root.create_parent(path)
+    except (OSError, pathing.UnsafeInternalPathError) as error:
+        logger.warning("Could not open the cache database: %s", error)
+        return None
+
+
+def open_cache_database(
+    internal_root: pathing.InternalPathRoot,
+    *,
+    read_only: bool = False,
+) -> CacheDatabase | None:
+    """Open the shared cache database, or return None if it cannot be used.
+
+    A read-only open never creates the database, so dry runs leave no files
+    behind.
+    """
+    path = _cache_database_path(internal_root, read_only)
+    if path is None or not harden_private_file(path, "cache database"):
+        return None
+    try:
+        if not path.exists():
+            # SQLite creates files with the process umask; start from an
+            # empty private file instead, which it accepts as a new database.
+            write_private_bytes(path, b"", "cache database")
+        connection = sqlite3.connect(
+            f"{path.as_uri()}?mode={'ro' if read_only else 'rw'}",
+            uri=True,
+            check_same_thread=False,
+        )
+    except (OSError, sqlite3.Error) as error:
+        logger.warning("Could not open the cache database %s: %s", path, error)
+        return None
+    try:
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version == 0 and not read_only:
+            with connection:
+                connection.execute(_CACHE_DATABASE_SCHEMA)
+                connection.execute(
+                    f"PRAGMA user_version = {CACHE_DATABASE_SCHEMA_VERSION}"
+                )
+            version = CACHE_DATABASE_SCHEMA_VERSION
+    except sqlite3.Error:
+        version = None
+    if version == CACHE_DATABASE_SCHEMA_VERSION:
+        return CacheDatabase(path, connection)
+    connection.close()
+    # A read-only open of a database that was never initialized is just empty.
+    if version != 0:
+        _warn_invalid_private_file(path, "cache database")
+    return None
+
+
+class StreamingDigests:
+    """File digests computed from the bytes while they are being written.
+
+    SHA-256 is always computed; MD5 and SHA-1 only when requested, since they
+    are needed just to check checksums advertised by the server.
+    """
+
+    def __init__(self, algorithms: Iterable[str] = ()) -> None:
+        self._digests = {"sha256": hashlib.sha256()}
+        for algorithm in algorithms:
+            if algorithm in {"md5", "sha1"} and algorithm not in self._digests:
+                self._digests[algorithm] = hashlib.new(algorithm, usedforsecurity=False)
+        self._size = 0
+        self._complete = True
+
+    def update(self, data: bytes | memoryview) -> None:
+        for digest in self._digests.values():
+            digest.update(data)
+        self._size += len(data)
+
+    def update_from_file(self, path: Path) -> None:
+        """Add the current content of ``path``, such as a resumed prefix."""
+        try:
+            with path.open("rb") as handle:
+                while chunk := handle.read(1024 * 1024):
+                    self.update(chunk)
+        except OSError:
+            self._complete = False
+
+    def snapshot(self, path: Path) -> FileSnapshot:
+        """Describe ``path`` once every byte written to it passed through here."""
+        try:
+            current = path.stat()
+        except FileNotFoundError:
+            return FileSnapshot(False)
+        except OSError:
+            return FileSnapshot(True)
+        identity = _file_identity(current)
+        if not self._complete or current.st_size != self._size:
+            return FileSnapshot(True, identity=identity, digests={"sha256": None})
+        return FileSnapshot(
+            True,
+            identity=identity,
+            path=path,
+            digests={
+                algorithm: digest.hexdigest()
+                for algorithm, digest in self._digests.items()
+            },
+        )
 
 
 def install_staged_file(
@@ -287,6 +775,15 @@ def chmod_private_best_effort(path: Path, description: str) -> bool:
 
 
 def write_private_bytes(path: Path, data: bytes, description: str) -> None:
+    write_private_chunks(path, [data], description)
+
+
+def write_private_chunks(
+    path: Path,
+    chunks: Iterable[bytes],
+    description: str,
+) -> None:
+    """Atomically write ``chunks`` in order to a private file."""
     path = path.expanduser()
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -310,7 +807,8 @@ def write_private_bytes(path: Path, data: bytes, description: str) -> None:
                 ) from error
         with os.fdopen(fd, "wb") as f:
             fd = -1
-            f.write(data)
+            for chunk in chunks:
+                f.write(chunk)
         os.replace(tmp_path, path)
     finally:
         if fd >= 0:
@@ -330,7 +828,15 @@ def write_private_gzip_json(path: Path, payload: Any) -> None:
     write_private_bytes(path, gzip.compress(json_bytes), "private data")
 
 
-def read_private_gzip_json(path: Path, description: str) -> Any:
+def _warn_invalid_private_file(path: Path, description: str) -> None:
+    logger.warning(
+        "Ignoring legacy or invalid %s file %s. Delete it if this warning repeats.",
+        description,
+        path,
+    )
+
+
+def read_private_bytes(path: Path, description: str) -> bytes | None:
     path = path.expanduser()
     if not path.exists():
         return None
@@ -338,13 +844,37 @@ def read_private_gzip_json(path: Path, description: str) -> Any:
         return None
     try:
         with path.open("rb") as f:
-            return json.loads(gzip.decompress(f.read()).decode("utf-8"))
-    except (OSError, gzip.BadGzipFile, UnicodeDecodeError, json.JSONDecodeError):
-        logger.warning(
-            "Ignoring legacy or invalid %s file %s. Delete it if this warning repeats.",
-            description,
-            path,
-        )
+            return f.read()
+    except OSError:
+        _warn_invalid_private_file(path, description)
+        return None
+
+
+def write_private_json(path: Path, payload: Any, codec: CacheCodec) -> None:
+    """Write ``payload`` as JSON compressed with ``codec``, tagged with its ID."""
+    json_bytes = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    write_private_bytes(
+        path,
+        COMPRESSED_JSON_MAGIC + bytes([codec.codec_id]) + codec.compress(json_bytes),
+        "private data",
+    )
+
+
+def read_private_gzip_json(path: Path, description: str) -> Any:
+    """Read JSON written by ``write_private_gzip_json`` or ``write_private_json``."""
+    data = read_private_bytes(path, description)
+    if data is None:
+        return None
+    try:
+        if data.startswith(COMPRESSED_JSON_MAGIC):
+            offset = len(COMPRESSED_JSON_MAGIC)
+            codec = cache_codec_for_id(data[offset])
+            json_bytes = codec.decompress(data[offset + 1 :])
+        else:
+            json_bytes = gzip.decompress(data)
+        return json.loads(json_bytes.decode("utf-8"))
+    except (OSError, IndexError, ValueError):
+        _warn_invalid_private_file(path.expanduser(), description)
         return None
 
 
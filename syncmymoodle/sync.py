@@ -2,6 +2,8 @@ import hashlib
 import json
 import logging
 import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import PurePosixPath
 from typing import Any
@@ -9,8 +11,8 @@ from typing import Any
 from syncmymoodle import course_cache, filters, links, pathing, sync_handlers
 from syncmymoodle import moodle as moodle_api
 from syncmymoodle.context import SyncContext
-from syncmymoodle.http_utils import canonical_remote_url, redact_url_secrets
-from syncmymoodle.node import DownloadKind, Node, NodeKind
+from syncmymoodle.http_utils import redact_url_secrets
+from syncmymoodle.node import Node, NodeKind
 from syncmymoodle.outcomes import RemovedContent
 from syncmymoodle.pathing import sanitized_node_path_parts
 
@@ -65,31 +67,13 @@ def _course_inventory_scope(ctx: SyncContext, course_id: int) -> str:
     return hashlib.sha256(encoded).hexdigest()
 
 
-def _remote_content_identity(node: Node) -> tuple[str, str] | None:
-    """Return a stable comparison key and a safe user-visible identity."""
-    if not node.url:
-        return None
-    youtube_id = links.youtube_video_id_from_node(node)
-    if youtube_id is not None:
-        identity = f"youtube:{youtube_id}"
-        return identity, identity
-    identity_url, display_url = canonical_remote_url(node.url)
-    if node.download_kind is DownloadKind.OPENCAST:
-        identity = f"opencast:{node.id}:{identity_url.partition('?')[0]}"
-        return identity, identity
-    if node.download_kind in {DownloadKind.EMEDIA, DownloadKind.QUIZ} and node.id:
-        identity = f"{node.download_kind}:{node.id}"
-        return identity, identity
-    return f"{node.download_kind}:{identity_url}", display_url
-
-
-def _remote_content_nodes(root: Node) -> dict[str, list[tuple[Node, str]]]:
+def _remote_content_nodes(roots: Iterable[Node]) -> dict[str, list[tuple[Node, str]]]:
     nodes: dict[str, list[tuple[Node, str]]] = {}
-    pending = [root]
+    pending = list(roots)
     while pending:
         node = pending.pop()
         pending.extend(node.children)
-        identity = _remote_content_identity(node)
+        identity = course_cache.remote_content_identity(node)
         if identity is not None:
             key, display = identity
             nodes.setdefault(key, []).append((node, display))
@@ -103,11 +87,11 @@ def _old_course_relative_path(node: Node) -> str:
 
 def _removed_course_content(
     course: _PreparedCourse,
-    old_course_root: Node,
+    old_sections: list[Node],
 ) -> set[RemovedContent]:
     """Find unambiguous remote identities absent from the current course tree."""
-    old_nodes = _remote_content_nodes(old_course_root)
-    current_identities = _remote_content_nodes(course.node)
+    old_nodes = _remote_content_nodes(old_sections)
+    current_identities = _remote_content_nodes([course.node])
     course_label = f"{course.name} ({course.course_id})"
     return {
         RemovedContent(course_label, _old_course_relative_path(node), display)
@@ -124,7 +108,7 @@ def _record_removed_content(
     for course in courses:
         if course.course_id in ctx.incomplete_course_ids:
             continue
-        old_course_root = course_cache.comparable_course_cache_root(
+        old_sections = course_cache.comparable_course_cache_sections(
             ctx,
             course.node,
             _course_inventory_scope(ctx, course.course_id),
@@ -132,8 +116,8 @@ def _record_removed_content(
         )
         if course.course_id in ctx.inventory_filtered_course_ids:
             continue
-        if old_course_root is not None:
-            ctx.removed_content.update(_removed_course_content(course, old_course_root))
+        if old_sections:
+            ctx.removed_content.update(_removed_course_content(course, old_sections))
 
 
 @dataclass
@@ -268,7 +252,7 @@ def _course_spec_from_summary(
         logger.error(
             "Ignoring malformed Moodle course summary at position %s", position
         )
-        ctx.stats.failed += 1
+        ctx.record_failure()
         return None
     course_id = _positive_int(value.get("id"))
     if course_id is None:
@@ -276,7 +260,7 @@ def _course_spec_from_summary(
             "Ignoring Moodle course summary with an invalid id at position %s",
             position,
         )
-        ctx.stats.failed += 1
+        ctx.record_failure()
         return None
 
     shortname = value.get("shortname")
@@ -289,7 +273,7 @@ def _course_spec_from_summary(
             "Ignoring malformed Moodle course summary for course %s",
             course_id,
         )
-        ctx.stats.failed += 1
+        ctx.record_failure()
         return None
     safe_shortname = shortname if isinstance(shortname, str) else ""
     safe_idnumber = idnumber if isinstance(idnumber, str) else ""
@@ -312,7 +296,7 @@ def _locally_selected_courses(ctx: SyncContext) -> list[_CourseSpec]:
     )
     if not isinstance(summaries, list):
         logger.error("Moodle returned a malformed course summary inventory")
-        ctx.stats.failed += 1
+        ctx.record_failure()
         return courses
     for position, summary in enumerate(summaries, start=1):
         spec = _course_spec_from_summary(ctx, summary, position)
@@ -446,10 +430,12 @@ def _assignments_by_cmid(
 ) -> dict[int, dict[str, Any]]:
     assignments = None
     if ctx.config.module_assignment and "assign" in module_names:
-        account = ctx.require_moodle_account()
-        assignments = moodle_api.get_assignment(
-            ctx.require_session(), account.wstoken, course.course_id
-        )
+        assignments = ctx.assignment_inventory_cache.pop(course.course_id, None)
+        if assignments is None:
+            account = ctx.require_moodle_account()
+            assignments = moodle_api.get_assignment(
+                ctx.require_session(), account.wstoken, course.course_id
+            )
         if assignments is None:
             ctx.record_course_failure(course.node.id)
             return {}
@@ -495,10 +481,12 @@ def _folders_by_coursemodule(
         and ctx.config.follow_links
         and "folder" in module_names
     ):
-        account = ctx.require_moodle_account()
-        folders = moodle_api.get_folders_by_courses(
-            ctx.require_session(), account.wstoken, course.course_id
-        )
+        folders = ctx.folder_inventory_cache.pop(course.course_id, None)
+        if folders is None:
+            account = ctx.require_moodle_account()
+            folders = moodle_api.get_folders_by_courses(
+                ctx.require_session(), account.wstoken, course.course_id
+            )
         if folders is None:
             ctx.record_course_failure(course.node.id)
             return {}
@@ -576,21 +564,121 @@ def _sync_section(
         run.update_progress(section_index)
 
 
+def _prefetched_course_contents(
+    ctx: SyncContext, courses: list[_PreparedCourse]
+) -> dict[int, list[Any]]:
+    """Fetch course inventories in batches when Moodle supports it."""
+    if len(courses) < 2 or moodle_api.MOODLE_BATCH_FUNCTION not in ctx.moodle_functions:
+        return {}
+    account = ctx.require_moodle_account()
+    return moodle_api.get_courses_contents(
+        ctx.require_session(),
+        account.wstoken,
+        [course.course_id for course in courses],
+        logger,
+    )
+
+
+def _prefetch_module_inventories(
+    ctx: SyncContext, contents: dict[int, list[Any]]
+) -> None:
+    """Fill the per-course module inventory caches in bulk requests.
+
+    Only courses with a prefetched inventory are covered, and only for module
+    types they contain. Anything the bulk requests could not supply is fetched
+    per course later, so failures are still reported for that course alone.
+    """
+    config = ctx.config
+    course_ids_by_kind: dict[str, list[int]] = {}
+    for course_id, course_sections in contents.items():
+        sections, _complete = _normalized_course_sections(course_sections)
+        for kind in {
+            module["modname"] for section in sections for module in section["modules"]
+        }:
+            course_ids_by_kind.setdefault(kind, []).append(course_id)
+    if not course_ids_by_kind:
+        return
+
+    session = ctx.require_session()
+    wstoken = ctx.require_moodle_account().wstoken
+    if config.module_assignment and (course_ids := course_ids_by_kind.get("assign")):
+        ctx.assignment_inventory_cache.update(
+            moodle_api.get_assignments_by_courses(session, wstoken, course_ids, logger)
+        )
+    if (
+        config.module_folder
+        and config.follow_links
+        and (course_ids := course_ids_by_kind.get("folder"))
+    ):
+        ctx.folder_inventory_cache.update(
+            moodle_api.get_module_instances_by_courses(
+                session,
+                wstoken,
+                "mod_folder_get_folders_by_courses",
+                "folders",
+                course_ids,
+                logger,
+            )
+        )
+
+    instance_inventories = (
+        (
+            "quiz",
+            config.quiz_mode != "off",
+            "mod_quiz_get_quizzes_by_courses",
+            "quizzes",
+            ctx.quiz_instance_cache,
+        ),
+        (
+            "lti",
+            config.link_source_enabled("opencast"),
+            "mod_lti_get_ltis_by_courses",
+            "ltis",
+            ctx.lti_instance_cache,
+        ),
+        (
+            "h5pactivity",
+            config.follow_links,
+            "mod_h5pactivity_get_h5pactivities_by_courses",
+            "h5pactivities",
+            ctx.h5p_activity_cache,
+        ),
+    )
+    for kind, enabled, function, response_key, cache in instance_inventories:
+        course_ids = course_ids_by_kind.get(kind)
+        if not enabled or not course_ids:
+            continue
+        inventories = moodle_api.get_module_instances_by_courses(
+            session, wstoken, function, response_key, course_ids, logger
+        )
+        for course_id, items in inventories.items():
+            # Malformed inventories stay uncached so the per-course query
+            # reports them against the module that needs them.
+            instances = sync_handlers.index_module_instances(items)
+            if instances is not None:
+                cache[course_id] = instances
+
+
 def _sync_course(
     ctx: SyncContext,
-    root_node: Node,
     course: _PreparedCourse,
-    course_index: int,
-) -> None:
-    account = ctx.require_moodle_account()
-    course_sections = moodle_api.get_course(
-        ctx.require_session(), account.wstoken, course.course_id
-    )
+    course_sections: list[Any] | None = None,
+) -> bool:
+    """Build the subtree below ``course.node``.
+
+    ``course_sections`` is a prefetched inventory; without one the course is
+    queried on its own. Returns False when Moodle supplied no inventory and the
+    course node should be dropped from the tree. Only ``course.node`` is
+    modified, so independent courses can be built on separate threads.
+    """
+    if course_sections is None:
+        account = ctx.require_moodle_account()
+        course_sections = moodle_api.get_course(
+            ctx.require_session(), account.wstoken, course.course_id
+        )
     if course_sections is None:
         ctx.record_course_failure(course.node.id)
-        _remove_course_node(root_node, course.node)
-        ctx.output.sync_progress.finish_course(course_index)
-        return
+        return False
 
     course_sections, complete_inventory = _normalized_course_sections(course_sections)
     section_total = len(course_sections)
@@ -607,23 +695,90 @@ def _sync_course(
     run.course_updates = _course_updates(ctx, course, modules)
     run.assignments_by_cmid = _assignments_by_cmid(ctx, course, module_names)
     run.folders_by_coursemodule = _folders_by_coursemodule(ctx, course, module_names)
-    for section_index, section in enumerate(course_sections, start=1):
-        _sync_section(run, section, section_index)
-    ctx.output.sync_progress.finish_course(course_index)
+    _prefetch_linked_resources(ctx, course, course_sections)
+    try:
+        for section_index, section in enumerate(course_sections, start=1):
+            _sync_section(run, section, section_index)
+    finally:
+        ctx.prefetched_linked_resources.pop(str(course.course_id), None)
+    return True
 
 
-def _sync_course_safely(
+def _prefetch_linked_resources(
     ctx: SyncContext,
-    root_node: Node,
     course: _PreparedCourse,
-    course_index: int,
+    course_sections: list[dict[str, Any]],
 ) -> None:
+    """Check the generic links of the modules the walk will visit up front."""
+    if ctx.config.link_workers < 2:
+        return
+    course_id = course.course_id
+    modules = [
+        module
+        for section in course_sections
+        if not filters.should_skip_section(ctx, section, course_id)
+        for module in section["modules"]
+        if not filters.should_skip_module(ctx, module, course_id)
+    ]
+    links.prefetch_linked_resources(
+        ctx,
+        sync_handlers.linked_resource_urls(ctx, modules, course_id),
+        course_id,
+        logger,
+    )
+
+
+def _sync_course_safely(
+    ctx: SyncContext,
+    course: _PreparedCourse,
+    course_sections: list[Any] | None = None,
+) -> bool:
     try:
-        _sync_course(ctx, root_node, course, course_index)
+        return _sync_course(ctx, course, course_sections)
     except Exception:
         ctx.record_course_failure(course.node.id)
         logger.exception("Failed to process Moodle course %s", course.name)
-        ctx.output.sync_progress.finish_course(course_index)
+        return True
+
+
+def _sync_courses_concurrently(
+    ctx: SyncContext,
+    root_node: Node,
+    courses: list[_PreparedCourse],
+    contents: dict[int, list[Any]],
+    workers: int,
+) -> None:
+    """Scan courses on a bounded worker pool.
+
+    Each worker fills only its own course node. Failed inventories are pruned
+    and statistics recorded on the calling thread as courses complete.
+    """
+    progress = ctx.output.sync_progress
+
+    def scan(course_index: int, course: _PreparedCourse) -> bool:
+        progress.start_course(course_index, course.name)
+        return _sync_course_safely(ctx, course, contents.pop(course.course_id, None))
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(workers, len(courses)),
+        thread_name_prefix="syncmymoodle-course",
+    )
+    try:
+        futures = {
+            executor.submit(scan, course_index, course): course
+            for course_index, course in enumerate(courses, start=1)
+        }
+        for completed, future in enumerate(as_completed(futures), start=1):
+            course = futures[future]
+            with ctx.course_state_lock:
+                ctx.stats.courses += 1
+            if not future.result():
+                _remove_course_node(root_node, course.node)
+            progress.complete_concurrent_course(completed, course.name)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
 
 
 def sync(ctx: SyncContext) -> None:
@@ -636,10 +791,21 @@ def sync(ctx: SyncContext) -> None:
     prepared_courses = _prepare_course_nodes(root_node, courses)
     pathing.resolve_node_path_clashes(root_node)
     progress = ctx.output.sync_progress
-    progress.begin_courses(len(prepared_courses))
-    for course_index, course in enumerate(prepared_courses, start=1):
-        ctx.stats.courses += 1
-        progress.start_course(course_index, course.name)
-        _sync_course_safely(ctx, root_node, course, course_index)
+    workers = ctx.config.course_workers
+    concurrent = workers > 1 and len(prepared_courses) > 1
+    contents = _prefetched_course_contents(ctx, prepared_courses)
+    _prefetch_module_inventories(ctx, contents)
+    progress.begin_courses(len(prepared_courses), concurrent=concurrent)
+    if concurrent:
+        _sync_courses_concurrently(ctx, root_node, prepared_courses, contents, workers)
+    else:
+        for course_index, course in enumerate(prepared_courses, start=1):
+            with ctx.course_state_lock:
+                ctx.stats.courses += 1
+            progress.start_course(course_index, course.name)
+            course_sections = contents.pop(course.course_id, None)
+            if not _sync_course_safely(ctx, course, course_sections):
+                _remove_course_node(root_node, course.node)
+            progress.finish_course(course_index)
     pathing.resolve_node_path_clashes(root_node)
     _record_removed_content(ctx, prepared_courses)
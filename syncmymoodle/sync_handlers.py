@@ -6,6 +6,7 @@ import re
 import tempfile
 import urllib.parse
 import zipfile
+from collections.abc import Iterable, Iterator
 from contextlib import closing
 from dataclasses import dataclass
 from typing import Any, Callable, cast
@@ -399,6 +400,24 @@ def _read_h5p_content(
         return None
 
 
+def index_module_instances(
+    items: list[dict[str, Any]],
+) -> dict[int, dict[str, Any]] | None:
+    """Index a module-instance inventory by course module, or None if malformed."""
+    instances: dict[int, dict[str, Any]] = {}
+    for item in items:
+        course_module = item.get("coursemodule")
+        if (
+            not isinstance(course_module, int)
+            or isinstance(course_module, bool)
+            or course_module <= 0
+            or course_module in instances
+        ):
+            return None
+        instances[course_module] = item
+    return instances
+
+
 def module_instance(
     module_context: ModuleContext,
     module: dict[str, Any],
@@ -411,25 +430,10 @@ def module_instance(
     if course_id not in cache:
         account = ctx.require_moodle_account()
         items = fetch(ctx.require_session(), account.wstoken, course_id)
-        if items is None:
-            cache[course_id] = None
+        instances = index_module_instances(items) if items is not None else None
+        cache[course_id] = instances
+        if instances is None:
             module_context.fail()
-        else:
-            instances: dict[int, dict[str, Any]] = {}
-            for item in items:
-                course_module = item.get("coursemodule")
-                if (
-                    not isinstance(course_module, int)
-                    or isinstance(course_module, bool)
-                    or course_module <= 0
-                    or course_module in instances
-                ):
-                    cache[course_id] = None
-                    module_context.fail()
-                    break
-                instances[course_module] = item
-            else:
-                cache[course_id] = instances
     course_instances = cache[course_id]
     return course_instances.get(module_id) if course_instances is not None else None
 
@@ -666,23 +670,14 @@ def handle_resource_like_module(
     contents = _resource_like_contents(module_context, module)
     if contents is None:
         return
-    for c in contents:
-        file_url = c["fileurl"]
-        assert isinstance(file_url, str)
-        if filters.should_skip_url(
-            ctx,
-            file_url,
-            "resource link",
-            course_id=course_id,
-        ):
-            continue
-        if moodle_files.is_direct_moodle_file_content(module, c):
+    for c, direct in _resource_link_contents(ctx, module, contents, course_id):
+        if direct:
             moodle_files.add_moodle_content_file_node(section_node, c)
-        elif not (module["modname"] == "page" and c.get("filename") == "index.html"):
+        else:
             module_context.status("checking linked resource")
             links_api.scan_for_links(
                 ctx,
-                file_url,
+                c["fileurl"],
                 section_node,
                 course_id,
                 single=True,
@@ -690,6 +685,64 @@ def handle_resource_like_module(
             )
 
 
+def _resource_link_contents(
+    ctx: SyncContext,
+    module: dict[str, Any],
+    contents: Iterable[dict[str, Any]],
+    course_id: Any,
+) -> Iterator[tuple[dict[str, Any], bool]]:
+    """Yield the contents of a resource-like module that pass the URL filters.
+
+    Each item comes with whether it is a direct Moodle file. A page's own
+    rendered ``index.html`` is left out.
+    """
+    for c in contents:
+        if filters.should_skip_url(
+            ctx,
+            c["fileurl"],
+            "resource link",
+            course_id=course_id,
+        ):
+            continue
+        if moodle_files.is_direct_moodle_file_content(module, c):
+            yield c, True
+        elif not (module["modname"] == "page" and c.get("filename") == "index.html"):
+            yield c, False
+
+
+def linked_resource_urls(
+    ctx: SyncContext,
+    modules: Iterable[dict[str, Any]],
+    course_id: Any,
+) -> list[str]:
+    """Return the generic links ``handle_resource_like_module`` will resolve.
+
+    The links have passed the URL filters. Malformed inventories are skipped
+    here and reported by the handler.
+    """
+    urls: list[str] = []
+    for module in modules:
+        modname = module.get("modname")
+        if not isinstance(modname, str) or handle_resource_like_module not in (
+            MODULE_HANDLERS.get(modname, ())
+        ):
+            continue
+        if modname == "resource" and not ctx.config.module_resource:
+            continue
+        contents = module.get("contents")
+        if not isinstance(contents, list) or not all(
+            isinstance(c, dict) and isinstance(c.get("fileurl"), str) and c["fileurl"]
+            for c in contents
+        ):
+            continue
+        urls.extend(
+            c["fileurl"]
+            for c, direct in _resource_link_contents(ctx, module, contents, course_id)
+            if not direct
+        )
+    return urls
+
+
 def handle_folder_module(
     module_context: ModuleContext,
     module: dict[str, Any],
@@ -820,6 +873,7 @@ def _fetch_page(
                 "redirected page link",
                 course_id=module_context.course_id,
             ),
+            retry=module_context.ctx.http_retries,
             timeout=HTTP_TIMEOUT_SECONDS,
         )
     except filters.FilteredRequestError:
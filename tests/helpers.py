@@ -19,6 +19,7 @@ SNAPSHOTS = Path(__file__).parent / "snapshots"
 
 TEST_CONFIG_OVERRIDES = {
     "modules.quiz": "off",
+    "network.retries": 0,
 }
 
 
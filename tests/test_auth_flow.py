@@ -1360,7 +1360,9 @@ def test_normal_sync_uses_valid_stored_token_without_sso(monkeypatch, tmp_path):
         lambda value: valid(value),
     )
 
-    def create_token_session(value, user_private_access_key):
+    def create_token_session(
+        value, user_private_access_key, latency=None, pool_size=None
+    ):
         assert value is stored
         assert user_private_access_key == "download-key"
         return token_session
@@ -1528,7 +1530,9 @@ def test_reusable_provider_reauthenticates_once_and_stores_only_valid_replacemen
     monkeypatch.setattr(
         cli.moodle_api,
         "create_token_session",
-        lambda value, user_private_access_key: SimpleNamespace(),
+        lambda value, user_private_access_key, latency=None, pool_size=None: (
+            SimpleNamespace()
+        ),
     )
     monkeypatch.setattr(cli.sync, "sync", lambda value: None)
     monkeypatch.setattr(cli.downloader, "download_all_files", lambda value, log: None)
@@ -1549,7 +1553,7 @@ def test_browser_bootstrap_is_attempted_at_most_once_per_run(monkeypatch):
         lambda path: cli.rwth.SessionStatus(cli.rwth.SessionStatusKind.EXPIRED),
     )
 
-    def rate_limited(value):
+    def rate_limited(value, latency=None, pool_size=None):
         attempts.append(value)
         raise cli.moodle_api.BrowserBootstrapError(
             "Moodle browser auto-login is rate-limited; retry in up to 6 minutes"
@@ -1587,7 +1591,7 @@ def test_cached_browser_session_for_another_account_is_replaced(monkeypatch):
     monkeypatch.setattr(
         cli.rwth,
         "load_cached_session",
-        lambda path: (cached_session, "cached-session-key"),
+        lambda path, pool_size: (cached_session, "cached-session-key"),
     )
     monkeypatch.setattr(
         cli.moodle_api,
@@ -1595,7 +1599,7 @@ def test_cached_browser_session_for_another_account_is_replaced(monkeypatch):
         lambda session: 456,
     )
 
-    def create_browser_session(value):
+    def create_browser_session(value, latency=None, pool_size=None):
         replacements.append(value)
         return replacement_session, "replacement-session-key"
 
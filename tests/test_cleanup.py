@@ -4,7 +4,13 @@ import pytest
 
 import syncmymoodle.cli as cli
 from syncmymoodle import cleanup, pathing
-from syncmymoodle.constants import COURSE_CACHE_FILENAME
+from syncmymoodle.constants import (
+    CACHE_DATABASE_FILENAME,
+    COURSE_CACHE_DIRECTORY,
+    COURSE_CACHE_FILENAME,
+    DIGEST_INDEX_FILENAME,
+    LINKED_RESOURCE_INDEX_FILENAME,
+)
 from syncmymoodle.storage import sync_run_lock
 
 
@@ -98,6 +104,27 @@ def test_iter_course_caches_finds_only_cache_files(tmp_path):
     assert cleanup.iter_course_caches(tmp_path) == [cache]
 
 
+def test_iter_course_caches_includes_the_account_indexes(tmp_path):
+    cache = write(tmp_path / "course" / COURSE_CACHE_FILENAME, b"{}")
+    digests = write(
+        tmp_path / COURSE_CACHE_DIRECTORY / DIGEST_INDEX_FILENAME, b"digests"
+    )
+    linked = write(
+        tmp_path / COURSE_CACHE_DIRECTORY / LINKED_RESOURCE_INDEX_FILENAME, b"links"
+    )
+
+    assert cleanup.iter_course_caches(tmp_path) == sorted([cache, digests, linked])
+
+
+def test_iter_course_caches_includes_the_cache_database(tmp_path):
+    database = write(
+        tmp_path / COURSE_CACHE_DIRECTORY / CACHE_DATABASE_FILENAME, b"sqlite"
+    )
+    journal = write(database.with_name(f"{database.name}-journal"), b"journal")
+
+    assert cleanup.iter_course_caches(tmp_path) == [database, journal]
+
+
 def test_iter_course_caches_refuses_a_linked_internal_directory(tmp_path):
     root = tmp_path / "root"
     outside = tmp_path / "outside"
@@ -53,10 +53,20 @@ def test_config_options_record_cli_overrides():
         "skip-courses": "courses.skip",
         "exclude-course-roles": "courses.exclude_roles",
         "semesters": "courses.semesters",
+        "course-workers": "courses.workers",
         "course-prefix-handling": "courses.prefix_handling",
         "update-files": "downloads.update_files",
         "conflict-handling": "downloads.conflict_handling",
         "dry-run": "downloads.dry_run",
+        "download-workers": "downloads.workers",
+        "download-workers-per-origin": "downloads.workers_per_origin",
+        "cache-compression": "caches.compression",
+        "cache-compression-level": "caches.compression_level",
+        "cache-store": "caches.store",
+        "network-retries": "network.retries",
+        "link-workers": "links.workers",
+        "network-timeout-floor": "network.timeout_floor",
+        "network-timeout-ceiling": "network.timeout_ceiling",
         "exclude-filetypes": "filters.exclude_filetypes",
         "max-file-size": "filters.max_file_size",
         "min-file-size": "filters.min_file_size",
@@ -345,6 +355,36 @@ def test_plain_run_without_config_points_to_setup(tmp_path, monkeypatch, capsys)
     assert "syncmymoodle setup" in capsys.readouterr().err
 
 
+def test_download_workers_parses_positive_counts():
+    assert Config.from_dict({}).download_workers == 1
+    assert Config.from_dict({"downloads": {"workers": 4}}).download_workers == 4
+    assert Config.from_dict({"downloads": {"workers": " 8 "}}).download_workers == 8
+    assert Config.from_dict({"downloads": {"workers": 0}}).download_workers == 1
+    for invalid in (-1, "many", 2.5, True):
+        with pytest.raises(
+            ConfigValidationError,
+            match="downloads.workers must be a positive integer",
+        ):
+            validate_config({"downloads": {"workers": invalid}})
+
+
+def test_cache_compression_level_is_checked_against_the_codec():
+    cfg = Config.from_dict({"caches": {"compression": "zstd", "compression_level": 19}})
+    assert (cfg.cache_compression, cfg.cache_compression_level) == ("zstd", 19)
+    assert (
+        Config.from_dict({"caches": {"compression_level": 0}}).cache_compression_level
+        is None
+    )
+    validate_config({"caches": {"compression_level": 1}})
+    with pytest.raises(
+        ConfigValidationError,
+        match="caches.compression_level must be between 1 and 9 for zlib",
+    ):
+        validate_config({"caches": {"compression_level": 19}})
+    with pytest.raises(ConfigValidationError, match="caches.compression must be one"):
+        validate_config({"caches": {"compression": "brotli"}})
+
+
 def test_max_file_size_parses_sizes():
     assert (
         Config.from_dict({"filters": {"max_file_size": "500M"}}).max_file_size
@@ -403,6 +443,14 @@ def test_config_validation_rejects_inverted_size_limits():
         validate_config({"filters": {"min_file_size": "2M", "max_file_size": "1M"}})
 
 
+def test_config_validation_rejects_timeout_floor_above_default_ceiling():
+    with pytest.raises(
+        ConfigValidationError,
+        match="network.timeout_floor must not exceed network.timeout_ceiling",
+    ):
+        validate_config({"network": {"timeout_floor": 300}})
+
+
 def test_config_validation_rejects_active_managed_file_collisions(tmp_path):
     shared = str(tmp_path / "shared")
     conflicting_configs = [
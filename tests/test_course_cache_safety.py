@@ -1,11 +1,27 @@
+import os
+import stat
+
 import pytest
 
-from syncmymoodle import course_cache, moodle, opencast, pathing, sync, sync_handlers
-from syncmymoodle.constants import COURSE_CACHE_FILENAME, MOODLE_URL
+from syncmymoodle import (
+    course_cache,
+    moodle,
+    opencast,
+    pathing,
+    storage,
+    sync,
+    sync_handlers,
+)
+from syncmymoodle.constants import (
+    CACHE_DATABASE_FILENAME,
+    COURSE_CACHE_DIRECTORY,
+    COURSE_CACHE_FILENAME,
+    MOODLE_URL,
+)
 from syncmymoodle.context import MoodleAccount
 from syncmymoodle.moodle_tokens import MoodleTokens
-from syncmymoodle.node import DownloadKind, Node
-from syncmymoodle.storage import read_private_gzip_json, write_private_gzip_json
+from syncmymoodle.node import DownloadKind, Node, match_equivalent_child
+from syncmymoodle.storage import write_private_gzip_json
 
 from .helpers import FakeSession, make_context, node_path
 
@@ -102,8 +118,9 @@ def test_malformed_nested_course_cache_is_ignored(tmp_path, caplog):
     writer.root_node, course_node = course_tree()
     course_cache.cache_root_node(writer)
     cache_path = course_cache.course_cache_path(writer, course_node)
-    payload = read_private_gzip_json(cache_path, "course cache")
+    payload = course_cache.read_course_cache_payload(cache_path)
     assert isinstance(payload, dict)
+    payload["format"] = course_cache.JSON_COURSE_CACHE_FORMAT
     payload["course"]["children"] = 1
     write_private_gzip_json(cache_path, payload)
 
@@ -113,6 +130,353 @@ def test_malformed_nested_course_cache_is_ignored(tmp_path, caplog):
     assert "Ignoring malformed course cache" in caplog.text
 
 
+def test_json_course_cache_is_read_and_rewritten_in_binary_format(tmp_path):
+    config = {"paths.sync_directory": str(tmp_path)}
+    writer = make_context(config)
+    writer.root_node, course_node = course_tree()
+    course_cache.cache_root_node(writer)
+    cache_path = course_cache.course_cache_path(writer, course_node)
+    payload = course_cache.read_course_cache_payload(cache_path)
+    assert isinstance(payload, dict)
+    payload["format"] = course_cache.JSON_COURSE_CACHE_FORMAT
+    write_private_gzip_json(cache_path, payload)
+
+    reader = make_context(config)
+    reader.root_node, reader_course = course_tree()
+    cached_root = course_cache.get_course_cache_root(reader, reader_course)
+    assert cached_root is not None
+    assert cached_root.children[0].children[0].is_verified
+
+    course_cache.cache_root_node(reader)
+    assert cache_path.read_bytes().startswith(course_cache.COURSE_CACHE_MAGIC)
+    rewritten = course_cache.read_course_cache_payload(cache_path)
+    assert rewritten is not None
+    assert rewritten["format"] == course_cache.COURSE_CACHE_FORMAT
+    assert rewritten["course"] == payload["course"]
+
+
+def test_binary_course_cache_decodes_only_sections_on_the_lookup_path(tmp_path):
+    config = {"paths.sync_directory": str(tmp_path)}
+    writer = make_context(config)
+    writer.root_node, course_node = course_tree()
+    other_section = course_node.add_child("Week 2", 402, "Section")
+    other_section.add_child(
+        "notes.pdf", "notes-id", "Linked file", url="https://example.test/notes"
+    )
+    course_cache.cache_root_node(writer)
+
+    reader = make_context(config)
+    reader.root_node, reader_course = course_tree()
+    file_node = reader_course.children[0].children[0]
+    old_node = course_cache.get_old_node_for(reader, file_node)
+
+    assert old_node is not None
+    assert old_node.etag == '"v1"'
+    state = reader.course_cache_states[reader_course]
+    assert state.cached_tree is not None
+    cached_sections = state.cached_tree.root.children
+    assert [section.name for section in cached_sections] == ["General", "Week 2"]
+    assert cached_sections[1].children == []
+
+    cached_root = state.course_root
+    assert cached_root is not None
+    assert [child.name for child in cached_root.children[1].children] == ["notes.pdf"]
+
+
+def test_corrupt_binary_course_cache_section_is_ignored(tmp_path, caplog):
+    config = {"paths.sync_directory": str(tmp_path)}
+    writer = make_context(config)
+    writer.root_node, course_node = course_tree()
+    course_cache.cache_root_node(writer)
+    cache_path = course_cache.course_cache_path(writer, course_node)
+    data = cache_path.read_bytes()
+    cache_path.write_bytes(data[:-4] + b"oops")
+
+    reader = make_context(config)
+    reader.root_node, reader_course = course_tree()
+    file_node = reader_course.children[0].children[0]
+
+    assert course_cache.get_old_node_for(reader, file_node) is None
+    assert course_cache.get_course_cache_root(reader, reader_course) is None
+    assert "Ignoring malformed course cache" in caplog.text
+
+
+def test_unchanged_course_cache_is_not_rewritten(tmp_path, monkeypatch):
+    config = {"paths.sync_directory": str(tmp_path)}
+    writer = make_context(config)
+    writer.root_node, course_node = course_tree()
+    course_cache.cache_root_node(writer)
+    cache_path = course_cache.course_cache_path(writer, course_node)
+    cached_bytes = cache_path.read_bytes()
+
+    writes = []
+    write = course_cache.write_private_chunks
+
+    def recording_write(path, chunks, description):
+        writes.append(path)
+        write(path, chunks, description)
+
+    monkeypatch.setattr(course_cache, "write_private_chunks", recording_write)
+    reader = make_context(config)
+    reader.root_node, reader_course = course_tree()
+    previous_tree = course_cache.get_course_cache_root(reader, reader_course)
+    compressions = []
+    compressor = storage.CacheCodec.compressor
+    compress = storage.CacheCodec.compress
+
+    def recording_compressor(codec):
+        compressions.append("compressor")
+        return compressor(codec)
+
+    def recording_compress(codec, data):
+        compressions.append("compress")
+        return compress(codec, data)
+
+    monkeypatch.setattr(storage.CacheCodec, "compressor", recording_compressor)
+    monkeypatch.setattr(storage.CacheCodec, "compress", recording_compress)
+    course_cache.cache_root_node(reader)
+
+    assert writes == []
+    assert compressions == []
+    assert cache_path.read_bytes() == cached_bytes
+    assert course_cache.get_course_cache_root(reader, reader_course) is previous_tree
+
+    reader_course.children[0].add_child(
+        "notes.pdf", "notes-id", "Linked file", url="https://example.test/notes"
+    )
+    course_cache.cache_root_node(reader)
+
+    assert writes == [cache_path]
+    assert "compressor" in compressions
+    cached_root = course_cache.get_course_cache_root(reader, reader_course)
+    assert cached_root is not None
+    assert [child.name for child in cached_root.children[0].children] == [
+        "slides.pdf",
+        "notes.pdf",
+    ]
+
+
+def test_course_cache_encoder_streams_sections_while_writing():
+    events = []
+
+    def pieces(name):
+        def produce():
+            events.append(f"produce {name}")
+            yield b'[["a"]]'
+
+        return produce
+
+    encoder = course_cache.CourseCacheEncoder()
+    encoder.add_section(["first"], pieces("first"))
+    encoder.add_section(["second"], pieces("second"))
+    encoder.finish({})
+    events.clear()
+
+    for chunk in encoder.chunks():
+        if chunk:
+            events.append("write")
+
+    assert events.index("produce second") > events.index("write", 1)
+    assert len(encoder.blocks) == 2
+
+
+def test_unchanged_sections_stay_compressed_and_skip_removal_checks(
+    tmp_path, monkeypatch
+):
+    def two_section_tree():
+        root, course = course_tree()
+        notes = course.add_child("Notes", 402, "Section")
+        notes.add_child(
+            "notes.pdf", "notes-id", "Linked file", url="https://example.test/notes"
+        )
+        return root, course
+
+    config = {"paths.sync_directory": str(tmp_path)}
+    scope = "a" * 64
+    writer = make_context(config)
+    writer.root_node, course_node = two_section_tree()
+    assert (
+        course_cache.comparable_course_cache_sections(writer, course_node, scope)
+        is None
+    )
+    course_cache.cache_root_node(writer)
+
+    reader = make_context(config)
+    reader.root_node, reader_course = two_section_tree()
+    reader_course.children[1].add_child(
+        "extra.pdf", "extra-id", "Linked file", url="https://example.test/extra"
+    )
+    old_sections = course_cache.comparable_course_cache_sections(
+        reader, reader_course, scope
+    )
+
+    assert old_sections is not None
+    assert [section.name for section in old_sections] == ["Notes"]
+    assert [child.name for child in old_sections[0].children] == ["notes.pdf"]
+
+    compressors = []
+    compressor = storage.CacheCodec.compressor
+
+    def recording_compressor(codec):
+        compressors.append(codec)
+        return compressor(codec)
+
+    monkeypatch.setattr(storage.CacheCodec, "compressor", recording_compressor)
+    course_cache.cache_root_node(reader)
+
+    assert len(compressors) == 1
+    cached_root = course_cache.get_course_cache_root(reader, reader_course)
+    assert cached_root is not None
+    assert [
+        [child.name for child in section.children] for section in cached_root.children
+    ] == [["slides.pdf"], ["notes.pdf", "extra.pdf"]]
+
+
+def test_sqlite_store_moves_course_caches_into_one_database(tmp_path, monkeypatch):
+    files_config = {"paths.sync_directory": str(tmp_path)}
+    sqlite_config = {**files_config, "caches.store": "sqlite"}
+    writer = make_context(files_config)
+    writer.root_node, course_node = course_tree()
+    course_cache.cache_root_node(writer)
+    cache_path = course_cache.course_cache_path(writer, course_node)
+    database_path = tmp_path / COURSE_CACHE_DIRECTORY / CACHE_DATABASE_FILENAME
+
+    dry_run = make_context({**sqlite_config, "downloads.dry_run": True})
+    dry_run.root_node, dry_run_course = course_tree()
+    assert course_cache.get_course_cache_root(dry_run, dry_run_course) is not None
+    assert dry_run.course_cache_database() is None
+    assert not database_path.exists()
+
+    migrating = make_context(sqlite_config)
+    migrating.root_node, migrating_course = course_tree()
+    assert course_cache.get_course_cache_root(migrating, migrating_course) is not None
+    course_cache.cache_root_node(migrating)
+    migrating.close_cache_database()
+
+    assert not cache_path.exists()
+    if os.name != "nt":
+        assert stat.S_IMODE(database_path.stat().st_mode) == 0o600
+
+    monkeypatch.setattr(
+        course_cache,
+        "write_private_chunks",
+        lambda *args: pytest.fail("sqlite store wrote a cache file"),
+    )
+    reader = make_context(sqlite_config)
+    reader.root_node, reader_course = course_tree()
+    cached_root = course_cache.get_course_cache_root(reader, reader_course)
+    database = reader.course_cache_database()
+    assert database is not None
+    saves = []
+    monkeypatch.setattr(database, "save", lambda entries: saves.append(list(entries)))
+    course_cache.cache_root_node(reader)
+    reader.close_cache_database()
+
+    assert cached_root is not None
+    assert [child.name for child in cached_root.children[0].children] == ["slides.pdf"]
+    assert saves == []
+
+    monkeypatch.undo()
+    switched_back = make_context(files_config)
+    switched_back.root_node, _ = course_tree()
+    course_cache.cache_root_node(switched_back)
+
+    assert cache_path.is_file()
+    assert not database_path.exists()
+
+
+def test_streamed_course_cache_matches_nested_encoding(tmp_path):
+    context = make_context({"paths.sync_directory": str(tmp_path)})
+    context.root_node, course_node = course_tree()
+    folder = course_node.children[0].add_child("Folder", 501, "Folder")
+    nested = folder.add_child("Nested", "nested-id", "Folder")
+    nested.add_child("deep.pdf", "deep-id", "Folder File", url="https://example.test/d")
+    course_node.add_child("Empty", 402, "Section")
+    course_cache.cache_root_node(context)
+    cache_path = course_cache.course_cache_path(context, course_node)
+
+    payload = course_cache.read_course_cache_payload(cache_path)
+
+    assert payload is not None
+    general, empty = payload["course"]["children"]
+    assert [child["name"] for child in general["children"]] == ["slides.pdf", "Folder"]
+    deep = general["children"][1]["children"][0]["children"][0]
+    assert deep["name"] == "deep.pdf"
+    assert deep["children"] == []
+    assert empty["children"] == []
+    assert course_cache.encode_course_cache(payload) == cache_path.read_bytes()
+
+
+def test_course_cache_records_and_follows_the_configured_codec(tmp_path):
+    fast = {"paths.sync_directory": str(tmp_path), "caches.compression_level": 1}
+    writer = make_context(fast)
+    writer.root_node, course_node = course_tree()
+    course_cache.cache_root_node(writer)
+    cache_path = course_cache.course_cache_path(writer, course_node)
+    fast_bytes = cache_path.read_bytes()
+
+    assert fast_bytes.startswith(course_cache.COURSE_CACHE_MAGIC + bytes([1]))
+    reader = make_context(fast)
+    reader.root_node, reader_course = course_tree()
+    assert (
+        course_cache.get_old_node_for(reader, reader_course.children[0].children[0])
+        is not None
+    )
+    course_cache.cache_root_node(reader)
+    assert cache_path.read_bytes() == fast_bytes
+
+    default = make_context({"paths.sync_directory": str(tmp_path)})
+    default.root_node, default_course = course_tree()
+    course_cache.cache_root_node(default)
+    payload = course_cache.read_course_cache_payload(cache_path)
+    assert payload is not None
+    assert cache_path.read_bytes() == course_cache.encode_course_cache(payload)
+    assert cache_path.read_bytes() != fast_bytes
+
+
+def test_indexed_cache_lookup_matches_sibling_scan():
+    _, course = course_tree()
+    folder = course.children[0].add_child("Folder", 501, "Folder")
+    for index in range(50):
+        folder.add_child(
+            f"file-{index % 10}.pdf",
+            f"file-{index}",
+            "Folder File",
+            url=f"https://example.test/{index}.pdf",
+        )
+    folder.add_child(
+        "Renamed video",
+        "https://www.youtube.com/watch?v=abcdefghijk",
+        "Youtube",
+        url="https://www.youtube.com/watch?v=abcdefghijk",
+        download_kind=DownloadKind.YOUTUBE,
+    )
+    folder.add_child("odd-id.pdf", ["list", "id"], "Folder File")
+    tree = course_cache.CachedCourseTree(course)
+    probes = [
+        Node("file-3.pdf", "file-13", "Folder File", None),
+        Node("file-3.pdf", None, "Folder File", None, url="https://example.test/3.pdf"),
+        Node("file-3.pdf", "missing", "Folder File", None),
+        Node("file-11.pdf", "file-11", "Folder File", None),
+        Node("odd-id.pdf", ["list", "id"], "Folder File", None),
+        Node(
+            "Video",
+            "abcdefghijk",
+            "Youtube",
+            None,
+            url="https://youtu.be/abcdefghijk",
+            download_kind=DownloadKind.YOUTUBE,
+        ),
+    ]
+
+    for probe in probes:
+        expected = course_cache.match_old_cache_child(folder, probe)
+        assert tree.match_child(folder, probe) is expected
+        assert tree.match_child(folder, probe, youtube=False) is (
+            match_equivalent_child(folder, probe)
+        )
+
+
 def test_course_cache_survives_course_rename(tmp_path):
     config = {"paths.sync_directory": str(tmp_path)}
     seeded = make_context(config)
@@ -158,7 +522,7 @@ def test_tagged_v1_course_cache_is_moved_from_renamed_course_directory(tmp_path)
     assert cached_file.is_verified
     assert cached_file.download_kind is DownloadKind.DIRECT
     cache_path = course_cache.course_cache_path(context, renamed_course)
-    migrated = read_private_gzip_json(cache_path, "course cache")
+    migrated = course_cache.read_course_cache_payload(cache_path)
     assert isinstance(migrated, dict)
     assert migrated["format"] == course_cache.COURSE_CACHE_FORMAT
     assert migrated["identity"] == {
@@ -217,8 +581,8 @@ def test_legacy_cache_drops_personal_nodes(tmp_path):
 
     assert cached_root is not None
     assert [child.name for child in cached_root.children[0].children] == ["slides.pdf"]
-    migrated = read_private_gzip_json(
-        course_cache.course_cache_path(context, course), "course cache"
+    migrated = course_cache.read_course_cache_payload(
+        course_cache.course_cache_path(context, course)
     )
     assert isinstance(migrated, dict)
     assert course_cache.MODULE_CACHE_KEY not in migrated
@@ -1,14 +1,18 @@
 import hashlib
+import io
 import logging
 import os
+import threading
 from pathlib import Path
 
 import pytest
 import requests
+import urllib3
 
 from syncmymoodle import (
     course_cache,
     downloader,
+    http_utils,
     links,
     moodle,
     moodle_files,
@@ -17,14 +21,21 @@ from syncmymoodle import (
 )
 from syncmymoodle.constants import (
     COURSE_CACHE_FILENAME,
+    DOWNLOAD_CHUNK_MIN_SIZE,
     YOUTUBE_WATCH_URL,
     YT_DLP_TESTED_VERSION,
 )
 from syncmymoodle.downloader import download_file
-from syncmymoodle.node import DownloadKind, DownloadStatus, Node, RemoteMarkerKind
-from syncmymoodle.outcomes import HANDLED_DOWNLOAD
+from syncmymoodle.node import (
+    DownloadKind,
+    DownloadStatus,
+    Node,
+    RemoteMarkerKind,
+    match_equivalent_child,
+)
+from syncmymoodle.outcomes import HANDLED_DOWNLOAD, UNCHANGED_DOWNLOAD
 from syncmymoodle.output import format_size
-from syncmymoodle.storage import read_private_gzip_json, write_private_gzip_json
+from syncmymoodle.storage import write_private_gzip_json
 
 from .helpers import (
     FakeResponse,
@@ -288,6 +299,55 @@ def test_conflicting_remote_markers_block_timestamp_adoption(tmp_path):
     )
 
 
+def test_node_optional_metadata_is_allocated_on_demand():
+    parent = Node("Section", 1, "Section", None)
+    built_type = " ".join(["File", "[pdf]"])
+    first = parent.add_download_child("a.pdf", 2, built_type, url=URL)
+    second = parent.add_download_child("b.pdf", 3, "File [pdf]", url=URL, etag="1")
+
+    assert not hasattr(first, "__dict__")
+    assert first.type is second.type
+    assert first.stored_artifact_hashes == {}
+    assert first._artifact_hashes is None
+
+    first.artifact_hashes["html"] = "0" * 64
+    clone = first.clone()
+    clone.artifact_hashes["pdf"] = "1" * 64
+    parent.add_download_child("b.pdf", 3, "File [pdf]", url=URL, etag="2")
+
+    assert first.artifact_hashes == {"html": "0" * 64}
+    assert second.has_remote_marker_conflict
+    assert not first.has_remote_marker_conflict
+
+
+def test_child_index_follows_appends_renames_and_removals():
+    parent = Node("Series", 1, "Opencast Series", None)
+    episodes = [
+        parent.add_download_child(f"{index}.mp4", index, "Video", url=f"{URL}/{index}")
+        for index in range(50)
+    ]
+    assert (
+        parent.add_download_child("7.mp4", 7, "Video", url=f"{URL}/7") is (episodes[7])
+    )
+    late = Node("late.mp4", 50, "Video", parent, url=f"{URL}/50")
+    parent.children.append(late)
+    assert match_equivalent_child(parent, Node("late.mp4", 50, "Video", None)) is late
+
+    episodes[3].name = "renamed.mp4"
+    parent.children.remove(episodes[4])
+    parent.children.append(Node("4.mp4", 4, "Video", parent, url=f"{URL}/other"))
+
+    assert (
+        parent.add_download_child("renamed.mp4", 3, "Video", url=f"{URL}/3")
+        is (episodes[3])
+    )
+    assert parent.add_download_child("4.mp4", 4, "Video", url=f"{URL}/4") not in (
+        episodes
+    )
+    parent.children = parent.children[:10]
+    assert len(parent.indexed_children(lambda node: node.type, "Video")) == 10
+
+
 @pytest.mark.parametrize(
     "timemodified",
     [1710000301, True, -1, "1710000300", 1710000300.0],
@@ -645,6 +705,80 @@ def test_download_streams_chunks_to_disk_and_records_metadata(tmp_path, capsys):
     assert f"Downloaded {download_path} [{file_node.type}]" in output
 
 
+def raw_body_response(body: bytes, headers: dict[str, str]) -> FakeResponse:
+    response = FakeResponse(headers=headers)
+    response.raw = urllib3.HTTPResponse(
+        body=io.BytesIO(body),
+        headers=headers,
+        preload_content=False,
+    )
+    return response
+
+
+def test_response_body_chunks_read_identity_bodies_in_growing_chunks():
+    body = b"%PDF-1.4 " + bytes(7 * DOWNLOAD_CHUNK_MIN_SIZE)
+    response = raw_body_response(body, {"Content-Type": "application/pdf"})
+
+    sizes = []
+    received = bytearray()
+    for chunk in downloader.response_body_chunks(response):
+        sizes.append(len(chunk))
+        received += chunk
+
+    assert received == body
+    assert sizes == [
+        DOWNLOAD_CHUNK_MIN_SIZE,
+        2 * DOWNLOAD_CHUNK_MIN_SIZE,
+        4 * DOWNLOAD_CHUNK_MIN_SIZE,
+        len(body) - 7 * DOWNLOAD_CHUNK_MIN_SIZE,
+    ]
+
+
+def test_response_body_chunks_report_truncated_bodies_like_iter_content():
+    response = raw_body_response(
+        b"%PDF-1.4 short",
+        {"Content-Type": "application/pdf", "Content-Length": "100"},
+    )
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        b"".join(downloader.response_body_chunks(response))
+
+
+def test_download_streams_raw_identity_body_to_disk(tmp_path):
+    syncer, file_node = make_run_syncer(
+        {"paths.sync_directory": str(tmp_path)}, timemodified=1710000500
+    )
+    body = b"%PDF-1.4 " + os.urandom(3 * DOWNLOAD_CHUNK_MIN_SIZE)
+    syncer.session.add(
+        "GET",
+        URL,
+        raw_body_response(body, {"Content-Type": "application/pdf"}),
+    )
+
+    outcome = download_file(syncer, file_node)
+
+    assert outcome.downloaded == 1
+    assert outcome.transferred_bytes == len(body)
+    assert node_path(syncer, file_node).read_bytes() == body
+
+
+def test_download_sniffs_html_from_raw_identity_body(tmp_path):
+    syncer, file_node = make_run_syncer(
+        {"paths.sync_directory": str(tmp_path)}, timemodified=1710000500
+    )
+    syncer.session.add(
+        "GET",
+        URL,
+        raw_body_response(
+            b"<!DOCTYPE html><title>Login</title>",
+            {"Content-Type": "application/pdf"},
+        ),
+    )
+
+    assert not download_file(syncer, file_node).is_handled
+    assert not node_path(syncer, file_node).exists()
+
+
 def test_download_progress_falls_back_to_known_remote_size(tmp_path, monkeypatch):
     content = b"%PDF-1.4 content"
     syncer, file_node = make_run_syncer(
@@ -972,6 +1106,175 @@ def test_download_walk_reports_progress_for_every_pending_item(monkeypatch, caps
     assert "[2/2] Processing Video: Course/lecture.mp4" in output
 
 
+def test_concurrent_download_walk_records_every_outcome(monkeypatch, capsys):
+    ctx = make_context({"downloads.workers": 3})
+    root = Node("", -1, "Root", None)
+    section = root.add_child("Course", 1, "Section")
+    leaves = [
+        section.add_child(f"file-{index}.pdf", index, "File", url=f"{URL}?{index}")
+        for index in range(6)
+    ]
+    release = threading.Barrier(3, timeout=5)
+    threads = set()
+
+    def fake_leaf(context, node, log):
+        threads.add(threading.get_ident())
+        if node in leaves[:3]:
+            # Only completes when three workers are transferring at once.
+            release.wait()
+        return UNCHANGED_DOWNLOAD
+
+    monkeypatch.setattr(downloader, "download_leaf", fake_leaf)
+
+    downloader.download_node_tree(ctx, root)
+
+    assert len(threads) == 3
+    assert all(leaf.is_handled for leaf in leaves)
+    assert ctx.stats.unchanged == len(leaves)
+    output = capsys.readouterr().out
+    assert "Processing 6 items..." in output
+    assert "[6/6] Processed File: Course/" in output
+
+
+def test_concurrent_download_lanes_keep_shared_targets_in_order(tmp_path):
+    ctx = make_context({"paths.sync_directory": str(tmp_path)})
+    _, first = build_single_file_tree("dup.pdf", URL)
+    section = first.parent
+    assert section is not None
+    same_path = section.add_child("dup.pdf", "second", "File", url=URL + "?v=2")
+    other = section.add_child("other.pdf", "other", "File", url=URL + "?v=3")
+    artifact_a = section.add_child(
+        "a.pdf",
+        "a",
+        "File",
+        url=URL + "?artifact",
+        etag=sha1(b"same"),
+        etag_kind=RemoteMarkerKind.CONTENT_HASH,
+    )
+    quiz_a = section.add_child(
+        "quiz-a.html", "qa", "Quiz", url=URL, download_kind=DownloadKind.QUIZ
+    )
+    artifact_b = section.add_child(
+        "b.pdf",
+        "b",
+        "File",
+        url=URL + "?artifact",
+        etag=sha1(b"same"),
+        etag_kind=RemoteMarkerKind.CONTENT_HASH,
+    )
+    quiz_b = section.add_child(
+        "quiz-b.html", "qb", "Quiz", url=URL, download_kind=DownloadKind.QUIZ
+    )
+
+    lanes = downloader.download_lanes(
+        ctx,
+        [first, other, artifact_a, quiz_a, same_path, artifact_b, quiz_b],
+    )
+
+    assert lanes == [
+        [first, same_path],
+        [other],
+        [artifact_a, artifact_b],
+        [quiz_a, quiz_b],
+    ]
+
+
+def test_download_scheduler_interleaves_origins_within_caps():
+    def lane(url):
+        return [Node("file", url, "File", None, url=url)]
+
+    moodle_lanes = [lane(f"https://moodle.example.test/{index}") for index in range(3)]
+    opencast_lane = lane("https://opencast.example.test/video.mp4")
+    scheduler = downloader.DownloadScheduler(
+        [*moodle_lanes, opencast_lane],
+        origin_limit=2,
+    )
+
+    first = scheduler.acquire()
+    second = scheduler.acquire()
+    third = scheduler.acquire()
+    assert first == ("https://moodle.example.test", moodle_lanes[0])
+    assert second == ("https://opencast.example.test", opencast_lane)
+    assert third == ("https://moodle.example.test", moodle_lanes[1])
+
+    waiting = []
+    worker = threading.Thread(target=lambda: waiting.append(scheduler.acquire()))
+    worker.start()
+    worker.join(0.05)
+    # Both Moodle slots are busy, so the last Moodle lane must wait.
+    assert worker.is_alive()
+    scheduler.release("https://moodle.example.test")
+    worker.join(5)
+    assert waiting == [("https://moodle.example.test", moodle_lanes[2])]
+    assert scheduler.acquire() is None
+
+
+def test_origin_slot_follows_redirects_and_caps_each_origin():
+    limiter = http_utils.OriginLimiter(1)
+    entered: list[str] = []
+
+    def request(url):
+        with limiter.slot() as slot:
+            slot.move_to(url)
+            entered.append(url)
+
+    with limiter.slot() as slot:
+        slot.move_to("https://moodle.example.test/file")
+        moodle = threading.Thread(
+            target=request, args=("https://moodle.example.test/other",)
+        )
+        moodle.start()
+        moodle.join(0.05)
+        assert moodle.is_alive()
+
+        # Following a redirect frees the original origin for the next request.
+        slot.move_to("https://cdn.example.test/file")
+        moodle.join(5)
+        assert entered == ["https://moodle.example.test/other"]
+
+        cdn = threading.Thread(target=request, args=("https://cdn.example.test/x",))
+        cdn.start()
+        cdn.join(0.05)
+        assert cdn.is_alive()
+    cdn.join(5)
+    assert entered[-1] == "https://cdn.example.test/x"
+
+
+def test_concurrent_downloads_deduplicate_shared_target(tmp_path):
+    config = {"paths.sync_directory": str(tmp_path), "downloads.workers": 4}
+    ctx = make_context(config)
+    ctx.session = FakeSession()
+    ctx.session.add(
+        "GET",
+        URL,
+        FakeResponse(headers={"Content-Type": "application/pdf"}, chunks=[b"data"]),
+    )
+    root, first = build_single_file_tree("dup.pdf", URL)
+    section = first.parent
+    assert section is not None
+    second = section.add_child("dup.pdf", "second", "File", url=URL)
+    for index in range(3):
+        url = f"{URL}?copy={index}"
+        section.add_child(f"copy-{index}.pdf", f"copy-{index}", "File", url=url)
+        ctx.session.add(
+            "GET",
+            url,
+            FakeResponse(
+                headers={"Content-Type": "application/pdf"},
+                chunks=[f"copy {index}".encode()],
+            ),
+        )
+
+    downloader.download_node_tree(ctx, root)
+
+    assert ctx.session.count("GET", URL) == 1
+    assert first.is_handled and second.is_handled
+    assert ctx.stats.downloaded == 4
+    assert ctx.stats.unchanged == 1
+    assert ctx.stats.failed == 0
+    assert node_path(ctx, first).read_bytes() == b"data"
+
+
 def test_download_is_skipped_for_excluded_filetypes(tmp_path):
     config = {
         "paths.sync_directory": str(tmp_path),
@@ -1658,7 +1961,7 @@ def test_legacy_course_cache_prevents_unchanged_file_false_conflict(tmp_path):
     course_node = seeded.root_node.children[0].children[0]
     course_cache.cache_root_node(seeded)
     stable_path = course_cache.course_cache_path(seeded, course_node)
-    payload = read_private_gzip_json(stable_path, "course cache")
+    payload = course_cache.read_course_cache_payload(stable_path)
     assert isinstance(payload, dict)
     payload["format"] = course_cache.LEGACY_COURSE_CACHE_FORMAT
     payload.pop("identity")
@@ -2205,6 +2508,45 @@ def test_resume_rejects_wrong_checksum_and_discards_partial(tmp_path):
     assert list(download_path.parent.glob(".*.smmpart*")) == []
 
 
+def test_resume_hashes_partial_prefix_while_streaming(tmp_path, monkeypatch):
+    expected = b"HEAD-CORRECT"
+    config = {"paths.sync_directory": str(tmp_path)}
+    syncer, file_node = make_run_syncer(
+        config,
+        timemodified=1710000500,
+        etag=sha1(expected),
+        remote_size=len(expected),
+    )
+    file_node.etag_kind = RemoteMarkerKind.CONTENT_HASH
+    download_path = _seed_partial(syncer, file_node, b"HEAD-", '"v1"')
+    syncer.session.add(
+        "GET",
+        URL,
+        FakeResponse(
+            status_code=206,
+            headers={
+                "Content-Type": "application/pdf",
+                "Content-Range": f"bytes 5-{len(expected) - 1}/{len(expected)}",
+                "Content-Length": str(len(expected) - 5),
+                "ETag": '"v1"',
+            },
+            chunks=[expected[5:]],
+        ),
+    )
+    snapshots = []
+    snapshot_file = downloader.storage.snapshot_file
+    monkeypatch.setattr(
+        downloader.storage,
+        "snapshot_file",
+        lambda path, index=None: snapshots.append(path) or snapshot_file(path, index),
+    )
+
+    assert download_file(syncer, file_node).downloaded == 1
+    assert download_path.read_bytes() == expected
+    assert file_node.content_hash == sha256(expected)
+    assert all(".smmpart" not in path.name for path in snapshots)
+
+
 def test_resume_rejects_short_range_body(tmp_path):
     config = {"paths.sync_directory": str(tmp_path)}
     syncer, file_node = make_run_syncer(config, timemodified=1710000500)
@@ -3059,3 +3401,41 @@ def test_cache_does_not_preserve_markers_when_file_absent(tmp_path):
     cached_file = _cached_file_node(config, root.children[0].children[0])
     assert cached_file.timemodified == 200
     assert cached_file.is_handled is False
+
+
+def test_digest_warm_up_hashes_only_targets_that_reach_the_comparison(
+    tmp_path, monkeypatch
+):
+    config = {
+        "paths.sync_directory": str(tmp_path),
+        "filters.exclude_files": ["notes*.pdf"],
+    }
+    ctx = make_context(config)
+    ctx.root_node, slides = build_single_file_tree("slides.pdf", URL)
+    assert slides is not None
+    assert slides.parent is not None
+    notes = slides.parent.add_child("notes.pdf", "notes", "File", url=f"{URL}?n")
+    done = slides.parent.add_child("done.pdf", "done", "File", url=f"{URL}?d")
+    for node in (slides, notes, done):
+        path = node_path(ctx, node)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"local")
+    ctx.downloaded_paths.add(node_path(ctx, done))
+    warmed = []
+    monkeypatch.setattr(
+        downloader.storage,
+        "warm_digests",
+        lambda index, targets, progress: warmed.append(sorted(targets)),
+    )
+
+    downloader.warm_local_digests(ctx, [slides, notes, done])
+
+    assert warmed == [[node_path(ctx, slides)]]
+    assert ctx.filtered_items == set()
+
+    warmed.clear()
+    dry_run = make_context({**config, "downloads.dry_run": True})
+    dry_run.root_node = ctx.root_node
+    downloader.warm_local_digests(dry_run, [slides])
+
+    assert warmed == []
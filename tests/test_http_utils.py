@@ -1,15 +1,23 @@
+import http.server
 import logging
+import threading
+import time
 
 import pytest
 import requests
 
+from syncmymoodle.constants import HTTP_LATENCY_MIN_SAMPLES, HTTP_POOL_ORIGINS
 from syncmymoodle.http_utils import (
     HttpFailureKind,
+    LatencyAdapter,
+    LatencyTracker,
     RequestPolicyError,
+    RetryBudget,
     ServiceOutageTracker,
     canonical_remote_url,
     classify_http_failure,
     classify_request_failure,
+    create_session,
     moodle_url_allowed,
     normalized_http_origin,
     record_service_failure,
@@ -18,7 +26,33 @@ from syncmymoodle.http_utils import (
     request_following_safe_redirects,
 )
 
-from .helpers import FakeResponse, FakeSession
+from .helpers import FakeResponse, FakeSession, make_context
+
+
+def test_created_sessions_keep_pools_for_many_origins():
+    backend = requests.adapters.HTTPAdapter()
+    session = create_session(
+        pool_size=32, adapters={"https://backend.example/": backend}
+    )
+
+    adapter = session.get_adapter("https://moodle.example/webservice")
+    assert isinstance(adapter, requests.adapters.HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 32
+    assert adapter.poolmanager.pools._maxsize == HTTP_POOL_ORIGINS
+    assert session.get_adapter("https://backend.example/api") is backend
+
+
+@pytest.mark.parametrize(
+    ("workers", "expected"),
+    [
+        ({}, 1),
+        ({"downloads.workers": 8}, 4),
+        ({"downloads.workers": 8, "downloads.workers_per_origin": 6}, 6),
+        ({"courses.workers": 3, "links.workers": 4}, 12),
+    ],
+)
+def test_sync_pools_are_sized_from_worker_counts(workers, expected):
+    assert make_context(workers).config.http_pool_size == expected
 
 
 @pytest.mark.parametrize(
@@ -290,3 +324,202 @@ def test_safe_redirect_preserves_webdav_method_and_body():
         ("PROPFIND", start_url),
         ("PROPFIND", destination_url),
     ]
+
+
+def _retry_budget(**kwargs):
+    waits = []
+    return RetryBudget(sleep=waits.append, jitter=lambda: 1.0, **kwargs), waits
+
+
+def test_retry_waits_for_retry_after_then_returns_success():
+    session = FakeSession()
+    url = "https://allowed.example.test/file?token=secret"
+    responses = iter(
+        [
+            FakeResponse(status_code=503, headers={"Retry-After": "7"}),
+            FakeResponse(status_code=502),
+            FakeResponse(text="ok"),
+        ]
+    )
+    session.add("GET", url, lambda url, kwargs: next(responses))
+    retry, waits = _retry_budget(attempts=3, remaining=10)
+
+    response = request_following_safe_redirects(
+        session,
+        "GET",
+        url,
+        lambda url: True,
+        retry=retry,
+        timeout=15,
+    )
+
+    assert response.text == "ok"
+    assert waits == [7.0, 1.0]
+    assert retry.remaining == 8
+
+
+def test_retry_recovers_from_connection_errors_but_not_for_post():
+    session = FakeSession()
+    url = "https://allowed.example.test/file"
+    failures = iter([requests.ConnectionError("reset")])
+
+    def flaky(url, kwargs):
+        del url, kwargs
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        return FakeResponse(text="ok")
+
+    session.add("GET", url, flaky)
+    session.add("POST", url, FakeResponse(status_code=503))
+    retry, waits = _retry_budget()
+
+    response = request_following_safe_redirects(
+        session, "GET", url, lambda url: True, retry=retry, timeout=15
+    )
+    posted = request_following_safe_redirects(
+        session, "POST", url, lambda url: True, retry=retry, timeout=15
+    )
+
+    assert response.text == "ok"
+    assert posted.status_code == 503
+    assert waits == [0.5]
+    assert session.count("POST", url) == 1
+
+
+def test_retry_does_not_repeat_tls_failures():
+    session = FakeSession()
+    url = "https://allowed.example.test/file"
+
+    def broken_tls(url, kwargs):
+        del url, kwargs
+        raise requests.exceptions.SSLError("certificate verify failed")
+
+    session.add("GET", url, broken_tls)
+    retry, waits = _retry_budget()
+
+    with pytest.raises(requests.RequestException):
+        request_following_safe_redirects(
+            session, "GET", url, lambda url: True, retry=retry, timeout=15
+        )
+
+    assert session.count("GET", url) == 1
+    assert waits == []
+
+
+def test_retry_gives_up_on_long_retry_after_and_spent_budget():
+    session = FakeSession()
+    throttled = "https://allowed.example.test/throttled"
+    broken = "https://allowed.example.test/broken"
+    session.add(
+        "GET", throttled, FakeResponse(status_code=429, headers={"Retry-After": "3600"})
+    )
+    session.add("HEAD", broken, FakeResponse(status_code=500))
+    retry, waits = _retry_budget(attempts=5, remaining=2)
+
+    first = request_following_safe_redirects(
+        session, "GET", throttled, lambda url: True, retry=retry, timeout=15
+    )
+    second = request_following_safe_redirects(
+        session, "HEAD", broken, lambda url: True, retry=retry, timeout=15
+    )
+
+    assert first.status_code == 429
+    assert second.status_code == 500
+    assert session.count("GET", throttled) == 1
+    assert session.count("HEAD", broken) == 3
+    assert waits == [0.5, 1.0]
+    assert retry.remaining == 0
+
+
+def test_latency_tracker_adapts_timeouts_per_origin():
+    latency = LatencyTracker(floor=2, ceiling=60)
+    fast = "https://fast.example/file"
+    slow = "https://slow.example/api"
+
+    assert latency.timeout(fast, 15) == (15, 15)
+    for _ in range(HTTP_LATENCY_MIN_SAMPLES):
+        latency.record(fast, 0.1)
+        latency.record(slow, 5.0)
+    latency.record(slow, 40.0)
+
+    assert latency.timeout(fast, 15) == (15, 2)
+    assert latency.timeout(fast, 15, shorten=False) == (15, 15)
+    assert latency.timeout(slow, 15) == (15, 60)
+    assert latency.timeout(slow, 300) == (60, 60)
+    assert latency.timeout("https://other.example/", 15) == (15, 15)
+
+
+def test_latency_tracker_stretches_read_timeout_until_next_response():
+    latency = LatencyTracker(floor=1, ceiling=60)
+    url = "https://sciebo.example/remote.php/dav"
+    for _ in range(HTTP_LATENCY_MIN_SAMPLES):
+        latency.record(url, 1.0)
+
+    latency.record_read_timeout(url)
+    latency.record_read_timeout(url)
+    assert latency.timeout(url, 15) == (15, 16)
+
+    latency.record(url, 1.0)
+    assert latency.timeout(url, 15) == (15, 4)
+
+
+def test_latency_adapter_replaces_numeric_timeouts_and_times_responses(monkeypatch):
+    sent = []
+
+    def send(self, request, **kwargs):
+        del self
+        sent.append((request.method, kwargs["timeout"]))
+        return requests.Response()
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+    latency = LatencyTracker(floor=1, ceiling=60)
+    adapter = LatencyAdapter(latency)
+    url = "https://moodle.example/webservice/rest/server.php"
+    for _ in range(HTTP_LATENCY_MIN_SAMPLES):
+        adapter.send(requests.Request("GET", url).prepare(), timeout=15)
+    adapter.send(requests.Request("GET", url).prepare(), timeout=15)
+    adapter.send(requests.Request("POST", url).prepare(), timeout=15)
+    adapter.send(requests.Request("GET", url).prepare(), timeout=(5, 30))
+
+    assert sent[0] == ("GET", (15, 15))
+    assert sent[-3:] == [("GET", (15, 1)), ("POST", (15, 15)), ("GET", (5, 30))]
+
+
+class _StallingHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b"x" * 64
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.path == "/stall":
+            self.wfile.write(body[:32])
+            self.wfile.flush()
+            time.sleep(0.3)
+            self.wfile.write(body[32:])
+        else:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        del format, args
+
+
+def test_latency_adapter_keeps_read_timeout_for_streamed_bodies():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _StallingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        session = requests.Session()
+        session.mount("http://", LatencyAdapter(LatencyTracker(floor=0.05)))
+        for _ in range(HTTP_LATENCY_MIN_SAMPLES):
+            session.get(f"{base}/fast", timeout=5).close()
+
+        # Fast header responses shrink the learned read timeout well below the
+        # stall, which must not abort a streamed download mid-body.
+        with session.get(f"{base}/stall", timeout=5, stream=True) as response:
+            assert b"".join(response.iter_content(16)) == b"x" * 64
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -1,4 +1,5 @@
 import logging
+import threading
 
 import pytest
 
@@ -618,3 +619,122 @@ def test_conditional_headers_are_stripped_from_cross_origin_redirects(tmp_path):
     links.scan_for_links(current, original_url, current_section, 101, single=True)
 
     assert current_session.calls == [("GET", original_url), ("GET", final_url)]
+
+
+def test_prefetched_links_are_checked_concurrently_and_added_in_order(tmp_path):
+    ctx, _, section = _context(tmp_path, extra_config={"links.workers": 4})
+    other_url = "https://other.example.test/slides.pdf"
+    both_sent = threading.Barrier(2, timeout=5)
+
+    def head(content_type):
+        def respond(url, kwargs):
+            del url, kwargs
+            both_sent.wait()
+            return FakeResponse(headers={"Content-Type": content_type})
+
+        return respond
+
+    session = FakeSession()
+    session.add("HEAD", LINK_URL, head("application/zip"))
+    session.add("HEAD", other_url, head("application/pdf"))
+    ctx.session = session
+
+    links.prefetch_linked_resources(ctx, [LINK_URL, other_url, LINK_URL], 101)
+    for url in (LINK_URL, other_url):
+        links.scan_for_links(ctx, url, section, 101, single=True)
+
+    assert sorted(session.calls) == [("HEAD", LINK_URL), ("HEAD", other_url)]
+    assert [child.url for child in section.children] == [LINK_URL, other_url]
+    assert ctx.prefetched_linked_resources == {"101": {}}
+
+
+def test_account_index_reuses_fresh_links_across_courses_and_runs(
+    tmp_path, monkeypatch
+):
+    pdf_url = "https://links.example.test/handout.pdf"
+    monkeypatch.setattr(links.time, "time", lambda: 1_000.0)
+    ctx, course, section = _context(tmp_path)
+    session = FakeSession()
+    session.add(
+        "HEAD",
+        pdf_url,
+        FakeResponse(
+            headers={"Content-Type": "application/pdf", "Cache-Control": "max-age=600"}
+        ),
+    )
+    ctx.session = session
+    links.scan_for_links(ctx, pdf_url, section, 101, single=True)
+    links.save_linked_resource_index(ctx)
+    assert session.calls == [("HEAD", pdf_url)]
+
+    monkeypatch.setattr(links.time, "time", lambda: 1_100.0)
+    ctx, course, _ = _context(tmp_path)
+    other_section = course.add_child("Other course", 202, "Section")
+    ctx.session = FakeSession()
+    links.load_linked_resource_index(ctx)
+
+    links.scan_for_links(ctx, pdf_url, other_section, 202, single=True)
+
+    assert ctx.session.calls == []
+    assert [child.url for child in other_section.children] == [pdf_url]
+
+    ctx, _, _ = _context(tmp_path, user_id=20002)
+    links.load_linked_resource_index(ctx)
+    assert ctx.linked_resource_index == {}
+
+
+def test_signed_link_variants_share_validators_but_not_freshness(tmp_path):
+    first_url = f"{LINK_URL}?id=7&signature=first"
+    second_url = f"{LINK_URL}?id=7&signature=second"
+    ctx, _, section = _context(tmp_path)
+    session = FakeSession()
+    session.add(
+        "HEAD",
+        first_url,
+        FakeResponse(
+            headers={
+                "Content-Type": "application/pdf",
+                "ETag": '"pdf-v1"',
+                "Cache-Control": "max-age=600",
+            }
+        ),
+    )
+
+    def revalidated(url, kwargs):
+        assert kwargs["headers"] == {"If-None-Match": '"pdf-v1"'}
+        return FakeResponse(headers={"Content-Type": "application/pdf"})
+
+    session.add("HEAD", second_url, revalidated)
+    ctx.session = session
+
+    links.scan_for_links(ctx, first_url, section, 101, single=True)
+    links.scan_for_links(ctx, second_url, section, 101, single=True)
+
+    assert session.calls == [("HEAD", first_url), ("HEAD", second_url)]
+    assert len(ctx.linked_resource_index) == 1
+
+
+def test_filtered_resource_links_are_not_filtered_again(tmp_path, monkeypatch):
+    ctx, _, section = _context(tmp_path, extra_config={"links.workers": 4})
+    other_url = "https://other.example.test/slides.pdf"
+    session = FakeSession()
+    session.add("HEAD", LINK_URL, FakeResponse(headers={"Content-Type": "text/x"}))
+    session.add("HEAD", other_url, FakeResponse(headers={"Content-Type": "text/x"}))
+    ctx.session = session
+    checked = []
+    should_skip_url = links.filters.should_skip_url
+
+    def recording_should_skip_url(ctx, url, context="link", **kwargs):
+        checked.append((url, context))
+        return should_skip_url(ctx, url, context, **kwargs)
+
+    monkeypatch.setattr(links.filters, "should_skip_url", recording_should_skip_url)
+
+    links.prefetch_linked_resources(ctx, [LINK_URL, other_url], 101)
+    for url in (LINK_URL, other_url):
+        links.scan_for_links(ctx, url, section, 101, single=True)
+
+    assert checked == [
+        (LINK_URL, "redirected link"),
+        (other_url, "redirected link"),
+    ]
@@ -160,7 +160,7 @@ def test_login_only_saves_session_cookies_outside_dry_run(
     ctx.auth.credential_resolver = lambda: pytest.fail("unexpected resolver call")
     ctx.auth.otp_code_resolver = lambda: pytest.fail("unexpected OTP resolver call")
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(
         rwth,
@@ -187,7 +187,7 @@ def test_login_maintenance_notice_exits_with_failure(monkeypatch):
         ),
     )
     ctx = make_context()
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
 
     with pytest.raises(SystemExit) as exc_info:
@@ -229,7 +229,7 @@ def test_login_refuses_non_sso_redirect_before_requesting_it(monkeypatch):
         ),
     )
     ctx = make_context()
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "check_general_connectivity", lambda log: None)
     monkeypatch.setattr(rwth, "check_rwth_status_page", lambda log: None)
@@ -262,7 +262,7 @@ def test_login_refuses_cross_origin_form_action_before_posting(monkeypatch):
     )
     ctx = make_context({"auth.user": "user"})
     ctx.auth.password = "password"
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "check_general_connectivity", lambda log: None)
     monkeypatch.setattr(rwth, "check_rwth_status_page", lambda log: None)
@@ -340,7 +340,7 @@ def test_login_fetches_provider_otp_only_at_otp_form(
 
     ctx.auth.otp_code_resolver = otp_resolver
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "generate_totp", lambda secret: pytest.fail())
     monkeypatch.setattr("builtins.input", lambda: pytest.fail())
@@ -369,7 +369,7 @@ def test_login_uses_provider_otp_code_before_prompt_or_totp_secret(
     ctx.auth.totp_secret = "secret-that-must-not-be-used"
     ctx.auth.otp_code = "123456"
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "generate_totp", lambda secret: pytest.fail())
     monkeypatch.setattr("builtins.input", lambda: pytest.fail())
@@ -400,7 +400,7 @@ def test_generated_totp_is_not_echoed(
     ctx.auth.password = "password"
     ctx.auth.totp_secret = "totp-secret"
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "generate_totp", lambda secret: "654321")
     monkeypatch.setattr("builtins.input", lambda: pytest.fail())
@@ -452,7 +452,7 @@ def test_login_failure_identifies_the_rejected_sign_in_step(
     ctx.auth.otp_code = "123456"
     caplog.set_level(logging.CRITICAL, logger="syncmymoodle.rwth")
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "check_rwth_status_page", lambda log: None)
 
@@ -492,7 +492,7 @@ def test_login_failure_does_not_log_response_html(
     ctx.auth.password = "password"
     caplog.set_level(logging.INFO, logger="syncmymoodle.rwth")
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "check_rwth_status_page", lambda log: None)
 
@@ -533,7 +533,7 @@ def test_login_reports_sso_form_timeout_without_traceback(
     )
     ctx.auth.password = "password"
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
     monkeypatch.setattr(rwth, "check_general_connectivity", lambda log: None)
     monkeypatch.setattr(rwth, "check_rwth_status_page", lambda log: None)
@@ -560,7 +560,7 @@ def test_login_prompts_for_missing_credentials_only_when_fresh_login_is_needed(
         }
     )
 
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(rwth, "check_moodle_availability", lambda session, log: None)
 
     def answer():
@@ -611,7 +611,7 @@ def test_cached_session_status_returns_exact_remaining_time(monkeypatch, tmp_pat
         )
 
     session.add("POST", rwth.SESSION_REMAINING_URL, remaining_response)
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(
         rwth,
         "read_private_gzip_json",
@@ -637,7 +637,7 @@ def test_cached_session_status_reports_expired_session(monkeypatch, tmp_path):
             json_payload=[{"error": True, "exception": {"errorcode": "invalidsesskey"}}]
         ),
     )
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(
         rwth,
         "read_private_gzip_json",
@@ -679,7 +679,7 @@ def test_cached_session_status_does_not_resend_session_cross_origin(
         destination,
         lambda url, kwargs: pytest.fail(f"session reached {url}: {kwargs}"),
     )
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(
         rwth,
         "read_private_gzip_json",
@@ -711,7 +711,7 @@ def test_cached_session_status_does_not_resend_session_cross_origin(
 def test_cached_session_status_does_not_probe_legacy_cache(monkeypatch, tmp_path):
     session = FakeSession()
     session.cookies = requests.cookies.RequestsCookieJar()
-    monkeypatch.setattr(rwth.requests, "Session", lambda: session)
+    monkeypatch.setattr(rwth, "create_session", lambda **_: session)
     monkeypatch.setattr(
         rwth,
         "read_private_gzip_json",
@@ -109,6 +109,103 @@ def test_get_course_uses_content_contract():
     assert moodle.get_course(session, "webservice-token", "101") == contents
 
 
+def test_get_courses_contents_uses_mobile_batch_contract():
+    contents = [{"id": 201, "name": "General", "modules": []}]
+    request_data = {}
+    for index, course_id in enumerate((101, 102)):
+        request_data |= {
+            f"requests[{index}][function]": "core_course_get_contents",
+            f"requests[{index}][arguments]": json.dumps({"courseid": str(course_id)}),
+            f"requests[{index}][settingfilter]": 1,
+            f"requests[{index}][settingfileurl]": 1,
+        }
+    session = webservice_session(
+        "tool_mobile_call_external_functions",
+        request_data,
+        {
+            "responses": [
+                {"error": False, "data": json.dumps(contents)},
+                {"error": True, "exception": "require_login_exception"},
+            ]
+        },
+    )
+
+    assert moodle.get_courses_contents(session, "webservice-token", [101, 102]) == {
+        101: contents
+    }
+
+
+def test_get_courses_contents_chunks_large_course_lists(monkeypatch):
+    monkeypatch.setattr(moodle, "COURSE_BATCH_SIZE", 2)
+    session = FakeSession()
+    batches = []
+
+    def respond(url: str, kwargs: dict[str, Any]) -> FakeResponse:
+        del url
+        requests = [
+            json.loads(value)["courseid"]
+            for key, value in kwargs["data"].items()
+            if key.endswith("[arguments]")
+        ]
+        batches.append(requests)
+        return FakeResponse(
+            json_payload={
+                "responses": [
+                    {"error": False, "data": json.dumps([{"id": int(course_id)}])}
+                    for course_id in requests
+                ]
+            }
+        )
+
+    session.add("POST", moodle.MOODLE_REST_URL, respond)
+
+    contents = moodle.get_courses_contents(session, "webservice-token", [1, 2, 3])
+
+    assert batches == [["1", "2"], ["3"]]
+    assert contents == {1: [{"id": 1}], 2: [{"id": 2}], 3: [{"id": 3}]}
+
+
+def test_get_module_instances_by_courses_groups_bulk_inventory():
+    quiz = {"id": 41, "coursemodule": 301, "course": 101}
+    session = webservice_session(
+        "mod_quiz_get_quizzes_by_courses",
+        {"courseids[0]": "101", "courseids[1]": "102", "courseids[2]": "103"},
+        {
+            "quizzes": [quiz],
+            "warnings": [
+                {"item": "course", "itemid": 103, "warningcode": "1"},
+            ],
+        },
+    )
+
+    assert moodle.get_module_instances_by_courses(
+        session,
+        "webservice-token",
+        "mod_quiz_get_quizzes_by_courses",
+        "quizzes",
+        [101, 102, 103],
+    ) == {101: [quiz], 102: []}
+
+
+def test_get_assignments_by_courses_uses_bulk_inventory_contract():
+    assignment_course = {"id": 101, "assignments": [{"id": 301}]}
+    session = webservice_session(
+        "mod_assign_get_assignments",
+        {
+            "courseids[0]": "101",
+            "courseids[1]": "102",
+            "includenotenrolledcourses": 1,
+            "moodlewssettingfilter": True,
+            "moodlewssettingfileurl": True,
+        },
+        {"courses": [assignment_course], "warnings": []},
+    )
+
+    assert moodle.get_assignments_by_courses(
+        session, "webservice-token", [101, 102]
+    ) == {101: assignment_course}
+
+
 def test_get_assignment_uses_course_inventory_contract():
     assignment_course = {"id": 101, "assignments": [{"id": 301}]}
     session = webservice_session(
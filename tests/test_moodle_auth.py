@@ -557,7 +557,7 @@ def test_create_browser_session_uses_private_token_and_mobile_user_agent(monkeyp
         "GET", f"{MOODLE_URL}admin/tool/mobile/autologin.php", login_response
     )
     sessions = iter([mobile_session, browser_session])
-    monkeypatch.setattr(moodle.requests, "Session", lambda: next(sessions))
+    monkeypatch.setattr(moodle, "create_session", lambda **_: next(sessions))
 
     returned_session, session_key = moodle.create_browser_session(bound_tokens())
 
@@ -592,7 +592,7 @@ def test_create_browser_session_does_not_resend_tokens_cross_origin(
         destination,
         lambda url, kwargs: pytest.fail(f"credentials reached {url}: {kwargs}"),
     )
-    monkeypatch.setattr(moodle.requests, "Session", lambda: mobile_session)
+    monkeypatch.setattr(moodle, "create_session", lambda: mobile_session)
 
     with pytest.raises(moodle.BrowserBootstrapError, match="refusing redirect"):
         moodle.create_browser_session(bound_tokens())
@@ -654,7 +654,7 @@ def test_create_browser_session_rejects_external_autologin_url(monkeypatch):
             }
         ),
     )
-    monkeypatch.setattr(moodle.requests, "Session", lambda: mobile_session)
+    monkeypatch.setattr(moodle, "create_session", lambda: mobile_session)
 
     with pytest.raises(moodle.BrowserBootstrapError, match="unsafe auto-login URL"):
         moodle.create_browser_session(bound_tokens())
@@ -675,7 +675,7 @@ def test_create_browser_session_reports_shared_rate_limit(monkeypatch):
             }
         ),
     )
-    monkeypatch.setattr(moodle.requests, "Session", lambda: mobile_session)
+    monkeypatch.setattr(moodle, "create_session", lambda: mobile_session)
 
     with pytest.raises(moodle.BrowserBootstrapError, match="up to 6 minutes"):
         moodle.create_browser_session(bound_tokens())
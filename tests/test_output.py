@@ -211,6 +211,56 @@ def test_redirected_sync_progress_uses_numbered_plain_milestones(monkeypatch):
     assert stderr.getvalue() == ""
 
 
+def test_concurrent_transfers_keep_separate_tasks_until_finished(monkeypatch):
+    stderr = TtyBuffer()
+    monkeypatch.setattr(sys, "stderr", stderr)
+    terminal = TerminalOutput("never")
+
+    with terminal.sync_progress as progress:
+        renderer = progress.renderer
+        assert renderer is not None
+        progress.begin_items(2, concurrent=True)
+        tasks_before = len(renderer.tasks)
+        with terminal.transfer(total=100) as first:
+            with terminal.transfer(total=50) as second:
+                first.advance(10)
+                second.advance(20)
+                with terminal.tracked_action("Downloading", "/sync/b.pdf", "File"):
+                    assert len(renderer.tasks) == tasks_before + 2
+            assert len(renderer.tasks) == tasks_before + 1
+        assert len(renderer.tasks) == tasks_before
+        progress.complete_concurrent_item(1, "File: b.pdf")
+        progress.complete_concurrent_item(2, "File: a.pdf")
+        frame = render_progress_frame(renderer)
+
+    assert "2/2 items" in frame
+
+
+def test_local_file_checks_are_counted_on_the_item_progress(monkeypatch):
+    stdout = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stderr", io.StringIO())
+
+    with TerminalOutput("auto").sync_progress as progress:
+        progress.begin_items(3)
+        progress.check_local_files(0, 3)
+    assert "Checking 3 local files..." in stdout.getvalue()
+
+    monkeypatch.setattr(sys, "stderr", TtyBuffer())
+    with TerminalOutput("never").sync_progress as progress:
+        renderer = progress.renderer
+        assert renderer is not None
+        progress.begin_items(3, concurrent=True)
+        progress.check_local_files(1, 3)
+        checking_frame = render_progress_frame(renderer)
+        progress.check_local_files(3, 3)
+        checked_frame = render_progress_frame(renderer)
+
+    assert "Checking local files" in checking_frame
+    assert "1/3 files" in checking_frame
+    assert "Checking local files" not in checked_frame
+
+
 def test_redirected_item_progress_is_throttled_for_large_runs(monkeypatch):
     stdout = io.StringIO()
     monkeypatch.setattr(sys, "stdout", stdout)
@@ -7,7 +7,6 @@ from syncmymoodle import course_cache, downloader, moodle, sync, sync_handlers
 from syncmymoodle.context import SyncContext
 from syncmymoodle.node import DownloadKind, Node
 from syncmymoodle.outcomes import RemovedContent
-from syncmymoodle.storage import read_private_gzip_json
 
 from .helpers import FakeSession, make_context, node_path
 
@@ -115,9 +114,8 @@ def seed_resource_cache(tmp_path, monkeypatch) -> tuple[dict[str, Any], Path]:
 def cached_course_payload(config: dict[str, Any]) -> dict[str, Any]:
     lookup = make_context(config)
     course = Node("Download Course", COURSE_ID, "Course", None)
-    payload = read_private_gzip_json(
-        course_cache.course_cache_path(lookup, course),
-        "course cache",
+    payload = course_cache.read_course_cache_payload(
+        course_cache.course_cache_path(lookup, course)
     )
     assert isinstance(payload, dict)
     return payload
@@ -565,7 +563,7 @@ def test_signed_url_rotation_preserves_remote_identity(download_kind):
         download_kind=download_kind,
     )
 
-    assert sync._removed_course_content(current, old_course) == set()
+    assert sync._removed_course_content(current, old_course.children) == set()
 
 
 def test_opencast_identity_distinguishes_tracks_within_one_episode():
@@ -589,7 +587,7 @@ def test_opencast_identity_distinguishes_tracks_within_one_episode():
         download_kind=DownloadKind.OPENCAST,
     )
 
-    (removed,) = sync._removed_course_content(current, old_course)
+    (removed,) = sync._removed_course_content(current, old_course.children)
 
     assert removed.remote_identity.endswith(
         ":https://cdn.example.test/tracks/presenter.mp4"
@@ -605,7 +603,7 @@ def test_reported_signed_url_identity_does_not_leak_credentials():
     _, old_course = _prepared_course_with_download(signed_url)
     current, _ = _prepared_course_with_download(None)
 
-    (removed,) = sync._removed_course_content(current, old_course)
+    (removed,) = sync._removed_course_content(current, old_course.children)
 
     assert "aws-secret" not in removed.remote_identity
     assert "signature-secret" not in removed.remote_identity
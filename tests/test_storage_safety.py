@@ -4,13 +4,15 @@ import importlib
 import json
 import os
 import stat
+import sys
+import threading
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 import requests
 
-from syncmymoodle import pathing
+from syncmymoodle import pathing, storage
 from syncmymoodle.node import Node
 from syncmymoodle.pathing import (
     PATH_COMPONENT_MAX_BYTES,
@@ -20,12 +22,16 @@ from syncmymoodle.pathing import (
     windows_extended_length_path,
 )
 from syncmymoodle.storage import (
+    DigestIndex,
     InstallResult,
+    StreamingDigests,
     SyncRunLockedError,
     chmod_private_best_effort,
     install_staged_file,
+    load_digest_index,
     load_session_from_data,
     read_private_gzip_json,
+    save_digest_index,
     save_session,
     session_to_data,
     snapshot_file,
@@ -55,6 +61,53 @@ def test_sanitized_node_path_stays_inside_basedir(tmp_path):
     assert target_path.resolve(strict=False).is_relative_to(tmp_path)
 
 
+def test_sanitized_node_paths_are_reused_until_a_node_is_renamed(monkeypatch):
+    root = Node("", -1, "Root", None)
+    course = root.add_child("Course", 1, "Course")
+    folder = course.add_child("Folder", 2, "Folder")
+    first = folder.add_child("a.pdf", 3, "File", url="https://example.test/a")
+    second = folder.add_child("b.pdf", 4, "File", url="https://example.test/b")
+    sanitized = []
+    sanitize = pathing.sanitize_path_part
+
+    def recording_sanitize(part):
+        sanitized.append(part)
+        return sanitize(part)
+
+    monkeypatch.setattr(pathing, "sanitize_path_part", recording_sanitize)
+
+    assert pathing.sanitized_node_path_parts(first) == ("Course", "Folder", "a.pdf")
+    assert pathing.sanitized_node_path_parts(second)[-1] == "b.pdf"
+    assert pathing.sanitized_node_path_parts(first)[-1] == "a.pdf"
+    assert sanitized == ["Course", "Folder", "a.pdf", "b.pdf"]
+
+    sanitized.clear()
+    course.name = "Renamed: Course"
+
+    assert pathing.sanitized_node_path_parts(second) == (
+        "Renamed Course",
+        "Folder",
+        "b.pdf",
+    )
+    assert pathing.sanitized_node_path_parts(first)[0] == "Renamed Course"
+    assert sanitized == ["Renamed: Course", "Folder", "b.pdf", "a.pdf"]
+
+
+def test_node_paths_are_memoized_without_recursing_through_ancestors(tmp_path):
+    root = Node("", -1, "Root", None)
+    parent = root.add_child("Course", 1, "Course")
+    for depth in range(3 * sys.getrecursionlimit()):
+        parent = parent.add_child("d", depth, "Folder")
+    leaf = parent.add_child("a.pdf", "leaf", "File", url="https://example.test/a")
+
+    path = pathing.get_sanitized_node_path(leaf, tmp_path)
+
+    assert path.name == "a.pdf"
+    assert pathing.get_sanitized_node_path(leaf, tmp_path) is path
+    leaf.name = "b.pdf"
+    assert pathing.get_sanitized_node_path(leaf, tmp_path) == path.with_name("b.pdf")
+
+
 def test_sanitize_path_part_avoids_windows_reserved_names():
     assert sanitize_path_part("...") == "_"
     assert sanitize_path_part(". . .") == "_"
@@ -200,6 +253,29 @@ def test_private_gzip_json_roundtrip_uses_private_permissions(tmp_path):
     }
 
 
+def test_codec_tagged_private_json_reads_alongside_gzip(tmp_path):
+    target = tmp_path / "data"
+    storage.write_private_json(target, {"value": 1}, storage.cache_codec("zlib", 1))
+
+    data = target.read_bytes()
+    assert data.startswith(storage.COMPRESSED_JSON_MAGIC + bytes([1]))
+    assert read_private_gzip_json(target, "test data") == {"value": 1}
+
+    target.write_bytes(storage.COMPRESSED_JSON_MAGIC + bytes([99]) + data[6:])
+    assert read_private_gzip_json(target, "test data") is None
+
+
+def test_zstd_cache_codec_falls_back_to_zlib_without_support(monkeypatch, caplog):
+    monkeypatch.setattr(storage, "_zstd_module", lambda: None)
+
+    assert storage.cache_codec("zstd", 19) == storage.DEFAULT_CACHE_CODEC
+    assert "using zlib instead" in caplog.text
+    assert storage.cache_codec("zlib", 1) == storage.CacheCodec("zlib", 1)
+    assert storage.cache_codec("zlib") == storage.CacheCodec("zlib", 6)
+    with pytest.raises(ValueError, match="zstd"):
+        storage.cache_codec_for_id(storage.CACHE_CODEC_IDS["zstd"])
+
+
 def test_session_cache_roundtrip_includes_session_key(tmp_path):
     target = tmp_path / "session"
     cookies = requests.cookies.RequestsCookieJar()
@@ -620,3 +696,158 @@ def test_private_gzip_json_closes_temp_file_before_cleanup(tmp_path, monkeypatch
     assert closed_fds
     assert not target.exists()
     assert list(tmp_path.glob(".session.*")) == []
+
+
+def test_file_snapshot_reads_only_requested_digests_once(tmp_path, monkeypatch):
+    target = tmp_path / "slides.pdf"
+    target.write_bytes(b"snapshot contents")
+    algorithms = []
+    file_digest = hashlib.file_digest
+
+    def record_digest(handle, algorithm):
+        algorithms.append(algorithm)
+        return file_digest(handle, algorithm)
+
+    monkeypatch.setattr(hashlib, "file_digest", record_digest)
+
+    index = DigestIndex(pathing.InternalPathRoot.resolve(tmp_path))
+
+    baseline = snapshot_file(target, index)
+    assert algorithms == []
+
+    sha1 = baseline.digest_for("sha1")
+    assert baseline.digest_for("sha1") == sha1
+    assert snapshot_file(target, index).digest_for("sha1") == sha1
+    assert algorithms == ["sha1"]
+
+
+def test_file_snapshot_withholds_digests_after_the_file_changes(tmp_path):
+    target = tmp_path / "slides.pdf"
+    target.write_bytes(b"snapshot contents")
+    baseline = snapshot_file(target)
+
+    target.write_bytes(b"changed")
+
+    assert baseline.digest is None
+    assert not baseline.metadata_still_matches(target)
+
+
+def test_snapshot_metadata_checks_do_not_hash_the_file(tmp_path, monkeypatch):
+    target = tmp_path / "slides.pdf"
+    target.write_bytes(b"snapshot contents")
+    baseline = snapshot_file(target)
+    hashed = []
+    file_digest = hashlib.file_digest
+
+    def record_hash(handle, algorithm):
+        hashed.append(algorithm)
+        return file_digest(handle, algorithm)
+
+    monkeypatch.setattr(hashlib, "file_digest", record_hash)
+
+    assert baseline.metadata_still_matches(target)
+    assert hashed == []
+    target.write_bytes(b"changed contents")
+    assert not baseline.metadata_still_matches(target)
+    assert hashed == []
+
+
+def test_streaming_digests_match_a_snapshot_of_the_written_file(tmp_path):
+    target = tmp_path / ".slides.pdf.smmpart"
+    target.write_bytes(b"resumed ")
+    digests = StreamingDigests(["md5"])
+    digests.update_from_file(target)
+    with target.open("ab") as handle:
+        for chunk in (b"streamed ", memoryview(b"contents")):
+            handle.write(chunk)
+            digests.update(chunk)
+
+    streamed = digests.snapshot(target)
+    baseline = snapshot_file(target)
+
+    assert streamed.digests.keys() == {"md5", "sha256"}
+    assert streamed.digest_for("sha256") == baseline.digest_for("sha256")
+    assert streamed.digest_for("md5") == baseline.digest_for("md5")
+    assert streamed.metadata_still_matches(target)
+
+
+def test_streaming_digests_reject_bytes_written_behind_their_back(tmp_path):
+    target = tmp_path / ".slides.pdf.smmpart"
+    digests = StreamingDigests()
+    with target.open("wb") as handle:
+        handle.write(b"seen")
+        digests.update(b"seen")
+        handle.write(b" unseen")
+
+    snapshot = digests.snapshot(target)
+
+    assert snapshot.digest is None
+    assert not snapshot.metadata_still_matches(target)
+
+
+def test_digest_index_persists_digests_of_unchanged_files(tmp_path, monkeypatch):
+    root = pathing.InternalPathRoot.resolve(tmp_path)
+    unchanged = tmp_path / "Course" / "slides.pdf"
+    changed = tmp_path / "Course" / "notes.pdf"
+    unchanged.parent.mkdir()
+    unchanged.write_bytes(b"unchanged contents")
+    changed.write_bytes(b"old notes")
+    index = DigestIndex(root)
+    expected = snapshot_file(unchanged, index).digest
+    assert snapshot_file(changed, index).digest is not None
+    changed.write_bytes(b"new notes, longer")
+    save_digest_index(index)
+
+    monkeypatch.setattr(
+        hashlib,
+        "file_digest",
+        lambda handle, algorithm: pytest.fail("unchanged file was hashed again"),
+    )
+    loaded = load_digest_index(root)
+
+    assert snapshot_file(unchanged, loaded).digest == expected
+    assert list(loaded.entries) == ["Course/slides.pdf"]
+
+
+def test_warm_digests_hashes_existing_targets_in_parallel(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "HASH_WORKERS", 2)
+    files = {tmp_path / f"file-{index}.pdf": f"content {index}" for index in range(3)}
+    for path, content in files.items():
+        path.write_text(content, encoding="utf-8")
+    missing = tmp_path / "missing.pdf"
+    index = DigestIndex(pathing.InternalPathRoot.resolve(tmp_path))
+    threads = set()
+    file_digest = hashlib.file_digest
+
+    def record_thread(handle, algorithm):
+        threads.add(threading.current_thread().name)
+        return file_digest(handle, algorithm)
+
+    monkeypatch.setattr(hashlib, "file_digest", record_thread)
+
+    reported = []
+
+    storage.warm_digests(
+        index,
+        {**{path: ["sha256", "md5"] for path in files}, missing: ["sha256"]},
+        lambda checked, total: reported.append((checked, total)),
+    )
+
+    assert sorted(reported) == [(checked, 4) for checked in range(5)]
+    assert sorted(index.entries) == sorted(path.name for path in files)
+    for path, content in files.items():
+        assert index.entries[path.name][1] == {
+            "sha256": hashlib.sha256(content.encode()).hexdigest(),
+            "md5": hashlib.md5(content.encode(), usedforsecurity=False).hexdigest(),
+        }
+    assert all(name.startswith("syncmymoodle-hash") for name in threads)
+
+
+def test_map_hashing_preserves_order_and_propagates_errors(monkeypatch):
+    monkeypatch.setattr(storage, "HASH_WORKERS", 2)
+
+    assert storage.map_hashing(str, range(5)) == ["0", "1", "2", "3", "4"]
+    with pytest.raises(OSError, match="unreadable"):
+        storage.map_hashing(
+            lambda item: (_ for _ in ()).throw(OSError("unreadable")), [1, 2]
+        )
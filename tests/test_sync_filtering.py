@@ -450,3 +450,57 @@ def test_selected_courses_override_skip_courses(monkeypatch):
         {"courses.selected": [url], "courses.skip": [url]}, monkeypatch
     )
     assert synced == [12]
+
+
+def test_link_prefetch_covers_only_modules_the_walk_visits(monkeypatch):
+    def url_module(module_id, name, url):
+        return {
+            "id": module_id,
+            "name": name,
+            "modname": "url",
+            "contents": [{"type": "url", "fileurl": url}],
+        }
+
+    sections = [
+        {
+            "id": 301,
+            "name": "Hidden week",
+            "modules": [url_module(401, "Hidden", "https://a.example/hidden")],
+        },
+        {
+            "id": 302,
+            "name": "Week one",
+            "modules": [
+                url_module(402, "Slides", "https://a.example/slides"),
+                url_module(403, "Skip Module", "https://a.example/skipped"),
+                url_module(404, "Notes", "https://b.example/notes"),
+            ],
+        },
+    ]
+    syncer = make_context(
+        {
+            "links.workers": 4,
+            "filters.exclude_sections": ["Hidden*"],
+            "filters.exclude_modules": ["Skip*"],
+        }
+    )
+    syncer.session = FakeSession()
+    monkeypatch.setattr(
+        moodle,
+        "get_all_courses",
+        lambda *args: [{"id": 201, "shortname": "Course", "idnumber": "26ss"}],
+    )
+    monkeypatch.setattr(moodle, "get_course", lambda *args: sections)
+    monkeypatch.setattr(sync.sync_handlers, "handle_module", lambda *args: None)
+    prefetched = []
+    monkeypatch.setattr(
+        sync.links,
+        "prefetch_linked_resources",
+        lambda ctx, urls, course_id, log: prefetched.append((course_id, urls)),
+    )
+
+    sync.sync(syncer)
+
+    assert prefetched == [
+        (201, ["https://a.example/slides", "https://b.example/notes"])
+    ]
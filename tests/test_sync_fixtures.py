@@ -1,7 +1,10 @@
 import io
 import logging
+import threading
+import time
 import urllib.parse
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import pytest
@@ -18,6 +21,7 @@ from syncmymoodle import (
 )
 from syncmymoodle.constants import HTTP_TIMEOUT_SECONDS
 from syncmymoodle.context import MoodleAccount
+from syncmymoodle.http_utils import RetryBudget
 from syncmymoodle.moodle_tokens import MoodleTokens
 from syncmymoodle.node import Node
 
@@ -1129,6 +1133,100 @@ def test_nested_moodle_folder_paths_are_preserved(monkeypatch, update_snapshots)
     )
 
 
+def test_concurrent_course_scans_match_sequential_tree(monkeypatch):
+    courses = [
+        {"id": 901, "shortname": "First", "idnumber": "26ss-first"},
+        {"id": 902, "shortname": "Second", "idnumber": "26ss-second"},
+        {"id": 903, "shortname": "Missing", "idnumber": "26ss-missing"},
+    ]
+    course_contents = {
+        course_id: load_json_fixture("moodle", "nested_folder_course.json")
+        for course_id in (901, 902)
+    }
+    install_moodle_fixtures(
+        monkeypatch,
+        courses,
+        course_contents,
+        folders={course_id: [{"coursemodule": 301}] for course_id in (901, 902)},
+    )
+    monkeypatch.setattr(
+        "syncmymoodle.moodle.get_course",
+        lambda session, wstoken, course_id: course_contents.get(int(course_id)),
+    )
+
+    def synced_rows(workers):
+        context = make_context({"courses.workers": workers})
+        context.session = FakeSession()
+        sync.sync(context)
+        return context, node_rows(context.root_node)
+
+    sequential, sequential_rows = synced_rows(1)
+    concurrent, concurrent_rows = synced_rows(3)
+
+    assert concurrent_rows == sequential_rows
+    assert [child.name for child in concurrent.root_node.children] == [
+        child.name for child in sequential.root_node.children
+    ]
+    assert "Missing" not in "\n".join(concurrent_rows)
+    assert concurrent.stats.courses == sequential.stats.courses == 3
+
+
+def test_batched_course_inventories_fall_back_per_course(monkeypatch):
+    courses = [
+        {"id": 901, "shortname": "First", "idnumber": "26ss-first"},
+        {"id": 902, "shortname": "Second", "idnumber": "26ss-second"},
+    ]
+    sections = load_json_fixture("moodle", "nested_folder_course.json")
+    install_moodle_fixtures(
+        monkeypatch,
+        courses,
+        {901: sections, 902: sections},
+        folders={course_id: [{"coursemodule": 301}] for course_id in (901, 902)},
+    )
+    batched = []
+    single = []
+    monkeypatch.setattr(
+        moodle,
+        "get_courses_contents",
+        lambda session, wstoken, course_ids, log: (
+            batched.append(course_ids) or {901: sections}
+        ),
+    )
+    monkeypatch.setattr(
+        moodle,
+        "get_course",
+        lambda session, wstoken, course_id: single.append(course_id),
+    )
+    bulk_inventories = []
+    monkeypatch.setattr(
+        moodle,
+        "get_module_instances_by_courses",
+        lambda session, wstoken, function, key, course_ids, log: (
+            bulk_inventories.append((function, course_ids))
+            or {901: [{"coursemodule": 301, "course": 901}]}
+        ),
+    )
+    monkeypatch.setattr(
+        moodle,
+        "get_folders_by_courses",
+        lambda session, wstoken, course_id: single.append(course_id),
+    )
+    context = make_context()
+    context.session = FakeSession()
+    context.moodle_functions = frozenset({moodle.MOODLE_BATCH_FUNCTION})
+
+    sync.sync(context)
+
+    assert batched == [[901, 902]]
+    assert bulk_inventories == [("mod_folder_get_folders_by_courses", [901])]
+    assert single == [902]
+    assert context.folder_inventory_cache == {}
+    assert [course.name for course in context.root_node.children[0].children] == [
+        "First"
+    ]
+    assert context.stats.failed == 1
+
+
 def test_assignment_opencast_metadata_is_refreshed_between_runs(
     monkeypatch,
     tmp_path,
@@ -1635,6 +1733,41 @@ def test_opencast_lti_authorization_is_reused_for_the_course():
     assert syncer.session.count("POST", opencast.OPENCAST_LTI_URL) == 2
 
 
+def test_concurrent_opencast_workers_launch_one_course_authorization(monkeypatch):
+    syncer = make_context()
+    syncer.browser_session = FakeSession()
+    syncer.browser_session_key = "browser-session-key"
+    launches: list[str] = []
+    launch_lock = threading.Lock()
+
+    def fetch_lti_form_data(ctx, url, context, log):
+        with launch_lock:
+            launches.append(context)
+        time.sleep(0.01)
+        return {"oauth_consumer_key": "key"}
+
+    def submit_lti_form(ctx, data, context, log, *, course_id=None):
+        opencast.record_course_authorized(ctx, opencast.OPENCAST_URL, course_id)
+        return True
+
+    monkeypatch.setattr(opencast, "fetch_lti_form_data", fetch_lti_form_data)
+    monkeypatch.setattr(opencast, "submit_lti_form", submit_lti_form)
+    episode_ids = [f"{index:08d}-2222-4333-8444-555555555555" for index in range(8)]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda episode_id: opencast.authorize_course_for_episode(
+                    syncer, 101, episode_id
+                ),
+                episode_ids,
+            )
+        )
+
+    assert all(results)
+    assert len(launches) == 1
+
+
 @pytest.mark.parametrize("status_code", [307, 308])
 def test_opencast_lti_launch_does_not_resend_session_cross_origin(status_code):
     syncer = make_context()
@@ -1886,6 +2019,21 @@ def test_opencast_repeated_503_opens_shared_service_circuit(caplog):
     ]
 
 
+def test_opencast_result_lists_are_retried_after_transient_failures():
+    url = "https://engage.streaming.rwth-aachen.de/search/episode.json"
+    syncer = make_context()
+    syncer.http_retries = RetryBudget(attempts=1, sleep=lambda delay: None)
+    responses = iter(
+        [FakeResponse(status_code=503), FakeResponse(json_payload={"result": [1]})]
+    )
+    session = FakeSession()
+    session.add("GET", url, lambda url, kwargs: next(responses))
+    syncer.session = session
+
+    assert opencast.fetch_result_list(syncer, url, "episode") == [1]
+    assert session.count("GET", url) == 2
+
+
 def test_opencast_malformed_results_open_shared_service_circuit(caplog):
     url = "https://engage.streaming.rwth-aachen.de/search/episode.json"
     syncer = make_context()